@@ -0,0 +1,118 @@
+"""
+Typed model read-path benchmark
+
+Compares the raw-dict and typed (typed=True) read paths on a mirror
+holding --orders open orders: JSON decoding, mirror reads, a numeric
+consumer (remaining open quantity) and the rich table formatters.
+No network or credentials are needed.
+
+Usage:
+    python benchmarks/models.py
+    python benchmarks/models.py --orders 5000 --runs 50 --output benchmarks/results/models.json
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.models import Position, loads  # noqa: E402
+from trading_bot.orders import OrderFormatter  # noqa: E402
+from trading_bot.user_stream import AccountMirror  # noqa: E402
+
+
+def make_orders(count: int) -> list:
+    """REST-shaped open orders (futures_get_open_orders)"""
+    rng = random.Random(1)
+    orders = []
+    for i in range(count):
+        symbol = rng.choice(['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT'])
+        orders.append({
+            'orderId': 1000 + i, 'symbol': symbol, 'status': 'NEW', 'clientOrderId': f'tb-{i:032x}',
+            'price': f"{rng.uniform(100, 60000):.2f}", 'avgPrice': '0', 'origQty': f"{rng.uniform(0.001, 5):.3f}",
+            'executedQty': '0', 'cumQuote': '0', 'timeInForce': 'GTC', 'type': 'LIMIT', 'reduceOnly': False,
+            'closePosition': False, 'side': rng.choice(['BUY', 'SELL']), 'positionSide': 'BOTH',
+            'stopPrice': '0', 'workingType': 'CONTRACT_PRICE', 'priceProtect': False, 'origType': 'LIMIT',
+            'time': 1700000000000 + i, 'updateTime': 1700000000000 + i,
+        })
+    return orders
+
+
+def make_positions(count: int) -> list:
+    """REST-shaped positions (futures_position_information)"""
+    return [{
+        'symbol': f'SYM{i}USDT', 'positionAmt': f"{(i % 7) - 3}.5", 'entryPrice': '101.25',
+        'breakEvenPrice': '101.3', 'markPrice': '102.5', 'unRealizedProfit': '4.375',
+        'liquidationPrice': '0', 'leverage': '20', 'marginType': 'cross', 'isolatedWallet': '0',
+        'positionSide': 'BOTH', 'notional': '358.75', 'updateTime': 1700000000000,
+    } for i in range(count)]
+
+
+def measure(fn, runs: int) -> float:
+    """Median wall time of fn in ms"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare raw-dict and typed model read paths")
+    parser.add_argument('--orders', type=int, default=2000, help="Open orders in the mirror (default: 2000)")
+    parser.add_argument('--positions', type=int, default=200, help="Positions to format (default: 200)")
+    parser.add_argument('--runs', type=int, default=30, help="Runs per case (default: 30)")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    orders = make_orders(args.orders)
+    body = json.dumps(orders).encode('utf-8')
+    mirror = AccountMirror()
+    mirror.bootstrap({'assets': []}, [], orders)
+    mirror.get_orders()  # Decode once; later typed reads hit the model cache
+    position_dicts = make_positions(args.positions)
+    position_models = [Position.from_dict(p) for p in position_dicts]
+
+    def open_qty_dicts():
+        return sum(float(o['origQty']) - float(o['executedQty']) for o in mirror.get_open_orders())
+
+    def open_qty_models():
+        return sum(o.orig_qty - o.executed_qty for o in mirror.get_orders())
+
+    # name -> (raw-dict path, typed path)
+    cases = {
+        'decode response': (lambda: json.loads(body), lambda: loads(body)),
+        'mirror read': (mirror.get_open_orders, mirror.get_orders),
+        'open quantity': (open_qty_dicts, open_qty_models),
+        'format_orders (all rows)': (
+            lambda: OrderFormatter.format_orders(mirror.get_open_orders(), limit=args.orders),
+            lambda: OrderFormatter.format_orders(mirror.get_orders(), limit=args.orders),
+        ),
+        'format_positions': (
+            lambda: OrderFormatter.format_positions(position_dicts),
+            lambda: OrderFormatter.format_positions(position_models),
+        ),
+    }
+
+    results = {}
+    print(f"{'Case':<26} {'dict ms':>9} {'typed ms':>9} {'speedup':>8}")
+    for name, (raw, typed) in cases.items():
+        raw_ms, typed_ms = measure(raw, args.runs), measure(typed, args.runs)
+        results[name] = {'dict_ms': raw_ms, 'typed_ms': typed_ms}
+        print(f"{name:<26} {raw_ms:>9.2f} {typed_ms:>9.2f} {raw_ms / typed_ms:>7.1f}x")
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'orders': args.orders, 'runs': args.runs, 'results': results}, indent=2))
+        print(f"\nResults written to {path}")
+
+
+if __name__ == '__main__':
+    main()
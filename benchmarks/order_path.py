@@ -0,0 +1,442 @@
+"""
+Order-path latency benchmark
+
+Drives BasicBot and AsyncBasicBot against the in-process fake exchange
+(trading_bot.fake_exchange) and reports, for market orders, limit orders
+and cancels at several concurrency levels:
+
+- p50/p99/p999 latency and orders/sec
+- where the time goes: validation, rate limiter, request signing,
+  network and JSON decode (measured sequentially)
+- OrderValidator and OrderFormatter throughput
+
+p999 needs at least 1000 requests per scenario to be meaningful.
+
+Usage:
+    python benchmarks/order_path.py
+    python benchmarks/order_path.py --requests 2000 --concurrency 1 8 32 --output benchmarks/results/order_path.json
+    python benchmarks/order_path.py --compare benchmarks/results/order_path.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from trading_bot.config import Config  # noqa: E402
+from trading_bot.fake_exchange import FakeExchange, MatchingEngine  # noqa: E402
+from trading_bot.orders import OrderFormatter, OrderValidator  # noqa: E402
+
+SYMBOL = 'BTCUSDT'
+QUANTITY = 0.001
+LIMIT_PRICE = 25000.0  # Far below the fake market, so limit orders rest
+OPERATIONS = ('market', 'limit', 'cancel')
+
+# Effectively unlimited, so the benchmark measures the order path rather
+# than the client-side limiter waiting on the real exchange limits
+UNLIMITED_RATE_LIMITS = [
+    {'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 10 ** 9},
+    {'rateLimitType': 'ORDERS', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 10 ** 9},
+    {'rateLimitType': 'ORDERS', 'interval': 'SECOND', 'intervalNum': 10, 'limit': 10 ** 9},
+]
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list, errors: int, wall: float) -> dict:
+    """Latency percentiles (ms) and throughput for one scenario"""
+    ordered = sorted(latencies)
+    ms = [v * 1000 for v in ordered]
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'mean_ms': round(statistics.fmean(ms), 3) if ms else 0.0,
+        'p50_ms': round(percentile(ms, 50), 3),
+        'p99_ms': round(percentile(ms, 99), 3),
+        'p999_ms': round(percentile(ms, 99.9), 3),
+        'max_ms': round(ms[-1], 3) if ms else 0.0,
+        'ops_per_sec': round(len(latencies) / wall, 1) if wall else 0.0,
+    }
+
+
+def order_call(bot, op: str, targets: list):
+    """Build the call for one operation (limit orders feed the cancel targets)"""
+    if op == 'market':
+        return lambda i: bot.place_market_order(SYMBOL, 'BUY' if i % 2 == 0 else 'SELL', QUANTITY)
+    if op == 'limit':
+        return lambda i: targets.append(bot.place_limit_order(SYMBOL, 'BUY', QUANTITY, LIMIT_PRICE)['orderId'])
+    return lambda i: bot.cancel_order(SYMBOL, targets[i])
+
+
+def run_sync(bot, op: str, concurrency: int, requests: int, targets: list) -> dict:
+    """Run one BasicBot scenario on a thread pool"""
+    call = order_call(bot, op, targets)
+
+    def timed(i):
+        start = time.perf_counter()
+        try:
+            call(i)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.perf_counter()
+        timings = list(pool.map(timed, range(requests)))
+        wall = time.perf_counter() - start
+    latencies = [v for v in timings if v is not None]
+    return summarize(latencies, len(timings) - len(latencies), wall)
+
+
+async def run_async(bot, op: str, concurrency: int, requests: int, targets: list) -> dict:
+    """Run one AsyncBasicBot scenario with `concurrency` workers"""
+    if op == 'market':
+        call = lambda i: bot.place_market_order(SYMBOL, 'BUY' if i % 2 == 0 else 'SELL', QUANTITY)  # noqa: E731
+    elif op == 'limit':
+        async def call(i):
+            targets.append((await bot.place_limit_order(SYMBOL, 'BUY', QUANTITY, LIMIT_PRICE))['orderId'])
+    else:
+        call = lambda i: bot.cancel_order(SYMBOL, targets[i])  # noqa: E731
+
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+class PhaseTimer:
+    """Accumulate time spent in wrapped callables per phase (sequential runs only)"""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self._restore = []
+
+    def _remember(self, owner, name):
+        # The raw attribute (keeps staticmethods intact), or None if inherited
+        self._restore.append((owner, name, vars(owner).get(name)))
+
+    def wrap(self, owner, name: str, phase: str):
+        original = getattr(owner, name)
+        self._remember(owner, name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.totals[phase] += time.perf_counter() - start
+
+        setattr(owner, name, timed)
+
+    def wrap_async(self, owner, name: str, phase: str):
+        original = getattr(owner, name)
+        self._remember(owner, name)
+
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                self.totals[phase] += time.perf_counter() - start
+
+        setattr(owner, name, timed)
+
+    def restore(self):
+        for owner, name, original in reversed(self._restore):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._restore = []
+
+
+VALIDATORS = (
+    'validate_symbol', 'validate_side', 'validate_quantity', 'validate_price',
+    'validate_filters', 'validate_filters_fixed', 'snap_price',
+)
+
+
+def breakdown(totals: dict, total: float, requests: int, phases: list) -> dict:
+    """Mean microseconds per request for each phase, plus the remainder"""
+    result = {phase: round(totals[phase] / requests * 1e6, 1) for phase in phases}
+    result['other'] = round((total - sum(totals[phase] for phase in phases)) / requests * 1e6, 1)
+    result['total'] = round(total / requests * 1e6, 1)
+    return result
+
+
+def breakdown_sync(bot, requests: int) -> dict:
+    """Per-phase timing of sequential BasicBot calls"""
+    client = bot.client
+    results = {}
+    for op in OPERATIONS:
+        timer = PhaseTimer()
+        targets = [] if op != 'cancel' else [
+            bot.place_limit_order(SYMBOL, 'BUY', QUANTITY, LIMIT_PRICE)['orderId'] for _ in range(requests)
+        ]
+        for name in VALIDATORS:
+            timer.wrap(OrderValidator, name, 'validation')
+        timer.wrap(bot.limiter, 'acquire', 'rate_limit')
+        timer.wrap(client, '_generate_signature', 'signing')
+        timer.wrap(client.session, 'request', 'network')
+        timer.wrap(client, '_handle_response', 'json_decode')
+        call = order_call(bot, op, targets)
+        try:
+            start = time.perf_counter()
+            for i in range(requests):
+                call(i)
+            total = time.perf_counter() - start
+        finally:
+            timer.restore()
+        if op == 'limit':
+            for order_id in targets:
+                bot.cancel_order(SYMBOL, order_id)
+        results[op] = breakdown(timer.totals, total, requests,
+                                ['validation', 'rate_limit', 'signing', 'network', 'json_decode'])
+    return results
+
+
+async def breakdown_async(bot, requests: int) -> dict:
+    """Per-phase timing of sequential AsyncBasicBot calls"""
+    import trading_bot.async_bot as async_bot
+
+    results = {}
+    for op in OPERATIONS:
+        timer = PhaseTimer()
+        targets = []
+        if op == 'cancel':
+            for _ in range(requests):
+                targets.append((await bot.place_limit_order(SYMBOL, 'BUY', QUANTITY, LIMIT_PRICE))['orderId'])
+        for name in VALIDATORS:
+            timer.wrap(OrderValidator, name, 'validation')
+        timer.wrap_async(bot.limiter, 'acquire_async', 'rate_limit')
+        timer.wrap(bot, '_sign', 'signing')
+        timer.wrap_async(bot, '_request', 'request')
+        # _request decodes with the module-level models.loads import
+        timer.wrap(async_bot, 'loads', 'json_decode')
+        if op == 'market':
+            call = lambda i: bot.place_market_order(SYMBOL, 'BUY' if i % 2 == 0 else 'SELL', QUANTITY)  # noqa: E731
+        elif op == 'limit':
+            async def call(i):
+                targets.append((await bot.place_limit_order(SYMBOL, 'BUY', QUANTITY, LIMIT_PRICE))['orderId'])
+        else:
+            call = lambda i: bot.cancel_order(SYMBOL, targets[i])  # noqa: E731
+        try:
+            start = time.perf_counter()
+            for i in range(requests):
+                await call(i)
+            total = time.perf_counter() - start
+        finally:
+            timer.restore()
+        if op == 'limit':
+            for order_id in targets:
+                await bot.cancel_order(SYMBOL, order_id)
+        totals = timer.totals
+        # The request phase covers limiter, signing, HTTP round trip and decode
+        totals['network'] = totals['request'] - totals['rate_limit'] - totals['signing'] - totals['json_decode']
+        results[op] = breakdown(totals, total, requests,
+                                ['validation', 'rate_limit', 'signing', 'network', 'json_decode'])
+    return results
+
+
+def throughput(fn, min_time: float = 0.5) -> dict:
+    """Calls per second of fn, measured for at least min_time seconds"""
+    calls, batch = 0, 100
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            fn()
+        calls += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        batch *= 2
+    return {'ops_per_sec': round(calls / elapsed, 1), 'us_per_op': round(elapsed / calls * 1e6, 3)}
+
+
+def bench_validation_formatting(bot) -> dict:
+    """OrderValidator and OrderFormatter throughput on realistic inputs"""
+    filters = bot.symbols.get(SYMBOL) if bot.symbols is not None else None
+    spec = {'symbol': SYMBOL, 'side': 'BUY', 'type': 'LIMIT', 'quantity': 0.0123, 'price': 50123.45}
+    order = bot.place_limit_order(SYMBOL, 'BUY', QUANTITY, LIMIT_PRICE)
+    bot.cancel_order(SYMBOL, order['orderId'])
+    account = bot.get_account_balance()
+    positions = bot.get_positions()
+
+    def basic():
+        OrderValidator.validate_symbol(SYMBOL)
+        OrderValidator.validate_side('buy')
+        OrderValidator.validate_quantity(0.0123)
+        OrderValidator.validate_price(50123.45)
+
+    return {
+        'OrderValidator.basic': throughput(basic),
+        'OrderValidator.validate_filters': throughput(
+            lambda: OrderValidator.validate_filters(filters, 0.0123, 50123.45)
+        ),
+        'OrderValidator.validate_order_spec': throughput(lambda: OrderValidator.validate_order_spec(spec, filters)),
+        'OrderFormatter.format_order_response': throughput(lambda: OrderFormatter.format_order_response(order)),
+        'OrderFormatter.format_balance': throughput(lambda: OrderFormatter.format_balance(account)),
+        'OrderFormatter.format_positions': throughput(lambda: OrderFormatter.format_positions(positions)),
+    }
+
+
+def print_latency_table(title: str, results: dict):
+    print(f"\n{title}")
+    print(f"{'op':<8} {'conc':>5} {'p50 ms':>9} {'p99 ms':>9} {'p999 ms':>9} {'max ms':>9} {'orders/s':>10} {'errors':>7}")
+    for op, levels in results.items():
+        for concurrency, r in levels.items():
+            print(f"{op:<8} {concurrency:>5} {r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['p999_ms']:>9.3f} "
+                  f"{r['max_ms']:>9.3f} {r['ops_per_sec']:>10.1f} {r['errors']:>7}")
+
+
+def print_breakdown(title: str, results: dict):
+    print(f"\n{title} (mean us/request, sequential)")
+    phases = list(next(iter(results.values())))
+    print(f"{'op':<8} " + ' '.join(f"{p:>11}" for p in phases))
+    for op, r in results.items():
+        print(f"{op:<8} " + ' '.join(f"{r[p]:>11.1f}" for p in phases))
+
+
+def compare(current: dict, baseline: dict, threshold: float):
+    """Print latency/throughput changes against a previous results file"""
+    print(f"\nComparison with baseline ({baseline.get('timestamp_iso', 'unknown')}), "
+          f"regressions over {threshold:.0%} flagged")
+    for client in ('sync', 'async'):
+        for op, levels in current.get(client, {}).items():
+            for concurrency, r in levels.items():
+                base = baseline.get(client, {}).get(op, {}).get(str(concurrency))
+                if not base:
+                    continue
+                for key, higher_is_better in (('p50_ms', False), ('p99_ms', False), ('ops_per_sec', True)):
+                    if not base[key]:
+                        continue
+                    change = (r[key] - base[key]) / base[key]
+                    worse = change < -threshold if higher_is_better else change > threshold
+                    flag = '  REGRESSION' if worse else ''
+                    print(f"{client:<6} {op:<7} c={concurrency:<4} {key:<12} {base[key]:>10.3f} -> "
+                          f"{r[key]:>10.3f} ({change:+.1%}){flag}")
+    for name, r in current.get('micro', {}).items():
+        base = baseline.get('micro', {}).get(name)
+        if base and base['ops_per_sec']:
+            change = (r['ops_per_sec'] - base['ops_per_sec']) / base['ops_per_sec']
+            flag = '  REGRESSION' if change < -threshold else ''
+            print(f"micro  {name:<40} {base['ops_per_sec']:>12.0f} -> {r['ops_per_sec']:>12.0f} ({change:+.1%}){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure order-path latency against a local fake exchange")
+    parser.add_argument('--requests', type=int, default=1000, help="Requests per scenario (default: 1000)")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64],
+                        help="Concurrency levels (default: 1 4 16 64)")
+    parser.add_argument('--breakdown-requests', type=int, default=300,
+                        help="Sequential requests per operation for the phase breakdown (default: 300)")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Injected exchange latency")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="Injected exchange latency jitter")
+    parser.add_argument('--skip-async', action='store_true', help="Only benchmark BasicBot")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Regression threshold (default: 0.10)")
+    args = parser.parse_args()
+
+    # Keep per-order log lines off the console and out of the measurements
+    logging.getLogger('TradingBot').setLevel(logging.WARNING)
+
+    engine = MatchingEngine(seed=1, rate_limits=UNLIMITED_RATE_LIMITS)
+    exchange = FakeExchange(engine, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, seed=1).start()
+    cache_dir = tempfile.mkdtemp(prefix='order_path_')
+    Config.BASE_URL_OVERRIDE = exchange.base_url
+    Config.WS_URL_OVERRIDE = exchange.ws_url
+    Config.SYMBOL_CACHE_PATH = f"{cache_dir}/exchange_info.json"
+    Config.CONNECTIVITY_CACHE_PATH = f"{cache_dir}/connectivity.json"
+
+    from trading_bot.bot import BasicBot
+
+    results = {
+        'python': sys.version.split()[0],
+        'timestamp': time.time(),
+        'timestamp_iso': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {'requests': args.requests, 'concurrency': args.concurrency,
+                   'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms},
+    }
+
+    try:
+        bot = BasicBot('bench-key', 'bench-secret', testnet=True)
+
+        print(f"Fake exchange at {exchange.base_url}, {args.requests} requests per scenario")
+        results['sync'] = {op: {} for op in OPERATIONS}
+        for concurrency in args.concurrency:
+            targets = []
+            for op in OPERATIONS:
+                results['sync'][op][str(concurrency)] = run_sync(bot, op, concurrency, args.requests, targets)
+        print_latency_table("BasicBot (thread pool)", results['sync'])
+
+        results['sync_breakdown'] = breakdown_sync(bot, args.breakdown_requests)
+        print_breakdown("BasicBot phases", results['sync_breakdown'])
+
+        if not args.skip_async:
+            from trading_bot.async_bot import AsyncBasicBot
+
+            async def run_all():
+                async with AsyncBasicBot('bench-key', 'bench-secret', testnet=True) as async_bot:
+                    levels = {op: {} for op in OPERATIONS}
+                    for concurrency in args.concurrency:
+                        targets = []
+                        for op in OPERATIONS:
+                            levels[op][str(concurrency)] = await run_async(
+                                async_bot, op, concurrency, args.requests, targets
+                            )
+                    return levels, await breakdown_async(async_bot, args.breakdown_requests)
+
+            results['async'], results['async_breakdown'] = asyncio.run(run_all())
+            print_latency_table("AsyncBasicBot (asyncio workers)", results['async'])
+            print_breakdown("AsyncBasicBot phases", results['async_breakdown'])
+
+        results['micro'] = bench_validation_formatting(bot)
+        print(f"\n{'Validation / formatting':<40} {'ops/s':>12} {'us/op':>9}")
+        for name, r in results['micro'].items():
+            print(f"{name:<40} {r['ops_per_sec']:>12.0f} {r['us_per_op']:>9.2f}")
+    finally:
+        exchange.stop()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f), args.threshold)
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Cold-start latency benchmark
+
+Runs each startup scenario in a fresh Python process (so nothing is
+cached in sys.modules) and reports min/median/max wall time.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --output benchmarks/results/startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name -> code run in a fresh interpreter
+SCENARIOS = {
+    'python': 'pass',
+    'import trading_bot.bot': 'import trading_bot.bot',
+    'import cli': 'import cli',
+    'BasicBot(lazy=True)': (
+        "from trading_bot.bot import BasicBot\n"
+        "BasicBot('key', 'secret', testnet=True, lazy=True)"
+    ),
+    'import binance.client': 'import binance.client',
+}
+
+
+def time_scenario(code: str, runs: int) -> list:
+    """Run a snippet in fresh interpreters and return wall times in ms"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='0')
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=ROOT, env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure trading bot cold-start latency")
+    parser.add_argument('--runs', type=int, default=10, help="Runs per scenario (default: 10)")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'Scenario':<28} {'min ms':>9} {'median ms':>10} {'max ms':>9}")
+    for name, code in SCENARIOS.items():
+        timings = time_scenario(code, args.runs)
+        results[name] = {
+            'runs': args.runs,
+            'min_ms': round(min(timings), 2),
+            'median_ms': round(statistics.median(timings), 2),
+            'max_ms': round(max(timings), 2),
+        }
+        r = results[name]
+        print(f"{name:<28} {r['min_ms']:>9.1f} {r['median_ms']:>10.1f} {r['max_ms']:>9.1f}")
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'timestamp': time.time(), 'results': results}, f, indent=2)
+        print(f"\nResults written to {path}")
+
+
+if __name__ == '__main__':
+    main()
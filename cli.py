@@ -1,19 +1,40 @@
 """
 Interactive CLI for the trading bot
 Built with Rich library for better UI
+
+Non-interactive subcommands:
+    python main.py bulk orders.csv [--dry-run] [-o results.jsonl]
+    python main.py cancel [--symbol BTCUSDT] [--side BUY] [--min-price P] [--max-price P]
+    python main.py flatten [--symbol BTCUSDT] [--yes]
+    python main.py dashboard [--symbol BTCUSDT]
+    python main.py positions [--symbol BTCUSDT] [--watch]
 """
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
-from rich.table import Table
-from rich import box
-from trading_bot.bot import BasicBot
+import argparse
+import sys
+import time
 from trading_bot.config import Config
 from trading_bot.logger import logger, get_log_file_path
 from trading_bot.orders import OrderFormatter
-from binance.exceptions import BinanceAPIException
+from trading_bot import exceptions
+
+
+class _LazyConsole:
+    """The shared rich Console, created on first use so `--help` and imports do not load rich"""
+    
+    def __init__(self):
+        self._console = None
+    
+    def get(self):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+    
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
 
-console = Console()
+console = _LazyConsole()
 
 
 class TradingBotCLI:
@@ -41,6 +62,7 @@ class TradingBotCLI:
             console.print("[bold]Initializing bot...[/bold]")
             Config.validate()
             
+            from trading_bot.bot import BasicBot
             self.bot = BasicBot(
                 api_key=Config.API_KEY,
                 api_secret=Config.API_SECRET,
@@ -55,7 +77,7 @@ class TradingBotCLI:
             console.print("\n[yellow]Please update your .env file with valid API credentials.[/yellow]")
             console.print("[dim]Get credentials from: https://testnet.binancefuture.com/[/dim]")
             return False
-        except BinanceAPIException as e:
+        except exceptions.BinanceAPIException as e:
             console.print(f"[bold red]API Error:[/bold red] {e.message}")
             return False
         except Exception as e:
@@ -64,6 +86,10 @@ class TradingBotCLI:
     
     def display_menu(self):
         """Display main menu"""
+        from rich import box
+        from rich.panel import Panel
+        from rich.table import Table
+        
         menu = Table(show_header=False, box=box.SIMPLE, padding=(0, 2))
         menu.add_column("Option", style="bold cyan", width=4)
         menu.add_column("Action", style="white")
@@ -75,12 +101,16 @@ class TradingBotCLI:
         menu.add_row("5", "View Open Orders")
         menu.add_row("6", "View Positions")
         menu.add_row("7", "Cancel Order")
+        menu.add_row("8", "View Request Metrics")
+        menu.add_row("9", "Live Dashboard")
         menu.add_row("0", "Exit")
         
         console.print(Panel(menu, title="[bold]Main Menu[/bold]", border_style="cyan"))
     
     def place_market_order(self):
         """Handle market order placement"""
+        from rich.prompt import Prompt, Confirm
+        
         try:
             console.print("\n[bold]Place Market Order[/bold]")
             
@@ -114,6 +144,8 @@ class TradingBotCLI:
     
     def place_limit_order(self):
         """Handle limit order placement"""
+        from rich.prompt import Prompt, Confirm
+        
         try:
             console.print("\n[bold]Place Limit Order[/bold]")
             
@@ -150,6 +182,8 @@ class TradingBotCLI:
     
     def place_stop_limit_order(self):
         """Handle stop-limit order placement"""
+        from rich.prompt import Prompt, Confirm
+        
         try:
             console.print("\n[bold]Place Stop-Limit Order[/bold] [dim](Bonus Feature)[/dim]")
             
@@ -191,7 +225,7 @@ class TradingBotCLI:
         """Display account balance"""
         try:
             console.print("\n[bold]Fetching account balance...[/bold]")
-            balance = self.bot.get_account_balance()
+            balance = self.bot.get_account_balance(typed=True)
             
             table = OrderFormatter.format_balance(balance)
             console.print("\n")
@@ -202,20 +236,20 @@ class TradingBotCLI:
     
     def view_open_orders(self):
         """Display open orders"""
+        from rich.prompt import Prompt
+        
         try:
             console.print("\n[bold]Fetching open orders...[/bold]")
             
             symbol = Prompt.ask("Symbol (leave empty for all)", default="")
-            orders = self.bot.get_open_orders(symbol if symbol else None)
+            orders = self.bot.get_open_orders(symbol if symbol else None, typed=True)
             
             if not orders:
                 console.print("[yellow]No open orders found[/yellow]")
                 return
             
-            for order in orders:
-                table = OrderFormatter.format_order_response(order)
-                console.print("\n")
-                console.print(table)
+            console.print("\n")
+            console.print(OrderFormatter.format_orders(orders))
                 
         except Exception as e:
             console.print(f"[bold red]Error:[/bold red] {e}")
@@ -224,7 +258,7 @@ class TradingBotCLI:
         """Display open positions"""
         try:
             console.print("\n[bold]Fetching positions...[/bold]")
-            positions = self.bot.get_positions()
+            positions = self.bot.get_position_pnl()
             
             table = OrderFormatter.format_positions(positions)
             console.print("\n")
@@ -235,6 +269,8 @@ class TradingBotCLI:
     
     def cancel_order(self):
         """Cancel an order"""
+        from rich.prompt import Prompt, Confirm
+        
         try:
             console.print("\n[bold]Cancel Order[/bold]")
             
@@ -250,8 +286,32 @@ class TradingBotCLI:
         except Exception as e:
             console.print(f"[bold red]Error:[/bold red] {e}")
     
+    def view_metrics(self):
+        """Display per-endpoint request latency and error rates"""
+        try:
+            table = OrderFormatter.format_metrics(self.bot.metrics.snapshot())
+            console.print("\n")
+            console.print(table)
+            
+            if Config.METRICS_PORT:
+                console.print(f"[dim]Prometheus endpoint: http://{Config.METRICS_HOST}:{Config.METRICS_PORT}/metrics[/dim]")
+            
+        except Exception as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+    
+    def live_dashboard(self, symbol: str = None):
+        """Show orders, positions, PnL and balances updating live from the streams"""
+        from trading_bot.dashboard import Dashboard
+        
+        try:
+            Dashboard(self.bot, refresh_per_second=Config.DASHBOARD_FPS, symbol=symbol).run()
+        except Exception as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+    
     def run(self):
         """Run the CLI"""
+        from rich.prompt import Prompt
+        
         self.display_banner()
         
         if not self.initialize_bot():
@@ -263,7 +323,7 @@ class TradingBotCLI:
                 self.display_menu()
                 console.print()
                 
-                choice = Prompt.ask("Select option", choices=["0", "1", "2", "3", "4", "5", "6", "7"])
+                choice = Prompt.ask("Select option", choices=["0", "1", "2", "3", "4", "5", "6", "7", "8", "9"])
                 
                 if choice == "1":
                     self.place_market_order()
@@ -279,6 +339,10 @@ class TradingBotCLI:
                     self.view_positions()
                 elif choice == "7":
                     self.cancel_order()
+                elif choice == "8":
+                    self.view_metrics()
+                elif choice == "9":
+                    self.live_dashboard()
                 elif choice == "0":
                     console.print("\n[bold cyan]Thank you for using the Trading Bot![/bold cyan]")
                     console.print(f"[dim]Logs saved to: {get_log_file_path()}[/dim]\n")
@@ -295,8 +359,178 @@ class TradingBotCLI:
                 logger.exception("Unexpected error in CLI")
 
 
+def bulk_orders(args) -> int:
+    """Validate and submit orders from a CSV/JSONL file; results go to stdout or --output as JSONL"""
+    from rich.console import Console
+    from trading_bot.bot import BasicBot
+    from trading_bot.bulk import BulkSubmitter, detect_format, read_specs
+    from trading_bot.orders import SymbolInfoCache
+    
+    errors = Console(stderr=True)
+    fmt = args.format or ('jsonl' if args.file == '-' else detect_format(args.file))
+    # Open the files before connecting so a bad path fails fast and cleanly
+    try:
+        source = sys.stdin if args.file == '-' else open(args.file, newline='')
+    except OSError as e:
+        errors.print(f"[bold red]Error:[/bold red] Cannot read {args.file}: {e.strerror}")
+        return 1
+    try:
+        out = sys.stdout if args.output in (None, '-') else open(args.output, 'w')
+    except OSError as e:
+        if source is not sys.stdin:
+            source.close()
+        errors.print(f"[bold red]Error:[/bold red] Cannot write {args.output}: {e.strerror}")
+        return 1
+    
+    try:
+        if args.dry_run and not (Config.API_KEY and Config.API_SECRET):
+            # No credentials: validate against the cached exchange info only
+            submitter = BulkSubmitter(symbols=SymbolInfoCache(), dry_run=True)
+        else:
+            Config.validate()
+            bot = BasicBot(Config.API_KEY, Config.API_SECRET, Config.TESTNET, lazy=args.dry_run or None)
+            submitter = BulkSubmitter(bot, concurrency=args.concurrency, dry_run=args.dry_run)
+    except Exception as e:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+        errors.print(f"[bold red]Error:[/bold red] {e}")
+        return 1
+    
+    try:
+        summary = submitter.run(read_specs(source, fmt), out)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    
+    mode = "validated" if args.dry_run else "placed"
+    count = summary['valid'] if args.dry_run else summary['placed']
+    errors.print(
+        f"[bold]{summary['read']}[/bold] order(s) read, [green]{count} {mode}[/green], "
+        f"[red]{summary['rejected']} rejected[/red]"
+        + ("" if args.dry_run else f", [red]{summary['failed']} failed[/red] in {summary['requests']} request(s)")
+    )
+    errors.print(f"[dim]{summary['elapsed']:.2f}s, {summary['orders_per_second']:.1f} orders/s[/dim]")
+    return 0 if summary['rejected'] == 0 and summary['failed'] == 0 else 2
+
+
+def bulk_cancel(args) -> int:
+    """Cancel all open orders, or those matching the filters"""
+    from rich.prompt import Confirm
+    
+    cli = TradingBotCLI()
+    if not cli.initialize_bot():
+        return 1
+    unfiltered = not (args.symbol or args.side or args.min_price is not None or args.max_price is not None)
+    if unfiltered and not args.yes and not Confirm.ask(
+        "\n[bold red]Cancel ALL open orders on every symbol?[/bold red]", default=False
+    ):
+        console.print("[yellow]Cancel aborted[/yellow]")
+        return 1
+    reports = cli.bot.cancel_orders(args.symbol, args.side, args.min_price, args.max_price)
+    console.print(OrderFormatter.format_symbol_reports(reports, "Cancel Orders"))
+    return 0 if all(r['success'] for r in reports.values()) else 2
+
+
+def flatten(args) -> int:
+    """Close every position with reduce-only market orders"""
+    from rich.prompt import Confirm
+    
+    cli = TradingBotCLI()
+    if not cli.initialize_bot():
+        return 1
+    if not args.yes and not Confirm.ask(
+        f"\n[bold red]Close ALL positions{' on ' + args.symbol.upper() if args.symbol else ''} at market?[/bold red]",
+        default=False
+    ):
+        console.print("[yellow]Flatten aborted[/yellow]")
+        return 1
+    reports = cli.bot.flatten_all(args.symbol, cancel_orders=not args.keep_orders)
+    console.print(OrderFormatter.format_symbol_reports(reports, "Flatten"))
+    return 0 if all(r['success'] for r in reports.values()) else 2
+
+
+def watch_positions(args) -> int:
+    """Show positions with PnL, margin ratio and liquidation distance (live with --watch)"""
+    cli = TradingBotCLI()
+    if not cli.initialize_bot():
+        return 1
+    if not args.watch:
+        console.print(OrderFormatter.format_positions(cli.bot.get_position_pnl(args.symbol)))
+        return 0
+    
+    from rich.live import Live
+    
+    cli.bot.start_pnl_stream()
+    engine = cli.bot.pnl_stream.engine
+    symbol = args.symbol.upper() if args.symbol else None
+    try:
+        with Live(OrderFormatter.format_positions(engine.snapshot(symbol)), console=console.get(), auto_refresh=False) as live:
+            while True:
+                time.sleep(args.interval)
+                live.update(OrderFormatter.format_positions(engine.snapshot(symbol)), refresh=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cli.bot.stop_pnl_stream()
+        cli.bot.stop_user_stream()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Binance Futures trading bot (interactive without a command)")
+    commands = parser.add_subparsers(dest='command')
+    
+    bulk = commands.add_parser('bulk', help="Submit orders from a CSV/JSONL file")
+    bulk.add_argument('file', help="Order file (CSV with a header row, or JSONL); '-' reads stdin")
+    bulk.add_argument('--format', choices=['csv', 'jsonl'], help="Input format (default: from the file name)")
+    bulk.add_argument('-o', '--output', help="Write JSONL results here (default: stdout)")
+    bulk.add_argument('--dry-run', action='store_true', help="Validate every order locally; send nothing")
+    bulk.add_argument('--concurrency', type=int, default=None,
+                      help="Max concurrent batch requests (default: BATCH_MAX_WORKERS)")
+    
+    cancel = commands.add_parser('cancel', help="Cancel all open orders, or those matching filters")
+    cancel.add_argument('--symbol', help="Only this symbol (default: all symbols)")
+    cancel.add_argument('--side', choices=['BUY', 'SELL'], type=str.upper)
+    cancel.add_argument('--min-price', type=float)
+    cancel.add_argument('--max-price', type=float)
+    cancel.add_argument('-y', '--yes', action='store_true', help="Do not ask for confirmation without filters")
+    
+    flat = commands.add_parser('flatten', help="Close all positions with reduce-only market orders")
+    flat.add_argument('--symbol', help="Only this symbol (default: all symbols)")
+    flat.add_argument('--keep-orders', action='store_true', help="Leave open orders in place")
+    flat.add_argument('-y', '--yes', action='store_true', help="Do not ask for confirmation")
+    
+    dashboard = commands.add_parser('dashboard', help="Show the live account dashboard")
+    dashboard.add_argument('--symbol', help="Only show this symbol")
+    
+    positions = commands.add_parser('positions', help="Show positions with live PnL and liquidation distance")
+    positions.add_argument('--symbol', help="Only show this symbol")
+    positions.add_argument('--watch', action='store_true', help="Keep updating from the mark-price stream")
+    positions.add_argument('--interval', type=float, default=1.0, help="Seconds between redraws with --watch")
+    return parser
+
+
 def main():
     """Main entry point"""
+    args = build_parser().parse_args()
+    if args.command == 'bulk':
+        sys.exit(bulk_orders(args))
+    if args.command == 'cancel':
+        sys.exit(bulk_cancel(args))
+    if args.command == 'flatten':
+        sys.exit(flatten(args))
+    if args.command == 'positions':
+        sys.exit(watch_positions(args))
+    if args.command == 'dashboard':
+        cli = TradingBotCLI()
+        if cli.initialize_bot():
+            cli.live_dashboard(args.symbol)
+        return
+    
     cli = TradingBotCLI()
     cli.run()
 
@@ -0,0 +1,126 @@
+"""
+Coalesced, TTL-cached account snapshot reads
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def _copy(value: Any) -> Any:
+    """Copy the dicts and lists of a decoded JSON response (leaves are immutable)"""
+    if isinstance(value, dict):
+        value = value.copy()
+        for k, v in value.items():
+            if isinstance(v, (dict, list)):
+                value[k] = _copy(v)
+        return value
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+class _Flight:
+    """One in-progress fetch that concurrent callers wait on"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SnapshotCache:
+    """
+    TTL cache for account reads with single-flight coalescing
+
+    Concurrent callers asking for the same snapshot share one in-flight
+    request instead of each sending their own, and results are reused
+    for `ttl` seconds. invalidate() drops cached snapshots (e.g. after an
+    order is placed); a fetch that was already in flight still answers
+    its waiters but is not cached, since it may predate the change.
+
+    Every caller gets its own copy of the snapshot, so callers can modify
+    what they get without changing what others (or later hits) see.
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds a snapshot is reused (0 disables caching but
+                still coalesces concurrent requests)
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._values: Dict[Hashable, tuple] = {}
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Get a snapshot, fetching it if missing or expired
+
+        Args:
+            key: Snapshot key (e.g. 'account', ('open_orders', 'BTCUSDT'))
+            fetch: Callable that performs the REST request
+
+        Returns:
+            A copy of the cached or freshly fetched snapshot
+        """
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.ttl:
+                self.hits += 1
+                return _copy(cached[1])
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _copy(flight.result)
+
+        try:
+            flight.result = fetch()
+            return _copy(flight.result)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None and generation == self._generation:
+                    self._values[key] = (time.monotonic(), flight.result)
+                del self._flights[key]
+            flight.done.set()
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """
+        Drop cached snapshots
+
+        Args:
+            key: Snapshot to drop (default: all of them)
+        """
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/coalesced counters"""
+        return {'hits': self.hits, 'misses': self.misses, 'coalesced': self.coalesced}
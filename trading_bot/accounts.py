@@ -0,0 +1,389 @@
+"""
+Multi-account execution across worker processes
+
+AccountManager loads several credential profiles and runs one BasicBot
+per account in its own process, so every account has its own HTTP
+connection pool, rate limiter and GIL. Order intents (order specs as
+accepted by place_orders_batch) and other bot calls are broadcast to all
+accounts at once and the results are gathered with a per-account latency
+breakdown.
+
+Usage:
+    with AccountManager(load_profiles()) as accounts:
+        results = accounts.place_orders([
+            {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': 0.01},
+        ])
+        for name, result in results.items():
+            print(name, result['success'], result['latency']['total_ms'])
+"""
+import json
+import multiprocessing
+import os
+import re
+import time
+from itertools import count
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Union
+from .config import Config
+from .logger import logger
+
+# Seconds to wait for a worker to connect, and for a call to return
+START_TIMEOUT = 60.0
+CALL_TIMEOUT = 120.0
+
+
+class AccountProfile(NamedTuple):
+    """Credentials of one account"""
+    name: str
+    api_key: str
+    api_secret: str
+    testnet: bool = True
+
+
+def load_profiles(path: Optional[str] = None, names: Optional[Iterable[str]] = None) -> List[AccountProfile]:
+    """
+    Load account profiles
+
+    Profiles come from a JSON file ({name: {"api_key", "api_secret",
+    "testnet"}}) if it exists, otherwise from the environment:
+    BINANCE_ACCOUNTS=main,sub1 with BINANCE_API_KEY_MAIN,
+    BINANCE_API_SECRET_MAIN, ... (TESTNET_<NAME> defaults to TESTNET).
+
+    Args:
+        path: Profiles file (default: Config.ACCOUNTS_PATH)
+        names: Only load these accounts (default: all)
+
+    Returns:
+        Profiles in file / BINANCE_ACCOUNTS order
+    """
+    path = path or Config.ACCOUNTS_PATH
+    profiles = []
+    if path and os.path.exists(path):
+        with open(path) as f:
+            for name, entry in json.load(f).items():
+                profiles.append(AccountProfile(
+                    name, entry['api_key'], entry['api_secret'], bool(entry.get('testnet', Config.TESTNET))
+                ))
+    else:
+        for name in filter(None, (n.strip() for n in Config.ACCOUNTS.split(','))):
+            suffix = name.upper()
+            api_key = os.getenv(f'BINANCE_API_KEY_{suffix}')
+            api_secret = os.getenv(f'BINANCE_API_SECRET_{suffix}')
+            if not api_key or not api_secret:
+                raise ValueError(f"Credentials for account '{name}' not found. Please set "
+                                 f"BINANCE_API_KEY_{suffix} and BINANCE_API_SECRET_{suffix}")
+            testnet = os.getenv(f'TESTNET_{suffix}', str(Config.TESTNET)).lower() == 'true'
+            profiles.append(AccountProfile(name, api_key, api_secret, testnet))
+
+    if names is not None:
+        wanted = set(names)
+        missing = wanted - {p.name for p in profiles}
+        if missing:
+            raise ValueError(f"Unknown account(s): {', '.join(sorted(missing))}")
+        profiles = [p for p in profiles if p.name in wanted]
+    if not profiles:
+        raise ValueError("No account profiles found. Create accounts.json or set BINANCE_ACCOUNTS")
+    return profiles
+
+
+def _error(e: BaseException) -> Dict[str, Any]:
+    return {'code': getattr(e, 'code', None), 'msg': getattr(e, 'message', None) or str(e)}
+
+
+def account_history_path(path: str, name: str) -> str:
+    """
+    Per-account order history database path
+
+    The history store is not keyed by account (fill cursors are per
+    symbol), so each account gets its own file: history.db -> history-<name>.db
+    """
+    path = Path(path)
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+    return str(path.with_name(f"{path.stem}-{safe_name}{path.suffix}"))
+
+
+def _worker(profile: AccountProfile, config: Dict[str, Any], conn):
+    """
+    Worker process: connect one BasicBot and serve calls until told to stop
+
+    Requests are (request_id, method, args, kwargs); replies are
+    (request_id, result, error, received, done) with monotonic times so
+    the parent can split latency into dispatch, exchange and return.
+    """
+    for key, value in config.items():
+        setattr(Config, key, value)
+    Config.ORDER_HISTORY_PATH = account_history_path(Config.ORDER_HISTORY_PATH, profile.name)
+    from .bot import BasicBot
+
+    started = time.monotonic()
+    try:
+        bot = BasicBot(profile.api_key, profile.api_secret, profile.testnet)
+        conn.send((0, {'pid': os.getpid(), 'connect_ms': (time.monotonic() - started) * 1000}, None, 0.0, 0.0))
+    except Exception as e:
+        conn.send((0, None, _error(e), 0.0, 0.0))
+        return
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+        request_id, method, args, kwargs = request
+        received = time.monotonic()
+        result, error = None, None
+        try:
+            target = bot
+            for part in method.split('.'):
+                if part.startswith('_'):
+                    raise ValueError(f"Private method not allowed: {method}")
+                target = getattr(target, part)
+            result = target(*args, **kwargs)
+        except Exception as e:
+            error = _error(e)
+        conn.send((request_id, result, error, received, time.monotonic()))
+
+    bot.stop_user_stream()
+    bot.unwatch_order_book()
+
+
+class AccountManager:
+    """
+    Run one BasicBot per account in worker processes
+
+    Calls are broadcast to every selected account and sent before any
+    reply is awaited, so the accounts' requests run in parallel. Each
+    result is a dict with 'account', 'success', 'result', 'error' and
+    'latency' (dispatch_ms: send to worker start, exchange_ms: bot call in
+    the worker, return_ms: reply transfer, total_ms).
+    """
+
+    def __init__(self, profiles: Iterable[AccountProfile], start_method: str = 'spawn'):
+        """
+        Initialize the manager (workers start on start() or on entering
+        the manager as a context manager)
+
+        Args:
+            profiles: Accounts to run
+            start_method: multiprocessing start method; 'spawn' keeps
+                workers free of the parent's threads and sockets
+        """
+        self.profiles = {p.name: p for p in profiles}
+        if not self.profiles:
+            raise ValueError("At least one account profile is required")
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: Dict[str, Any] = {}
+        self._conns: Dict[str, Any] = {}
+        self._ids = count(1)
+
+    def __enter__(self) -> "AccountManager":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def accounts(self) -> List[str]:
+        """Names of the running accounts"""
+        return list(self._conns)
+
+    def start(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Start a worker process per account and wait until each bot is connected
+
+        Accounts that fail to connect are logged and left out.
+
+        Returns:
+            Account name -> {'pid', 'connect_ms'} or {'error'}
+        """
+        config = {k: v for k, v in vars(Config).items() if k.isupper()}
+        pending = {}
+        for name, profile in self.profiles.items():
+            parent, child = self._context.Pipe()
+            process = self._context.Process(
+                target=_worker, args=(profile, config, child), name=f'Account-{name}', daemon=True
+            )
+            process.start()
+            child.close()
+            self._workers[name] = process
+            pending[parent] = name
+
+        status = {}
+        deadline = time.monotonic() + START_TIMEOUT
+        while pending:
+            ready = wait(list(pending), timeout=max(deadline - time.monotonic(), 0))
+            if not ready:
+                break
+            for conn in ready:
+                name = pending.pop(conn)
+                try:
+                    _, info, error, _, _ = conn.recv()
+                except EOFError:
+                    info, error = None, {'code': None, 'msg': 'Worker exited during startup'}
+                if error is None:
+                    self._conns[name] = conn
+                    status[name] = info
+                    logger.info("✓ Account %s connected (pid %s, %.0fms)", name, info['pid'], info['connect_ms'])
+                else:
+                    status[name] = {'error': error}
+                    logger.error("Account %s failed to connect: %s", name, error['msg'])
+                    self._stop_worker(name, conn)
+        for conn, name in pending.items():
+            status[name] = {'error': {'code': None, 'msg': 'Timed out connecting'}}
+            logger.error("Account %s timed out connecting", name)
+            self._stop_worker(name, conn)
+        return status
+
+    def close(self, timeout: float = 5.0):
+        """Stop all worker processes"""
+        for name, conn in list(self._conns.items()):
+            self._stop_worker(name, conn, timeout)
+        self._conns.clear()
+
+    def _stop_worker(self, name: str, conn, timeout: float = 5.0):
+        try:
+            conn.send(None)
+        except (OSError, ValueError):
+            pass
+        conn.close()
+        process = self._workers.pop(name, None)
+        if process is not None:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+    def call(
+        self,
+        method: str,
+        *args,
+        accounts: Optional[Iterable[str]] = None,
+        timeout: float = CALL_TIMEOUT,
+        **kwargs
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Call a BasicBot method on every account
+
+        Args:
+            method: Method name, e.g. 'get_positions' or 'metrics.snapshot'
+            *args, **kwargs: Method arguments (must be picklable)
+            accounts: Only these accounts (default: all running)
+            timeout: Max seconds to wait for all replies
+
+        Returns:
+            Account name -> result dict
+        """
+        names = self.accounts if accounts is None else list(accounts)
+        return self._dispatch({name: (method, args, kwargs) for name in names}, timeout)
+
+    def place_orders(
+        self,
+        orders: Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]],
+        timeout: float = CALL_TIMEOUT
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Place order intents on several accounts at once
+
+        Args:
+            orders: Order specs (see place_orders_batch) to place on every
+                account, or account name -> that account's order specs
+            timeout: Max seconds to wait for all replies
+
+        Returns:
+            Account name -> result dict; 'result' holds the per-order
+            results of place_orders_batch
+        """
+        if not isinstance(orders, dict):
+            orders = {name: orders for name in self.accounts}
+        return self._dispatch(
+            {name: ('place_orders_batch', (specs,), {}) for name, specs in orders.items() if specs},
+            timeout
+        )
+
+    def _dispatch(self, calls: Dict[str, tuple], timeout: float) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        pending = {}
+        for name, (method, args, kwargs) in calls.items():
+            result = {'account': name, 'success': False, 'result': None, 'error': None, 'latency': None}
+            results[name] = result
+            conn = self._conns.get(name)
+            if conn is None:
+                result['error'] = {'code': None, 'msg': f"Account '{name}' is not running"}
+                continue
+            request_id = next(self._ids)
+            sent = time.monotonic()
+            try:
+                conn.send((request_id, method, args, kwargs))
+            except (OSError, ValueError) as e:
+                result['error'] = _error(e)
+                continue
+            pending[conn] = (name, request_id, sent)
+
+        deadline = time.monotonic() + timeout
+        while pending:
+            ready = wait(list(pending), timeout=max(deadline - time.monotonic(), 0))
+            if not ready:
+                break
+            for conn in ready:
+                name, request_id, sent = pending.pop(conn)
+                result = results[name]
+                try:
+                    reply_id, value, error, received, done = conn.recv()
+                except EOFError:
+                    result['error'] = {'code': None, 'msg': 'Worker process exited'}
+                    self._conns.pop(name, None)
+                    self._workers.pop(name, None)
+                    continue
+                if reply_id != request_id:
+                    # Reply to an earlier call that timed out; keep waiting
+                    pending[conn] = (name, request_id, sent)
+                    continue
+                now = time.monotonic()
+                result['success'] = error is None
+                result['result'] = value
+                result['error'] = error
+                result['latency'] = {
+                    'dispatch_ms': (received - sent) * 1000,
+                    'exchange_ms': (done - received) * 1000,
+                    'return_ms': (now - done) * 1000,
+                    'total_ms': (now - sent) * 1000,
+                }
+
+        for conn, (name, _, _) in pending.items():
+            results[name]['error'] = {'code': None, 'msg': f"No reply within {timeout:.0f}s"}
+            logger.warning("Account %s did not reply within %.0fs", name, timeout)
+        return results
+
+
+def main():
+    """Place one order on several accounts: python -m trading_bot.accounts"""
+    import argparse
+    from rich.console import Console
+    from .orders import OrderFormatter
+
+    parser = argparse.ArgumentParser(description="Place an order on several accounts at once")
+    parser.add_argument('symbol')
+    parser.add_argument('side', choices=['BUY', 'SELL'])
+    parser.add_argument('type', choices=['MARKET', 'LIMIT', 'STOP'])
+    parser.add_argument('quantity', type=float)
+    parser.add_argument('--price', type=float)
+    parser.add_argument('--stop-price', type=float)
+    parser.add_argument('--accounts', nargs='+', help="Account names (default: all profiles)")
+    parser.add_argument('--profiles', default=None, help="Profiles file (default: ACCOUNTS_PATH)")
+    args = parser.parse_args()
+
+    spec = {'symbol': args.symbol, 'side': args.side, 'type': args.type, 'quantity': args.quantity}
+    if args.price is not None:
+        spec['price'] = args.price
+    if args.stop_price is not None:
+        spec['stop_price'] = args.stop_price
+
+    with AccountManager(load_profiles(args.profiles, args.accounts)) as accounts:
+        results = accounts.place_orders([spec])
+    Console().print(OrderFormatter.format_account_results(results))
+
+
+if __name__ == '__main__':
+    main()
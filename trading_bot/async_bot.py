@@ -0,0 +1,751 @@
+"""
+Asyncio trading bot implementation
+"""
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import time
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+from yarl import URL
+from .config import Config
+from . import exceptions
+from .history import OrderHistory
+from .logger import logger
+from .metrics import REGISTRY
+from .models import Balance, Order, Position, loads
+from .orders import OrderValidator, OrderType, BatchOrders, SymbolInfoCache
+from .ratelimit import RateLimiter, endpoint_cost
+from .retry import (
+    RetryPolicy, client_order_id, is_retryable, is_unknown_status,
+    validate_client_order_id, DUPLICATE_CLIENT_ORDER_ID_CODE, ORDER_NOT_FOUND_CODE
+)
+
+
+class _ErrorResponse:
+    """
+    Read response given to BinanceAPIException
+
+    The SDK formats response.text for non-JSON error bodies (e.g. a
+    gateway's HTML page), which on aiohttp is a coroutine method, so the
+    exception gets the already-read body as a string instead.
+    """
+
+    __slots__ = ('status_code', 'headers', 'text', 'url')
+
+    def __init__(self, response: aiohttp.ClientResponse, text: str):
+        self.status_code = response.status
+        self.headers = response.headers
+        self.text = text
+        self.url = str(response.url)
+
+
+class AsyncBasicBot:
+    """
+    Asyncio counterpart of BasicBot
+
+    Exposes the same order and account methods as BasicBot, but every
+    call is a coroutine running on a shared aiohttp session with a pooled
+    keep-alive connector, so many orders and reads can be in flight at
+    once and awaited together with asyncio.gather().
+
+    Usage:
+        async with AsyncBasicBot(api_key, api_secret) as bot:
+            orders = await asyncio.gather(
+                bot.place_limit_order('BTCUSDT', 'BUY', 0.001, 40000),
+                bot.place_limit_order('BTCUSDT', 'BUY', 0.001, 39900),
+                bot.get_positions(),
+            )
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        testnet: bool = True,
+        pool_size: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize the async trading bot
+
+        The HTTP session is created by connect() (or by entering the bot
+        as an async context manager), since aiohttp sessions must be
+        created inside a running event loop.
+
+        Args:
+            api_key: Binance API key
+            api_secret: Binance API secret
+            testnet: Whether to use testnet (default: True)
+            pool_size: Max pooled connections (default: Config.HTTP_POOL_SIZE)
+            timeout: Total request timeout in seconds (default: Config.HTTP_TIMEOUT)
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+        self.pool_size = pool_size or Config.HTTP_POOL_SIZE
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        self.base_url = Config.get_base_url(testnet)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.limiter = RateLimiter(safety=Config.RATE_LIMIT_SAFETY)
+        # Orders carry client order IDs and are retried like BasicBot's
+        self.retry = RetryPolicy()
+        self._session_nonce = os.urandom(4).hex()
+        self._order_seq = itertools.count(1)
+        self.metrics = REGISTRY
+        self.history = OrderHistory(Config.ORDER_HISTORY_PATH) if Config.ORDER_HISTORY else None
+        self.symbols = None
+        if Config.SYMBOL_FILTERS:
+            self.symbols = SymbolInfoCache(on_update=lambda cache: self.limiter.configure(cache.rate_limits))
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AsyncBasicBot":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def connect(self):
+        """Open the pooled HTTP session and test the API connection"""
+        try:
+            logger.info("Initializing async Binance client...")
+            logger.info("Mode: %s", 'TESTNET' if self.testnet else 'MAINNET')
+
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=Config.HTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'X-MBX-APIKEY': self.api_key},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+            # Import the SDK exception classes now, off the loop, rather
+            # than stalling it on the first API error
+            await asyncio.get_running_loop().run_in_executor(None, getattr, exceptions, 'BinanceAPIException')
+
+            # Test connection
+            logger.info("Testing API connection...")
+            account_info = await self._read('/fapi/v2/account', signed=True, endpoint='futures_account')
+            logger.info("✓ Successfully connected to Binance Futures API")
+            logger.debug("Account status: %s", account_info.get('canTrade', False))
+
+            if self.symbols is not None:
+                # Reads and parses the persisted exchange info file
+                await asyncio.get_running_loop().run_in_executor(None, self.symbols.load)
+                if self.symbols.is_stale():
+                    await self.refresh_symbols()
+                self._refresh_task = asyncio.create_task(self._refresh_symbols_loop())
+
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error during initialization: %s", e)
+            await self.close()
+            raise
+        except Exception as e:
+            logger.error("Error initializing async bot: %s", e)
+            await self.close()
+            raise
+
+    async def close(self):
+        """Close the HTTP session and its pooled connections"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def refresh_symbols(self):
+        """Fetch exchangeInfo and update the symbol filter cache"""
+        try:
+            logger.info("Refreshing exchange info...")
+            info = await self._read('/fapi/v1/exchangeInfo', endpoint='futures_exchange_info')
+            self.symbols.update(info)
+        except Exception as e:
+            logger.warning("Could not refresh exchange info: %s", e)
+
+    async def _refresh_symbols_loop(self):
+        """Keep the symbol filter cache fresh in the background"""
+        interval = max(self.symbols.ttl / 4, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            if self.symbols.is_stale():
+                await self.refresh_symbols()
+
+    def _filters(self, symbol: str):
+        """Get cached exchange filters for a symbol (None if disabled/unknown)"""
+        return self.symbols.get(symbol) if self.symbols is not None else None
+
+    def _record_orders(self, *orders: Dict[str, Any]):
+        """Store order responses in the local history (never fails the caller)"""
+        if self.history is None:
+            return
+        try:
+            self.history.record_orders(list(orders))
+        except Exception as e:
+            logger.warning("Could not record order history: %s", e)
+
+    def _sign(self, params: Dict[str, Any]) -> str:
+        """Build a signed query string for a USER_DATA/TRADE endpoint"""
+        params['timestamp'] = int(time.time() * 1000)
+        query = urlencode(params)
+        signature = hmac.new(
+            self.api_secret.encode('utf-8'),
+            query.encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+        return f"{query}&signature={signature}"
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        signed: bool = False,
+        endpoint: str = '',
+        orders: Optional[int] = None
+    ) -> Any:
+        """
+        Send a rate-limited request to the futures REST API
+
+        Args:
+            method: HTTP method
+            path: API path (e.g., '/fapi/v1/order')
+            params: Request parameters
+            signed: Whether the endpoint requires a signature
+            endpoint: Equivalent client method name, used to look up the
+                request weight and priority (see ratelimit.ENDPOINT_COSTS)
+            orders: Order count override (batch requests)
+
+        Returns:
+            Decoded JSON response
+        """
+        if self.session is None:
+            raise RuntimeError("AsyncBasicBot is not connected. Call connect() first")
+
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        weight, order_count, priority = endpoint_cost(endpoint, params)
+        await self.limiter.acquire_async(weight, order_count if orders is None else orders, priority)
+
+        query = self._sign(params) if signed else urlencode(params)
+        url = URL(f"{self.base_url}{path}?{query}" if query else f"{self.base_url}{path}", encoded=True)
+
+        name = endpoint or path
+        start = time.perf_counter()
+        try:
+            async with self.session.request(method, url) as response:
+                body = await response.read()
+        except Exception as e:
+            self.metrics.observe(name, time.perf_counter() - start, weight, e)
+            raise
+        elapsed = time.perf_counter() - start
+
+        self.limiter.update_from_headers(response.headers)
+        if not (200 <= response.status < 300):
+            text = body.decode('utf-8', 'replace')
+            error = exceptions.BinanceAPIException(_ErrorResponse(response, text), response.status, text)
+            self.metrics.observe(name, elapsed, weight, error)
+            self.limiter.handle_error(error)
+            raise error
+        self.metrics.observe(name, elapsed, weight)
+        try:
+            return loads(body)
+        except ValueError:
+            raise exceptions.BinanceRequestException(f"Invalid Response: {body.decode('utf-8', 'replace')}")
+
+    async def _read(self, path: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """GET an idempotent endpoint, retrying transient failures with backoff"""
+        return await self.retry.call_async(
+            lambda: self._request('GET', path, params, **kwargs), kwargs.get('endpoint') or path
+        )
+
+    async def place_market_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        client_order_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Place a market order
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+            client_order_id: newClientOrderId (default: generated)
+
+        Returns:
+            Order response from Binance API
+        """
+        try:
+            # Validate inputs
+            symbol = OrderValidator.validate_symbol(symbol)
+            side = OrderValidator.validate_side(side)
+            quantity = OrderValidator.validate_quantity(quantity)
+            quantity, _ = OrderValidator.validate_filters_fixed(self._filters(symbol), quantity, market=True)
+
+            logger.info("Placing MARKET order: %s %s %s", side, quantity, symbol)
+
+            order = await self._submit_order(
+                client_order_id,
+                symbol=symbol,
+                side=side,
+                type=OrderType.MARKET.value,
+                quantity=str(quantity)
+            )
+
+            self._record_orders(order)
+            logger.info("✓ Market order placed successfully")
+            logger.info("Order ID: %s, Status: %s", order['orderId'], order['status'])
+            logger.debug("Full order response: %s", order)
+
+            return order
+
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            logger.error("Error code: %s, Message: %s", e.code, e.message)
+            raise
+        except Exception as e:
+            logger.error("Error placing market order: %s", e)
+            raise
+
+    async def place_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        time_in_force: str = 'GTC',
+        client_order_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Place a limit order
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+            price: Limit price
+            time_in_force: Time in force (default: 'GTC' - Good Till Cancel)
+            client_order_id: newClientOrderId (default: generated)
+
+        Returns:
+            Order response from Binance API
+        """
+        try:
+            # Validate inputs
+            symbol = OrderValidator.validate_symbol(symbol)
+            side = OrderValidator.validate_side(side)
+            quantity = OrderValidator.validate_quantity(quantity)
+            price = OrderValidator.validate_price(price)
+            quantity, price = OrderValidator.validate_filters_fixed(self._filters(symbol), quantity, price)
+
+            logger.info("Placing LIMIT order: %s %s %s @ %s", side, quantity, symbol, price)
+
+            order = await self._submit_order(
+                client_order_id,
+                symbol=symbol,
+                side=side,
+                type=OrderType.LIMIT.value,
+                quantity=str(quantity),
+                price=str(price),
+                timeInForce=time_in_force
+            )
+
+            self._record_orders(order)
+            logger.info("✓ Limit order placed successfully")
+            logger.info("Order ID: %s, Status: %s", order['orderId'], order['status'])
+            logger.debug("Full order response: %s", order)
+
+            return order
+
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            logger.error("Error code: %s, Message: %s", e.code, e.message)
+            raise
+        except Exception as e:
+            logger.error("Error placing limit order: %s", e)
+            raise
+
+    async def place_stop_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        stop_price: float,
+        time_in_force: str = 'GTC',
+        client_order_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Place a stop-limit order
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+            price: Limit price (price to execute at when stop is triggered)
+            stop_price: Stop price (trigger price)
+            time_in_force: Time in force (default: 'GTC')
+            client_order_id: newClientOrderId (default: generated)
+
+        Returns:
+            Order response from Binance API
+        """
+        try:
+            # Validate inputs
+            symbol = OrderValidator.validate_symbol(symbol)
+            side = OrderValidator.validate_side(side)
+            quantity = OrderValidator.validate_quantity(quantity)
+            price = OrderValidator.validate_price(price)
+            stop_price = OrderValidator.validate_price(stop_price)
+            filters = self._filters(symbol)
+            quantity, price = OrderValidator.validate_filters_fixed(filters, quantity, price)
+            stop_price = OrderValidator.snap_price(filters, stop_price)
+
+            logger.info(
+                "Placing STOP-LIMIT order: %s %s %s @ %s (stop: %s)",
+                side, quantity, symbol, price, stop_price
+            )
+
+            order = await self._submit_order(
+                client_order_id,
+                symbol=symbol,
+                side=side,
+                type=OrderType.STOP.value,
+                quantity=str(quantity),
+                price=str(price),
+                stopPrice=str(stop_price),
+                timeInForce=time_in_force
+            )
+
+            self._record_orders(order)
+            logger.info("✓ Stop-limit order placed successfully")
+            logger.info("Order ID: %s, Status: %s", order['orderId'], order['status'])
+            logger.debug("Full order response: %s", order)
+
+            return order
+
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            logger.error("Error code: %s, Message: %s", e.code, e.message)
+            raise
+        except Exception as e:
+            logger.error("Error placing stop-limit order: %s", e)
+            raise
+
+    def _next_client_order_id(self, params: Dict[str, Any]) -> str:
+        """Generate the newClientOrderId for an order about to be sent"""
+        return client_order_id(params, f"{self._session_nonce}:{next(self._order_seq)}")
+
+    async def _submit_order(self, cid: Optional[str] = None, **params) -> Dict[str, Any]:
+        """
+        Place one order, retrying transient failures without risking a double fill
+
+        Same scheme as BasicBot._submit_order: the newClientOrderId is fixed
+        before the first attempt, and after a failure whose outcome is
+        unknown the order is looked up by it before resubmitting.
+
+        Args:
+            cid: newClientOrderId (default: generated)
+            **params: /fapi/v1/order parameters
+
+        Returns:
+            Order response (or the order as queried, if an earlier attempt
+            turns out to have been placed)
+        """
+        params['newClientOrderId'] = (
+            validate_client_order_id(cid) if cid else self._next_client_order_id(params)
+        )
+        cid = params['newClientOrderId']
+        error = None
+        for attempt in range(1, self.retry.attempts + 1):
+            if error is not None:
+                delay = self.retry.delay(attempt - 1)
+                logger.warning(
+                    "Order %s failed (%s), retry %s/%s in %.2fs",
+                    cid, error, attempt - 1, self.retry.attempts - 1, delay
+                )
+                await asyncio.sleep(delay)
+                if is_unknown_status(error):
+                    order = await self._find_order(params['symbol'], cid, error)
+                    if order is not None:
+                        logger.info("Order %s was placed by an earlier attempt", cid)
+                        return order
+            try:
+                return await self._request(
+                    'POST', '/fapi/v1/order', params, signed=True, endpoint='futures_create_order'
+                )
+            except exceptions.BinanceAPIException as e:
+                if e.code == DUPLICATE_CLIENT_ORDER_ID_CODE and attempt > 1:
+                    # An earlier attempt got through after our lookup
+                    order = await self._find_order(params['symbol'], cid, e)
+                    if order is not None:
+                        return order
+                error = e
+            except Exception as e:
+                error = e
+            if attempt == self.retry.attempts or not is_retryable(error):
+                raise error
+
+    async def _find_order(self, symbol: str, cid: str, cause: BaseException) -> Optional[Dict[str, Any]]:
+        """
+        Look up an order by client order ID after a failed submit
+
+        Returns:
+            The order, or None if the exchange does not know it
+
+        Raises:
+            The submit error `cause` if the lookup itself keeps failing
+        """
+        try:
+            return await self.retry.call_async(
+                lambda: self._request(
+                    'GET', '/fapi/v1/order', {'symbol': symbol, 'origClientOrderId': cid},
+                    signed=True, endpoint='futures_get_order'
+                ),
+                f"Order {cid} lookup"
+            )
+        except exceptions.BinanceAPIException as e:
+            if e.code == ORDER_NOT_FOUND_CODE:
+                return None
+            logger.error("Cannot confirm whether order %s was placed: %s", cid, e)
+            raise cause
+        except Exception as e:
+            logger.error("Cannot confirm whether order %s was placed: %s", cid, e)
+            raise cause
+
+    async def place_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place many orders through the futures batchOrders endpoint
+
+        Orders are validated locally, split into chunks of 5 (the exchange
+        limit per batch request) and the chunks are sent concurrently.
+        Each order gets a client order ID, so failed chunks are retried
+        like single orders (see _submit_order).
+
+        Args:
+            orders: List of order specs (see BasicBot.place_orders_batch)
+
+        Returns:
+            One result per input order, in order:
+            {'index', 'success', 'order', 'error': {'code', 'msg'} or None}
+        """
+        results, chunks = BatchOrders.prepare(orders, self.symbols)
+        rejected = len(orders) - sum(len(chunk) for chunk in chunks)
+        logger.info(
+            "Placing batch of %s order(s) in %s request(s)%s",
+            len(orders), len(chunks), f" ({rejected} failed validation)" if rejected else ''
+        )
+
+        async def send(chunk):
+            try:
+                return await self._send_batch([params for _, params in chunk])
+            except Exception as e:
+                logger.error("Batch order request failed: %s", e)
+                return e
+
+        responses = await asyncio.gather(*(send(chunk) for chunk in chunks))
+        for chunk, response in zip(chunks, responses):
+            BatchOrders.record(results, chunk, response)
+
+        placed = sum(1 for r in results if r['success'])
+        self._record_orders(*(r['order'] for r in results if r['success']))
+        logger.info("✓ Batch complete: %s/%s order(s) placed", placed, len(orders))
+        for result in results:
+            if result['error']:
+                logger.error("Batch order #%s failed: %s", result['index'], result['error']['msg'])
+        logger.debug("Batch results: %s", results)
+
+        return results
+
+    async def _send_batch(self, batch: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Send one batchOrders request, retrying transient failures
+
+        After a failure whose outcome is unknown, each order is looked up by
+        client order ID and only the ones the exchange never received are
+        resent (see BasicBot._send_batch).
+
+        Returns:
+            One response item (order or {'code', 'msg'}) per order, in order
+        """
+        for params in batch:
+            params.setdefault('newClientOrderId', self._next_client_order_id(params))
+        items = [None] * len(batch)
+        todo = list(range(len(batch)))
+        error = None
+        for attempt in range(1, self.retry.attempts + 1):
+            if error is not None:
+                delay = self.retry.delay(attempt - 1)
+                logger.warning(
+                    "Batch of %s order(s) failed (%s), retry %s/%s in %.2fs",
+                    len(todo), error, attempt - 1, self.retry.attempts - 1, delay
+                )
+                await asyncio.sleep(delay)
+                if is_unknown_status(error):
+                    found = await asyncio.gather(*(self._find_batch_order(batch[i], error) for i in todo))
+                    for i, item in zip(todo, found):
+                        items[i] = item
+                    todo = [i for i in todo if items[i] is None]
+                    if not todo:
+                        return items
+            try:
+                response = await self._request(
+                    'POST', '/fapi/v1/batchOrders',
+                    {'batchOrders': json.dumps([batch[i] for i in todo], separators=(',', ':'))},
+                    signed=True, endpoint='futures_place_batch_order', orders=len(todo)
+                )
+            except Exception as e:
+                error = e
+                if attempt == self.retry.attempts or not is_retryable(e):
+                    raise
+                continue
+            for i, item in zip(todo, response):
+                if item.get('code') == DUPLICATE_CLIENT_ORDER_ID_CODE and attempt > 1:
+                    item = await self._find_batch_order(batch[i], error) or item
+                items[i] = item
+            return items
+
+    async def _find_batch_order(self, params: Dict[str, str], cause: BaseException) -> Optional[Dict[str, Any]]:
+        """Look up a batch order by client order ID (an error item if the lookup fails)"""
+        try:
+            return await self._find_order(params['symbol'], params['newClientOrderId'], cause)
+        except Exception as e:
+            return {'code': getattr(e, 'code', None), 'msg': f"Order status unknown: {getattr(e, 'message', e)}"}
+
+    async def get_account_balance(self, typed: bool = False):
+        """
+        Get account balance information
+
+        Args:
+            typed: Return one Balance model per asset instead of the raw record
+
+        Returns:
+            Account balance data (or List[Balance])
+        """
+        try:
+            logger.info("Fetching account balance...")
+            account = await self._read('/fapi/v2/account', signed=True, endpoint='futures_account')
+
+            logger.debug("Balance data: %s", account.get('assets'))
+            return Balance.from_account(account) if typed else account
+
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Error fetching balance: %s", e)
+            raise
+
+    async def get_open_orders(self, symbol: Optional[str] = None, typed: bool = False) -> list:
+        """
+        Get open orders
+
+        Args:
+            symbol: Optional symbol to filter orders
+            typed: Return Order models instead of raw dicts
+
+        Returns:
+            List of open orders
+        """
+        try:
+            logger.info("Fetching open orders%s...", ' for ' + symbol if symbol else '')
+
+            params = {}
+            if symbol:
+                params['symbol'] = OrderValidator.validate_symbol(symbol)
+
+            orders = await self._read('/fapi/v1/openOrders', params, signed=True, endpoint='futures_get_open_orders')
+            logger.info("Found %s open order(s)", len(orders))
+            logger.debug("Orders: %s", orders)
+
+            return [Order.from_dict(o) for o in orders] if typed else orders
+
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Error fetching open orders: %s", e)
+            raise
+
+    async def get_positions(self, typed: bool = False) -> list:
+        """
+        Get open positions
+
+        Args:
+            typed: Return Position models instead of raw dicts
+
+        Returns:
+            List of positions
+        """
+        try:
+            logger.info("Fetching positions...")
+            positions = await self._read('/fapi/v2/positionRisk', signed=True, endpoint='futures_position_information')
+            logger.debug("Positions: %s", positions)
+
+            return [Position.from_dict(p) for p in positions] if typed else positions
+
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Error fetching positions: %s", e)
+            raise
+
+    async def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        """
+        Cancel an open order
+
+        Args:
+            symbol: Trading pair symbol
+            order_id: Order ID to cancel
+
+        Returns:
+            Cancellation response
+        """
+        try:
+            symbol = OrderValidator.validate_symbol(symbol)
+            logger.info("Cancelling order %s for %s...", order_id, symbol)
+
+            result = await self._request('DELETE', '/fapi/v1/order', {
+                'symbol': symbol,
+                'orderId': order_id
+            }, signed=True, endpoint='futures_cancel_order')
+
+            self._record_orders(result)
+            logger.info("✓ Order cancelled successfully")
+            logger.debug("Cancellation response: %s", result)
+
+            return result
+
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Error cancelling order: %s", e)
+            raise
+
+    async def gather(self, *coros, return_exceptions: bool = True) -> list:
+        """
+        Await several bot calls concurrently
+
+        Args:
+            *coros: Coroutines returned by bot methods
+            return_exceptions: Return failures in place instead of raising
+                the first one (default: True)
+
+        Returns:
+            Results in the same order as the coroutines
+        """
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
@@ -0,0 +1,739 @@
+"""
+Vectorized backtester with a BasicBot-compatible order API
+
+Strategies are objects with an on_bar(bot, symbol, bar) method. In a
+backtest `bot` is a BacktestBot, which has the same order and account
+methods as BasicBot, so the same strategy code can trade live.
+
+Usage:
+    bars = Bars.load('data/BTCUSDT_1m.npz')
+    bot = BacktestBot({'BTCUSDT': bars}, starting_balance=10000)
+    result = bot.run(MyStrategy())
+    print(result.stats())
+"""
+import heapq
+import importlib
+import itertools
+import json
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+from . import exceptions
+from .models import Balance, Order, Position
+from .orders import OrderSide, OrderType, OrderValidator, SymbolFilters, format_decimal
+
+# Bars checked by the first fill scan of an order; each rescan looks 4x
+# further, so short-lived orders never scan the whole series
+SCAN_WINDOW = 64
+MAX_SCAN_WINDOW = 1 << 16
+
+CLOSED_STATUSES = {'FILLED', 'CANCELED', 'EXPIRED'}
+
+
+class Bar(NamedTuple):
+    """One OHLCV bar as passed to Strategy.on_bar"""
+    index: int
+    open_time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class Bars:
+    """
+    Columnar OHLCV series
+
+    Each field is a NumPy array; open_time is in epoch milliseconds.
+    """
+
+    __slots__ = ('open_time', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, open_time, open, high, low, close, volume=None):
+        self.open_time = np.asarray(open_time, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.zeros(len(self.open_time)) if volume is None else np.asarray(volume, dtype=np.float64)
+        n = len(self.open_time)
+        if any(len(getattr(self, field)) != n for field in self.__slots__):
+            raise ValueError("All bar arrays must have the same length")
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    @classmethod
+    def from_klines(cls, klines: List[list]) -> 'Bars':
+        """
+        Build bars from futures_klines() rows
+
+        Args:
+            klines: [open_time, open, high, low, close, volume, ...] rows
+        """
+        if not klines:
+            return cls([], [], [], [], [], [])
+        columns = list(zip(*klines))
+        return cls(*(np.asarray(columns[i], dtype=np.float64) for i in range(6)))
+
+    @classmethod
+    def from_trades(cls, times, prices, quantities=None, interval_ms: Optional[int] = None) -> 'Bars':
+        """
+        Build bars from a trade (or aggTrade) series
+
+        Args:
+            times: Trade times in epoch ms (ascending)
+            prices: Trade prices
+            quantities: Trade quantities (volume; default zeros)
+            interval_ms: Aggregate into bars of this length; None makes one
+                bar per trade. Intervals without trades are skipped.
+        """
+        times = np.asarray(times, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        quantities = np.zeros(len(prices)) if quantities is None else np.asarray(quantities, dtype=np.float64)
+        if interval_ms is None or not len(times):
+            return cls(times, prices, prices, prices, prices, quantities)
+
+        buckets = times // interval_ms
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(prices)] - 1
+        return cls(
+            buckets[starts] * interval_ms,
+            prices[starts],
+            np.maximum.reduceat(prices, starts),
+            np.minimum.reduceat(prices, starts),
+            prices[ends],
+            np.add.reduceat(quantities, starts)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'Bars':
+        """Load bars saved with save() (.npz with one array per field)"""
+        with np.load(path) as data:
+            return cls(*(data[field] for field in cls.__slots__))
+
+    def save(self, path: str):
+        """Save bars as an uncompressed .npz file"""
+        np.savez(path, **{field: getattr(self, field) for field in self.__slots__})
+
+
+class Strategy:
+    """
+    Base class for strategies (subclassing is optional)
+
+    on_bar is called after each bar closes. Orders placed there are
+    matched from the next bar on, so a strategy never trades on a price
+    it could not have seen.
+    """
+
+    def on_start(self, bot):
+        """Called once before the first bar"""
+
+    def on_bar(self, bot, symbol: str, bar: Bar):
+        """Called with each closed bar"""
+        raise NotImplementedError
+
+    def on_finish(self, bot):
+        """Called once after the last bar"""
+
+
+class _SimOrder:
+    """An order resting in the backtest"""
+
+    __slots__ = (
+        'order_id', 'client_order_id', 'symbol', 'side', 'type', 'qty', 'price', 'stop_price',
+        'time_in_force', 'status', 'executed', 'avg_price', 'time', 'update_time',
+        'first_bar', 'triggered', 'window'
+    )
+
+    def __init__(self, order_id: int, symbol: str, side: str, order_type: str, qty: float,
+                 price: float, stop_price: float, time_in_force: str, placed_time: int, first_bar: int):
+        self.order_id = order_id
+        self.client_order_id = f"backtest_{order_id}"
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.qty = qty
+        self.price = price
+        self.stop_price = stop_price
+        self.time_in_force = time_in_force
+        self.status = 'NEW'
+        self.executed = 0.0
+        self.avg_price = 0.0
+        self.time = placed_time
+        self.update_time = placed_time
+        self.first_bar = first_bar
+        self.triggered = order_type != OrderType.STOP.value
+        self.window = SCAN_WINDOW
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Order in the REST response format"""
+        return {
+            'orderId': self.order_id,
+            'symbol': self.symbol,
+            'status': self.status,
+            'clientOrderId': self.client_order_id,
+            'price': format_decimal(self.price),
+            'avgPrice': format_decimal(self.avg_price),
+            'origQty': format_decimal(self.qty),
+            'executedQty': format_decimal(self.executed),
+            'cumQuote': format_decimal(self.executed * self.avg_price),
+            'timeInForce': self.time_in_force,
+            'type': self.type,
+            'origType': self.type,
+            'reduceOnly': False,
+            'closePosition': False,
+            'side': self.side,
+            'positionSide': 'BOTH',
+            'stopPrice': format_decimal(self.stop_price),
+            'workingType': 'CONTRACT_PRICE',
+            'time': self.time,
+            'updateTime': self.update_time,
+        }
+
+
+def _api_error(code: int, msg: str) -> 'exceptions.BinanceAPIException':
+    """Build the exception the live client raises for an exchange error"""
+    return exceptions.BinanceAPIException(None, 400, json.dumps({'code': code, 'msg': msg}))
+
+
+def _first(mask: np.ndarray) -> int:
+    """Index of the first True in a boolean array (-1 if none)"""
+    index = int(mask.argmax()) if len(mask) else 0
+    return index if len(mask) and mask[index] else -1
+
+
+class BacktestResult:
+    """Equity curve, fills and orders of a finished backtest"""
+
+    def __init__(self, open_time: np.ndarray, equity: np.ndarray, fills: List[Dict[str, Any]],
+                 orders: List[Dict[str, Any]], starting_balance: float, elapsed: float):
+        self.open_time = open_time
+        self.equity = equity
+        self.fills = fills
+        self.orders = orders
+        self.starting_balance = starting_balance
+        self.elapsed = elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summary statistics
+
+        Returns:
+            bars, fills, final_equity, total_return_pct, max_drawdown_pct,
+            sharpe (annualized from the bar interval), realized_pnl,
+            commission and elapsed_s (wall time of the run)
+        """
+        equity = self.equity
+        stats = {
+            'bars': len(equity),
+            'fills': len(self.fills),
+            'final_equity': float(equity[-1]) if len(equity) else self.starting_balance,
+            'realized_pnl': sum(float(f['realizedPnl']) for f in self.fills),
+            'commission': sum(float(f['commission']) for f in self.fills),
+            'elapsed_s': self.elapsed,
+        }
+        stats['total_return_pct'] = (stats['final_equity'] / self.starting_balance - 1) * 100
+        if len(equity) < 2:
+            stats['max_drawdown_pct'] = 0.0
+            stats['sharpe'] = 0.0
+            return stats
+
+        peak = np.maximum.accumulate(equity)
+        stats['max_drawdown_pct'] = float((equity / peak - 1).min() * -100)
+        returns = np.diff(equity) / equity[:-1]
+        interval = float(np.median(np.diff(self.open_time))) or 60000.0
+        bars_per_year = 365 * 86400 * 1000 / interval
+        std = returns.std()
+        stats['sharpe'] = float(returns.mean() / std * np.sqrt(bars_per_year)) if std else 0.0
+        return stats
+
+
+class BacktestBot:
+    """
+    Simulated exchange account with BasicBot's order API
+
+    Fill rules (one-way position mode, all-or-nothing fills):
+    - MARKET fills at the next bar's open, moved against the order by
+      `slippage_bps`, as taker.
+    - LIMIT fills in the first bar whose range reaches the price. If the
+      next bar opens through the price the order was marketable and
+      fills at that open as taker; later fills are at the limit price as
+      maker. With `trade_through`, the range must go strictly past it.
+    - STOP triggers when the range reaches stop_price (at the open if the
+      bar gaps through it), then behaves as a LIMIT placed at the trigger.
+    - IOC/FOK limit orders fill only if marketable at the next open and
+      expire otherwise; GTX (post-only) expires if it would be.
+
+    Fill bars are found by vectorized scans over the price arrays (in
+    growing windows), and the run loop only wakes an order in the bar it
+    fills, so the per-bar cost does not grow with the number of resting
+    orders.
+    """
+
+    def __init__(
+        self,
+        bars: Union[Bars, Dict[str, Bars]],
+        symbol: str = 'BTCUSDT',
+        starting_balance: float = 10000.0,
+        maker_fee: float = 0.0002,
+        taker_fee: float = 0.0004,
+        slippage_bps: float = 0.0,
+        trade_through: bool = False,
+        filters: Optional[Dict[str, SymbolFilters]] = None
+    ):
+        """
+        Initialize the backtest
+
+        Args:
+            bars: Bars for one symbol, or {symbol: Bars} with identical
+                open times for several
+            symbol: Symbol name when a single Bars is given
+            starting_balance: USDT wallet balance
+            maker_fee: Maker commission rate
+            taker_fee: Taker commission rate
+            slippage_bps: Adverse price move applied to market fills
+            trade_through: Require limit prices to be traded through
+            filters: Optional symbol filters to snap and check orders
+                (e.g. from SymbolInfoCache)
+        """
+        self.bars = bars if isinstance(bars, dict) else {symbol.upper(): bars}
+        if not self.bars:
+            raise ValueError("No bars to backtest")
+        self.open_time = next(iter(self.bars.values())).open_time
+        for name, series in self.bars.items():
+            if not np.array_equal(series.open_time, self.open_time):
+                raise ValueError(f"Bars for {name} are not aligned with the other symbols")
+
+        self.starting_balance = starting_balance
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.slippage_bps = slippage_bps
+        self.trade_through = trade_through
+        self.filters = filters or {}
+        self.reset()
+
+    def reset(self):
+        """Clear orders, fills and positions"""
+        self.index = -1
+        self.balance = self.starting_balance
+        self.orders: Dict[int, _SimOrder] = {}
+        self.fills: List[Dict[str, Any]] = []
+        # symbol -> [position amount, entry price]
+        self.positions: Dict[str, List[float]] = {symbol: [0.0, 0.0] for symbol in self.bars}
+        self._order_ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+        self._heap: List[Tuple[int, int, _SimOrder]] = []
+        self._seq = itertools.count()
+        # Equity is rebuilt after the run from the points where it changed:
+        # equity = (balance - sum(amount * entry)) + sum(amount * close)
+        self._cash_points: List[Tuple[int, float]] = [(-1, self.starting_balance)]
+        self._position_points: Dict[str, List[Tuple[int, float]]] = {s: [(-1, 0.0)] for s in self.bars}
+
+    # -- Run loop -----------------------------------------------------------
+
+    def run(self, strategy) -> BacktestResult:
+        """
+        Replay all bars through a strategy
+
+        Args:
+            strategy: Object with on_bar(bot, symbol, bar) and optionally
+                on_start(bot) / on_finish(bot)
+
+        Returns:
+            BacktestResult
+        """
+        self.reset()
+        start = time.perf_counter()
+        series = [
+            (symbol, list(zip(b.open_time.tolist(), b.open.tolist(), b.high.tolist(),
+                              b.low.tolist(), b.close.tolist(), b.volume.tolist())))
+            for symbol, b in self.bars.items()
+        ]
+        on_bar = strategy.on_bar
+        heap = self._heap
+
+        if hasattr(strategy, 'on_start'):
+            strategy.on_start(self)
+        for i in range(len(self.open_time)):
+            self.index = i
+            while heap and heap[0][0] <= i:
+                _, _, order = heapq.heappop(heap)
+                if order.status not in CLOSED_STATUSES:
+                    self._advance(order, i)
+            for symbol, rows in series:
+                on_bar(self, symbol, Bar(i, *rows[i]))
+        if hasattr(strategy, 'on_finish'):
+            strategy.on_finish(self)
+
+        return BacktestResult(
+            self.open_time, self._equity_curve(), self.fills,
+            [o.to_dict() for o in self.orders.values()], self.starting_balance,
+            time.perf_counter() - start
+        )
+
+    def _equity_curve(self) -> np.ndarray:
+        """Mark-to-close equity per bar from the recorded change points"""
+        positions = np.arange(len(self.open_time))
+
+        def forward_fill(points):
+            bars, values = zip(*points)
+            return np.asarray(values)[np.searchsorted(np.asarray(bars), positions, side='right') - 1]
+
+        equity = forward_fill(self._cash_points)
+        for symbol, points in self._position_points.items():
+            equity = equity + forward_fill(points) * self.bars[symbol].close
+        return equity
+
+    # -- Matching -------------------------------------------------------------
+
+    def _schedule(self, order: _SimOrder, bar: int):
+        heapq.heappush(self._heap, (bar, next(self._seq), order))
+
+    def _advance(self, order: _SimOrder, start: int):
+        """Fill an order in bar `start` if it can; otherwise scan ahead and reschedule"""
+        b = self.bars[order.symbol]
+        n = len(b.open_time)
+        buy = order.side == OrderSide.BUY.value
+
+        if order.type == OrderType.MARKET.value:
+            slip = self.slippage_bps / 1e4
+            self._fill(order, start, b.open[start] * (1 + slip if buy else 1 - slip), maker=False)
+            return
+
+        if not order.triggered:
+            end = min(start + order.window, n)
+            levels = b.high[start:end] if buy else b.low[start:end]
+            hit = _first(levels >= order.stop_price if buy else levels <= order.stop_price)
+            if hit < 0:
+                order.window = min(order.window * 4, MAX_SCAN_WINDOW)
+                if end < n:
+                    self._schedule(order, end)
+                return
+            trigger_bar = start + hit
+            if trigger_bar > start:
+                self._schedule(order, trigger_bar)
+                return
+            # Triggered in this bar: the limit order enters the book here
+            order.triggered = True
+            order.first_bar = start
+            opened = b.open[start]
+            trigger_price = max(opened, order.stop_price) if buy else min(opened, order.stop_price)
+            if (trigger_price <= order.price) if buy else (trigger_price >= order.price):
+                self._fill(order, start, trigger_price, maker=False)
+            elif start + 1 < n:
+                self._schedule(order, start + 1)
+            return
+
+        if start == order.first_bar:
+            opened = b.open[start]
+            marketable = opened <= order.price if buy else opened >= order.price
+            if order.time_in_force in ('IOC', 'FOK'):
+                if marketable:
+                    self._fill(order, start, opened, maker=False)
+                else:
+                    self._close(order, 'EXPIRED', start)
+                return
+            if marketable:
+                if order.time_in_force == 'GTX':
+                    self._close(order, 'EXPIRED', start)
+                else:
+                    self._fill(order, start, opened, maker=False)
+                return
+
+        end = min(start + order.window, n)
+        if buy:
+            levels = b.low[start:end]
+            hit = _first(levels < order.price if self.trade_through else levels <= order.price)
+        else:
+            levels = b.high[start:end]
+            hit = _first(levels > order.price if self.trade_through else levels >= order.price)
+        if hit == 0:
+            self._fill(order, start, order.price, maker=True)
+        elif hit > 0:
+            self._schedule(order, start + hit)
+        else:
+            order.window = min(order.window * 4, MAX_SCAN_WINDOW)
+            if end < n:
+                self._schedule(order, end)
+
+    def _close(self, order: _SimOrder, status: str, bar: int):
+        order.status = status
+        order.update_time = int(self.open_time[bar])
+
+    def _fill(self, order: _SimOrder, bar: int, price: float, maker: bool):
+        """Fill an order completely and update the position and balance"""
+        price = float(price)
+        qty = order.qty
+        signed = qty if order.side == OrderSide.BUY.value else -qty
+        position = self.positions[order.symbol]
+        amount, entry = position
+
+        realized = 0.0
+        if amount and (amount > 0) != (signed > 0):
+            closed = min(abs(amount), qty)
+            realized = closed * (price - entry) * (1 if amount > 0 else -1)
+        new_amount = amount + signed
+        if abs(new_amount) < 1e-12:
+            position[:] = [0.0, 0.0]
+        elif not amount or (amount > 0) != (new_amount > 0):
+            position[:] = [new_amount, price]
+        elif abs(new_amount) > abs(amount):
+            position[:] = [new_amount, (abs(amount) * entry + qty * price) / abs(new_amount)]
+        else:
+            position[0] = new_amount
+        commission = price * qty * (self.maker_fee if maker else self.taker_fee)
+        self.balance += realized - commission
+
+        order.status = 'FILLED'
+        order.executed = qty
+        order.avg_price = price
+        order.update_time = int(self.open_time[bar])
+        self.fills.append({
+            'symbol': order.symbol, 'id': next(self._trade_ids), 'orderId': order.order_id,
+            'side': order.side, 'price': format_decimal(price), 'qty': format_decimal(qty),
+            'realizedPnl': format_decimal(realized), 'marginAsset': 'USDT',
+            'quoteQty': format_decimal(price * qty), 'commission': format_decimal(commission),
+            'commissionAsset': 'USDT', 'time': order.update_time, 'positionSide': 'BOTH',
+            'buyer': order.side == OrderSide.BUY.value, 'maker': maker,
+        })
+
+        cash = self.balance - sum(a * e for a, e in self.positions.values())
+        self._cash_points.append((bar, cash))
+        self._position_points[order.symbol].append((bar, position[0]))
+
+    # -- BasicBot API ----------------------------------------------------------
+
+    def _filters(self, symbol: str) -> Optional[SymbolFilters]:
+        return self.filters.get(symbol)
+
+    def _submit(self, symbol: str, side: str, order_type: str, quantity: float, price: float = 0.0,
+                stop_price: float = 0.0, time_in_force: str = 'GTC') -> Dict[str, Any]:
+        if symbol not in self.bars:
+            raise _api_error(-1121, 'Invalid symbol.')
+        placed_time = int(self.open_time[max(self.index, 0)])
+        order = _SimOrder(next(self._order_ids), symbol, side, order_type, quantity, price or 0.0,
+                          stop_price or 0.0, time_in_force, placed_time, self.index + 1)
+        self.orders[order.order_id] = order
+        if order.first_bar < len(self.open_time):
+            self._schedule(order, order.first_bar)
+        return order.to_dict()
+
+    def place_market_order(self, symbol: str, side: str, quantity: float,
+                           max_slippage_bps: Optional[float] = None,
+                           client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Place a market order (fills at the next bar's open)
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+            max_slippage_bps: Accepted for BasicBot compatibility (ignored)
+            client_order_id: Accepted for BasicBot compatibility (ignored)
+
+        Returns:
+            Order response in the Binance format
+        """
+        symbol = OrderValidator.validate_symbol(symbol)
+        side = OrderValidator.validate_side(side)
+        quantity = OrderValidator.validate_quantity(quantity)
+        quantity, _ = OrderValidator.validate_filters(self._filters(symbol), quantity, market=True)
+        return self._submit(symbol, side, OrderType.MARKET.value, quantity)
+
+    def place_limit_order(self, symbol: str, side: str, quantity: float, price: float,
+                          time_in_force: str = 'GTC', client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Place a limit order
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+            price: Limit price
+            time_in_force: GTC, IOC, FOK or GTX (default: 'GTC')
+            client_order_id: Accepted for BasicBot compatibility (ignored)
+
+        Returns:
+            Order response in the Binance format
+        """
+        symbol = OrderValidator.validate_symbol(symbol)
+        side = OrderValidator.validate_side(side)
+        quantity = OrderValidator.validate_quantity(quantity)
+        price = OrderValidator.validate_price(price)
+        quantity, price = OrderValidator.validate_filters(self._filters(symbol), quantity, price)
+        return self._submit(symbol, side, OrderType.LIMIT.value, quantity, price,
+                            time_in_force=time_in_force.upper())
+
+    def place_stop_limit_order(self, symbol: str, side: str, quantity: float, price: float,
+                               stop_price: float, time_in_force: str = 'GTC',
+                               client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Place a stop-limit order
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+            price: Limit price once triggered
+            stop_price: Trigger price
+            time_in_force: Time in force of the triggered limit (default: 'GTC')
+            client_order_id: Accepted for BasicBot compatibility (ignored)
+
+        Returns:
+            Order response in the Binance format
+        """
+        symbol = OrderValidator.validate_symbol(symbol)
+        side = OrderValidator.validate_side(side)
+        quantity = OrderValidator.validate_quantity(quantity)
+        price = OrderValidator.validate_price(price)
+        stop_price = OrderValidator.validate_price(stop_price)
+        filters = self._filters(symbol)
+        quantity, price = OrderValidator.validate_filters(filters, quantity, price)
+        if filters is not None:
+            stop_price = filters.round_price(stop_price)
+        return self._submit(symbol, side, OrderType.STOP.value, quantity, price, stop_price,
+                            time_in_force.upper())
+
+    def place_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place several orders (see BasicBot.place_orders_batch)
+
+        Returns:
+            One {'index', 'success', 'order', 'error'} result per order
+        """
+        results = []
+        for index, spec in enumerate(orders):
+            result = {'index': index, 'success': False, 'order': None, 'error': None}
+            try:
+                symbol = OrderValidator.validate_symbol(spec.get('symbol', ''))
+                params = OrderValidator.validate_order_spec(spec, self._filters(symbol))
+                result['order'] = self._submit(
+                    params['symbol'], params['side'], params['type'], float(params['quantity']),
+                    float(params.get('price', 0)), float(params.get('stopPrice', 0)),
+                    params.get('timeInForce', 'GTC')
+                )
+                result['success'] = True
+            except exceptions.BinanceAPIException as e:
+                result['error'] = {'code': e.code, 'msg': e.message}
+            except ValueError as e:
+                result['error'] = {'code': None, 'msg': str(e)}
+            results.append(result)
+        return results
+
+    def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
+        """
+        Cancel an open order
+
+        Raises:
+            BinanceAPIException: -2011 if the order is unknown or closed
+        """
+        symbol = OrderValidator.validate_symbol(symbol)
+        order = self.orders.get(order_id)
+        if order is None or order.symbol != symbol or order.status in CLOSED_STATUSES:
+            raise _api_error(-2011, 'Unknown order sent.')
+        self._close(order, 'CANCELED', max(self.index, 0))
+        return order.to_dict()
+
+    def get_open_orders(self, symbol: Optional[str] = None, typed: bool = False) -> list:
+        """Get open orders (optionally for one symbol; Order models if typed)"""
+        if symbol:
+            symbol = OrderValidator.validate_symbol(symbol)
+        orders = [
+            o.to_dict() for o in self.orders.values()
+            if o.status not in CLOSED_STATUSES and (not symbol or o.symbol == symbol)
+        ]
+        return [Order.from_dict(o) for o in orders] if typed else orders
+
+    def _mark_price(self, symbol: str) -> float:
+        return float(self.bars[symbol].close[max(self.index, 0)])
+
+    def get_positions(self, typed: bool = False) -> list:
+        """Get position records marked at the current bar's close (Position models if typed)"""
+        positions = []
+        for symbol, (amount, entry) in self.positions.items():
+            mark = self._mark_price(symbol)
+            positions.append({
+                'symbol': symbol,
+                'positionAmt': format_decimal(amount),
+                'entryPrice': format_decimal(entry),
+                'markPrice': format_decimal(mark),
+                'unRealizedProfit': format_decimal(amount * (mark - entry)),
+                'notional': format_decimal(amount * mark),
+                'positionSide': 'BOTH',
+                'leverage': '1',
+            })
+        return [Position.from_dict(p) for p in positions] if typed else positions
+
+    def get_account_balance(self, typed: bool = False) -> Union[Dict[str, Any], List[Balance]]:
+        """Get the account record (a single USDT asset; Balance models if typed)"""
+        unrealized = sum(a * (self._mark_price(s) - e) for s, (a, e) in self.positions.items())
+        asset = {
+            'asset': 'USDT',
+            'walletBalance': format_decimal(self.balance),
+            'unrealizedProfit': format_decimal(unrealized),
+            'marginBalance': format_decimal(self.balance + unrealized),
+            'availableBalance': format_decimal(self.balance + min(unrealized, 0.0)),
+        }
+        account = {
+            'totalWalletBalance': asset['walletBalance'],
+            'totalUnrealizedProfit': asset['unrealizedProfit'],
+            'totalMarginBalance': asset['marginBalance'],
+            'availableBalance': asset['availableBalance'],
+            'assets': [asset],
+        }
+        return Balance.from_account(account) if typed else account
+
+
+def load_strategy(path: str, args: Iterable[str] = ()):
+    """
+    Instantiate a strategy from 'package.module:ClassName'
+
+    Args:
+        path: Import path of the strategy class
+        args: key=value constructor arguments (values parsed as JSON when
+            possible)
+    """
+    module_name, _, class_name = path.partition(':')
+    if not class_name:
+        raise ValueError("Strategy must be given as module:ClassName")
+    kwargs = {}
+    for arg in args:
+        key, _, value = arg.partition('=')
+        try:
+            kwargs[key] = json.loads(value)
+        except ValueError:
+            kwargs[key] = value
+    return getattr(importlib.import_module(module_name), class_name)(**kwargs)
+
+
+def main():
+    """Run a strategy over saved bars: python -m trading_bot.backtest"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest a strategy over saved bars")
+    parser.add_argument('bars', help="Bars file (.npz, see Bars.save)")
+    parser.add_argument('strategy', help="Strategy class as module:ClassName")
+    parser.add_argument('params', nargs='*', help="Strategy arguments as key=value")
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--balance', type=float, default=10000.0)
+    parser.add_argument('--maker-fee', type=float, default=0.0002)
+    parser.add_argument('--taker-fee', type=float, default=0.0004)
+    parser.add_argument('--slippage-bps', type=float, default=0.0)
+    parser.add_argument('--trade-through', action='store_true', help="Limit fills need the price traded through")
+    args = parser.parse_args()
+
+    bot = BacktestBot(
+        Bars.load(args.bars), symbol=args.symbol, starting_balance=args.balance,
+        maker_fee=args.maker_fee, taker_fee=args.taker_fee,
+        slippage_bps=args.slippage_bps, trade_through=args.trade_through
+    )
+    result = bot.run(load_strategy(args.strategy, args.params))
+    for key, value in result.stats().items():
+        print(f"{key:>18}: {value:.4f}" if isinstance(value, float) else f"{key:>18}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,115 @@
 """
 Core trading bot implementation
 """
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
-from typing import Dict, Any, Optional
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from .account import SnapshotCache
 from .config import Config
+from . import exceptions
+from .exceptions import load_client_class
+from .history import OrderHistory
 from .logger import logger
-from .orders import OrderValidator, OrderSide, OrderType
+from .metrics import REGISTRY, start_http_server
+from .models import Balance, Order, Position, loads
+from .orders import OrderValidator, OrderSide, OrderType, BatchOrders, SymbolInfoCache, BATCH_CANCEL_LIMIT
+from .ratelimit import RateLimiter, endpoint_cost
+from .retry import (
+    RetryPolicy, client_order_id, hedged, is_retryable, is_unknown_status,
+    validate_client_order_id, DUPLICATE_CLIENT_ORDER_ID_CODE, ORDER_NOT_FOUND_CODE
+)
+
+
+def _connectivity_key(api_key: str, testnet: bool) -> str:
+    """Fingerprint of the credentials/endpoint a connectivity check was made for"""
+    return hashlib.sha256(f"{api_key}:{Config.get_base_url(testnet)}".encode('utf-8')).hexdigest()[:16]
+
+
+def _connectivity_cached(api_key: str, testnet: bool) -> bool:
+    """Check whether a connectivity check succeeded within the cache TTL"""
+    try:
+        with open(Config.CONNECTIVITY_CACHE_PATH) as f:
+            checked_at = json.load(f).get(_connectivity_key(api_key, testnet), 0)
+        return time.time() - checked_at < Config.CONNECTIVITY_CACHE_TTL
+    except (OSError, ValueError):
+        return False
+
+
+def _remember_connectivity(api_key: str, testnet: bool):
+    """Record a successful connectivity check"""
+    path = Path(Config.CONNECTIVITY_CACHE_PATH)
+    try:
+        try:
+            with open(path) as f:
+                checks = json.load(f)
+        except (OSError, ValueError):
+            checks = {}
+        checks[_connectivity_key(api_key, testnet)] = time.time()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per process: several processes may update the cache at once
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(checks, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write connectivity cache: %s", e)
+
+
+_futures_client_class = None
+
+
+def _get_futures_client_class():
+    """
+    Import python-binance on first use and build the client class
+    
+    The subclass skips the spot API ping that Client.__init__ makes,
+    since this bot only talks to the futures API (explicit ping() calls
+    still reach the exchange), and decodes responses from the raw bytes
+    with the fast decoder (see models.loads). The headers of the last
+    response are kept per thread (response_headers), since client.response
+    is shared by every thread using the client.
+    """
+    global _futures_client_class
+    if _futures_client_class is None:
+        Client = load_client_class()
+        
+        class FuturesClient(Client):
+            def __init__(self, *args, **kwargs):
+                self._last = threading.local()
+                self._constructing = True
+                try:
+                    super().__init__(*args, **kwargs)
+                finally:
+                    self._constructing = False
+            
+            def ping(self):
+                if self._constructing:
+                    return {}
+                return super().ping()
+            
+            @property
+            def response_headers(self):
+                """Headers of the last response received on this thread"""
+                return getattr(self._last, 'headers', None)
+            
+            def _handle_response(self, response):
+                self._last.headers = response.headers
+                if not (200 <= response.status_code < 300):
+                    raise exceptions.BinanceAPIException(response, response.status_code, response.text)
+                try:
+                    return loads(response.content)
+                except ValueError:
+                    raise exceptions.BinanceRequestException('Invalid Response: %s' % response.text)
+        
+        _futures_client_class = FuturesClient
+    return _futures_client_class
+
 
 # Main bot class for handling Binance Futures trading
 
@@ -19,7 +122,13 @@ class BasicBot:
     logging and error handling.
     """
     
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        testnet: bool = True,
+        lazy: Optional[bool] = None
+    ):
         """
         Initialize the trading bot
         
@@ -27,44 +136,336 @@ class BasicBot:
             api_key: Binance API key
             api_secret: Binance API secret
             testnet: Whether to use testnet (default: True)
+            lazy: Defer building the client and testing the connection until
+                the first API call (default: Config.FAST_START)
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.testnet = testnet
+        self.lazy = Config.FAST_START if lazy is None else lazy
+        self._client = None
+        
+        # Account mirror fed by the user-data stream (see start_user_stream)
+        self.user_stream = None
+        self.max_staleness = Config.USER_STREAM_MAX_STALENESS
+        
+        # Local order books fed by depth streams (see watch_order_book)
+        self.order_books = {}
+        
+        # Mark-price PnL engine fed by the mark-price stream (see start_pnl_stream)
+        self.pnl_stream = None
+        self._brackets = None
+        
+        # Short-lived account snapshots shared by concurrent callers;
+        # invalidated whenever this bot places or cancels an order
+        self.snapshots = SnapshotCache(ttl=Config.ACCOUNT_SNAPSHOT_TTL)
+        
+        # Client-side weight/order-count limiter in front of every API call,
+        # re-seeded from exchangeInfo rateLimits whenever it is loaded
+        self.limiter = RateLimiter(safety=Config.RATE_LIMIT_SAFETY)
         
+        # Jittered retries of transient failures. Orders get deterministic
+        # client order IDs (session nonce + sequence + parameters) so an
+        # order whose outcome is unknown is looked up before resubmitting.
+        # Slow reads are hedged on a small pool (threads start on first use)
+        self.retry = RetryPolicy()
+        self._session_nonce = os.urandom(4).hex()
+        self._order_seq = itertools.count(1)
+        self._hedge_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='Hedge')
+        
+        # Local order/fill history, queried without paging the exchange
+        self.history = OrderHistory(Config.ORDER_HISTORY_PATH) if Config.ORDER_HISTORY else None
+        
+        # Per-endpoint latency histograms, served on METRICS_PORT if set
+        self.metrics = REGISTRY
+        if Config.METRICS_PORT:
+            start_http_server(Config.METRICS_PORT, Config.METRICS_HOST)
+        
+        # Symbol filters (tick size, step size, min notional) checked locally
+        self.symbols = None
+        if Config.SYMBOL_FILTERS:
+            self.symbols = SymbolInfoCache(
+                lambda: self._call('futures_exchange_info'),
+                on_update=lambda cache: self.limiter.configure(cache.rate_limits)
+            )
+        
+        if not self.lazy:
+            self.connect()
+    
+    @property
+    def client(self):
+        """Binance client, connected on first use in lazy mode"""
+        if self._client is None:
+            self.connect()
+        return self._client
+    
+    def connect(self):
+        """Build the Binance client and test the API connection"""
         try:
             logger.info("Initializing Binance client...")
-            logger.info(f"Mode: {'TESTNET' if testnet else 'MAINNET'}")
+            logger.info("Mode: %s", 'TESTNET' if self.testnet else 'MAINNET')
             
             # Initialize Binance client
-            self.client = Client(
-                api_key=api_key,
-                api_secret=api_secret,
-                testnet=testnet
+            client = _get_futures_client_class()(
+                api_key=self.api_key,
+                api_secret=self.api_secret,
+                testnet=self.testnet
             )
             
             # Set base URL for futures
-            if testnet:
-                self.client.API_URL = 'https://testnet.binancefuture.com'
+            if Config.BASE_URL_OVERRIDE:
+                client.FUTURES_URL = client.FUTURES_TESTNET_URL = f"{Config.BASE_URL_OVERRIDE}/fapi"
+                logger.info("Using futures API at %s", Config.BASE_URL_OVERRIDE)
+            elif self.testnet:
+                client.API_URL = 'https://testnet.binancefuture.com'
             
-            # Test connection
-            logger.info("Testing API connection...")
-            account_info = self.client.futures_account()
-            logger.info("✓ Successfully connected to Binance Futures API")
-            logger.debug(f"Account status: {account_info.get('canTrade', False)}")
+            # Test connection (fast-start mode reuses a recent successful check)
+            if self.lazy and _connectivity_cached(self.api_key, self.testnet):
+                logger.info("✓ Using cached Binance Futures API connectivity check")
+            else:
+                logger.info("Testing API connection...")
+                weight, orders, priority = endpoint_cost('futures_account')
+                self.limiter.acquire(weight, orders, priority)
+                account_info = self._send(client, 'futures_account', {}, weight)
+                logger.info("✓ Successfully connected to Binance Futures API")
+                logger.debug("Account status: %s", account_info.get('canTrade', False))
+                _remember_connectivity(self.api_key, self.testnet)
+            
+            self._client = client
+            if self.symbols is not None:
+                self.symbols.start_background_refresh()
+            
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error during initialization: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Error initializing bot: %s", e)
+            raise
+    
+    def _call(self, endpoint: str, **params) -> Any:
+        """
+        Make a rate-limited client call
+        
+        Waits for the limiter (trading calls ahead of reads), then updates
+        it from the response's usage headers, or pauses all requests if
+        the exchange answered 429/418.
+        
+        Args:
+            endpoint: Client method name (e.g. 'futures_create_order')
+            **params: Parameters for the client method
             
-        except BinanceAPIException as e:
-            logger.error(f"Binance API Error during initialization: {e}")
+        Returns:
+            Client method response
+        """
+        weight, orders, priority = endpoint_cost(endpoint, params)
+        self.limiter.acquire(weight, orders, priority)
+        return self._send(self.client, endpoint, params, weight)
+    
+    def _send(self, client, endpoint: str, params: Dict[str, Any], weight: int) -> Any:
+        """Make one client call, recording its latency, outcome and weight"""
+        start = time.perf_counter()
+        try:
+            result = getattr(client, endpoint)(**params)
+        except exceptions.BinanceAPIException as e:
+            self.metrics.observe(endpoint, time.perf_counter() - start, weight, e)
+            self.limiter.handle_error(e)
             raise
         except Exception as e:
-            logger.error(f"Error initializing bot: {e}")
+            self.metrics.observe(endpoint, time.perf_counter() - start, weight, e)
             raise
+        self.metrics.observe(endpoint, time.perf_counter() - start, weight)
+        headers = client.response_headers
+        if headers is not None:
+            self.limiter.update_from_headers(headers)
+            used = headers.get('X-MBX-USED-WEIGHT-1M')
+            if used is not None:
+                self.metrics.set_gauge('exchange_used_weight_1m', float(used), 'Weight used this minute (exchange count)')
+        return result
+    
+    def _record_orders(self, *orders: Dict[str, Any]):
+        """Store order responses in the local history (never fails the caller)"""
+        if self.history is None:
+            return
+        try:
+            self.history.record_orders(list(orders))
+        except Exception as e:
+            logger.warning("Could not record order history: %s", e)
+    
+    def sync_fills(self, symbol: str) -> int:
+        """
+        Download fills for a symbol into the local history
+        
+        Only trades newer than the last sync are requested (userTrades
+        with a fromId cursor).
+        
+        Args:
+            symbol: Trading pair symbol
+            
+        Returns:
+            Number of new fills stored
+        """
+        if self.history is None:
+            raise ValueError("Order history is disabled (ORDER_HISTORY=False)")
+        symbol = OrderValidator.validate_symbol(symbol)
+        return self.history.sync_fills(symbol, lambda **params: self._call('futures_account_trades', **params))
+    
+    def start_user_stream(self, max_staleness: Optional[float] = None):
+        """
+        Start the user-data stream and serve reads from its account mirror
+        
+        Once started, get_open_orders, get_positions and get_account_balance
+        answer from memory while the mirror is fresh, and fall back to REST
+        otherwise (e.g. while the stream is reconnecting).
+        
+        Args:
+            max_staleness: Max seconds since the stream was last heard from
+                for mirror reads (default: Config.USER_STREAM_MAX_STALENESS)
+        """
+        from .user_stream import UserDataStream
+        
+        if max_staleness is not None:
+            self.max_staleness = max_staleness
+        if self.user_stream is None:
+            self.user_stream = UserDataStream(self)
+            self.user_stream.start()
+    
+    def stop_user_stream(self):
+        """Stop the user-data stream; reads go back to REST"""
+        if self.user_stream is not None:
+            self.user_stream.stop()
+            self.user_stream = None
+    
+    def _mirror_fresh(self) -> bool:
+        """Check whether reads can be served from the account mirror"""
+        return self.user_stream is not None and self.user_stream.is_fresh(self.max_staleness)
+    
+    def start_pnl_stream(self):
+        """
+        Start the streaming PnL engine
+        
+        Positions and balances come from the user-data stream (started if
+        needed) and every !markPrice@arr message revalues them, so
+        get_position_pnl answers from memory while both streams are fresh.
+        """
+        from .pnl import MarkPriceStream
+        
+        if self.pnl_stream is None:
+            self.pnl_stream = MarkPriceStream(self)
+            self.pnl_stream.start()
+    
+    def stop_pnl_stream(self):
+        """Stop the PnL engine (the user-data stream keeps running)"""
+        if self.pnl_stream is not None:
+            self.pnl_stream.stop()
+            self.pnl_stream = None
+    
+    def leverage_brackets(self) -> Dict[str, list]:
+        """
+        Get maintenance margin tiers per symbol (loaded once per bot)
+        
+        Returns:
+            Symbol -> [(notionalCap, maintMarginRatio, cum), ...]; empty if
+            the brackets could not be loaded
+        """
+        from .pnl import parse_brackets
+        
+        if self._brackets is None:
+            try:
+                self._brackets = parse_brackets(self._call('futures_leverage_bracket'))
+            except Exception as e:
+                logger.warning("Could not load leverage brackets, using PNL_MAINT_MARGIN_RATE: %s", e)
+                self._brackets = {}
+        return self._brackets
+    
+    def get_position_pnl(self, symbol: Optional[str] = None) -> list:
+        """
+        Get positions valued at the latest mark prices
+        
+        Served by the PnL engine while it is fresh; otherwise positions and
+        marks are read from REST and valued once the same way.
+        
+        Args:
+            symbol: Only this symbol
+            
+        Returns:
+            List of PositionPnL (unrealized PnL, margin ratio, liquidation
+            price and distance per position)
+        """
+        from .pnl import PnLEngine
+        
+        symbol = OrderValidator.validate_symbol(symbol) if symbol else None
+        if self.pnl_stream is not None and self.pnl_stream.is_fresh(self.max_staleness):
+            logger.debug("Serving position PnL from the mark-price stream")
+            return self.pnl_stream.engine.snapshot(symbol)
+        
+        engine = PnLEngine()
+        engine.set_brackets(self.leverage_brackets())
+        engine.load(self.get_positions(typed=True), self.get_account_balance())
+        return engine.snapshot(symbol)
+    
+    def watch_order_book(self, symbol: str):
+        """
+        Maintain a local order book for a symbol from its depth stream
+        
+        While the book is synced, market orders on the symbol are priced
+        against it before submission (see estimate_market_fill).
+        
+        Args:
+            symbol: Trading pair symbol
+        """
+        from .orderbook import DepthStream
+        
+        symbol = OrderValidator.validate_symbol(symbol)
+        if symbol not in self.order_books:
+            stream = DepthStream(self, symbol)
+            self.order_books[symbol] = stream
+            stream.start()
+    
+    def unwatch_order_book(self, symbol: Optional[str] = None):
+        """
+        Stop maintaining local order books
+        
+        Args:
+            symbol: Book to stop (default: all of them)
+        """
+        symbols = [symbol.upper()] if symbol else list(self.order_books)
+        for sym in symbols:
+            stream = self.order_books.pop(sym, None)
+            if stream is not None:
+                stream.stop()
+    
+    def estimate_market_fill(self, symbol: str, side: str, quantity: float) -> Optional[Dict[str, Any]]:
+        """
+        Estimate a market order's fill price and slippage from the local book
+        
+        No REST calls are made; returns None unless the symbol's book is
+        synced and fresher than Config.ORDER_BOOK_MAX_STALENESS.
+        
+        Args:
+            symbol: Trading pair symbol
+            side: Order side ('BUY' or 'SELL')
+            quantity: Order quantity
+            
+        Returns:
+            Dict with avg_price, worst_price, filled_qty, levels,
+            slippage_bps and complete, or None if no fresh book exists
+        """
+        stream = self.order_books.get(symbol.upper())
+        if stream is None or not stream.is_fresh(Config.ORDER_BOOK_MAX_STALENESS):
+            return None
+        return stream.estimate_fill(side.upper(), quantity)
+    
+    def _filters(self, symbol: str):
+        """Get cached exchange filters for a symbol (None if disabled/unknown)"""
+        return self.symbols.get(symbol) if self.symbols is not None else None
     
     def place_market_order(
         self,
         symbol: str,
         side: str,
-        quantity: float
+        quantity: float,
+        max_slippage_bps: Optional[float] = None,
+        client_order_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Place a market order
@@ -73,6 +474,10 @@ class BasicBot:
             symbol: Trading pair symbol (e.g., 'BTCUSDT')
             side: Order side ('BUY' or 'SELL')
             quantity: Order quantity
+            max_slippage_bps: Reject the order if the local book estimates
+                more slippage than this (default: Config.MAX_SLIPPAGE_BPS;
+                only applies to symbols with a watched order book)
+            client_order_id: newClientOrderId (default: generated)
             
         Returns:
             Order response from Binance API
@@ -82,38 +487,164 @@ class BasicBot:
             symbol = OrderValidator.validate_symbol(symbol)
             side = OrderValidator.validate_side(side)
             quantity = OrderValidator.validate_quantity(quantity)
+            quantity, _ = OrderValidator.validate_filters_fixed(self._filters(symbol), quantity, market=True)
+            
+            estimate = self.estimate_market_fill(symbol, side, float(quantity))
+            if estimate is not None:
+                self._check_slippage(symbol, estimate, max_slippage_bps)
             
-            logger.info(f"Placing MARKET order: {side} {quantity} {symbol}")
+            logger.info("Placing MARKET order: %s %s %s", side, quantity, symbol)
             
             # Place order
-            order = self.client.futures_create_order(
+            order = self._submit_order(
+                client_order_id,
                 symbol=symbol,
                 side=side,
                 type=OrderType.MARKET.value,
-                quantity=quantity
+                quantity=str(quantity)
             )
             
-            logger.info(f"✓ Market order placed successfully")
-            logger.info(f"Order ID: {order['orderId']}, Status: {order['status']}")
-            logger.debug(f"Full order response: {order}")
+            self.snapshots.invalidate()
+            self._record_orders(order)
+            logger.info("✓ Market order placed successfully")
+            logger.info("Order ID: %s, Status: %s", order['orderId'], order['status'])
+            logger.debug("Full order response: %s", order)
             
             return order
             
-        except BinanceAPIException as e:
-            logger.error(f"Binance API Error: {e}")
-            logger.error(f"Error code: {e.code}, Message: {e.message}")
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            logger.error("Error code: %s, Message: %s", e.code, e.message)
             raise
         except Exception as e:
-            logger.error(f"Error placing market order: {e}")
+            logger.error("Error placing market order: %s", e)
             raise
     
+    def _next_client_order_id(self, params: Dict[str, Any]) -> str:
+        """Generate the newClientOrderId for an order about to be sent"""
+        return client_order_id(params, f"{self._session_nonce}:{next(self._order_seq)}")
+    
+    def _submit_order(self, cid: Optional[str] = None, **params) -> Dict[str, Any]:
+        """
+        Place one order, retrying transient failures without risking a double fill
+        
+        The newClientOrderId is fixed before the first attempt. After a
+        failure whose outcome is unknown (timeout, dropped connection, 5xx)
+        the order is looked up by that ID and only resubmitted if the
+        exchange never received it; rejections are raised immediately.
+        
+        Args:
+            cid: newClientOrderId (default: generated)
+            **params: futures_create_order parameters
+            
+        Returns:
+            Order response (or the order as queried, if an earlier attempt
+            turns out to have been placed)
+        """
+        params['newClientOrderId'] = (
+            validate_client_order_id(cid) if cid else self._next_client_order_id(params)
+        )
+        cid = params['newClientOrderId']
+        error = None
+        for attempt in range(1, self.retry.attempts + 1):
+            if error is not None:
+                delay = self.retry.delay(attempt - 1)
+                logger.warning(
+                    "Order %s failed (%s), retry %s/%s in %.2fs",
+                    cid, error, attempt - 1, self.retry.attempts - 1, delay
+                )
+                time.sleep(delay)
+                if is_unknown_status(error):
+                    order = self._find_order(params['symbol'], cid, error)
+                    if order is not None:
+                        logger.info("Order %s was placed by an earlier attempt", cid)
+                        return order
+            try:
+                return self._call('futures_create_order', **params)
+            except exceptions.BinanceAPIException as e:
+                if e.code == DUPLICATE_CLIENT_ORDER_ID_CODE and attempt > 1:
+                    # An earlier attempt got through after our lookup
+                    order = self._find_order(params['symbol'], cid, e)
+                    if order is not None:
+                        return order
+                error = e
+            except Exception as e:
+                error = e
+            if attempt == self.retry.attempts or not is_retryable(error):
+                raise error
+    
+    def _find_order(self, symbol: str, cid: str, cause: BaseException) -> Optional[Dict[str, Any]]:
+        """
+        Look up an order by client order ID after a failed submit
+        
+        Returns:
+            The order, or None if the exchange does not know it
+            
+        Raises:
+            The submit error `cause` if the lookup itself keeps failing, as
+            resubmitting without knowing the outcome could double the order
+        """
+        try:
+            return self.retry.call(
+                lambda: self._call('futures_get_order', symbol=symbol, origClientOrderId=cid),
+                f"Order {cid} lookup"
+            )
+        except exceptions.BinanceAPIException as e:
+            if e.code == ORDER_NOT_FOUND_CODE:
+                return None
+            logger.error("Cannot confirm whether order %s was placed: %s", cid, e)
+            raise cause
+        except Exception as e:
+            logger.error("Cannot confirm whether order %s was placed: %s", cid, e)
+            raise cause
+    
+    def _read(self, endpoint: str, **params) -> Any:
+        """
+        Make an idempotent read call, retried with backoff and hedged
+        
+        If the request has not answered within the endpoint's usual latency
+        (Config.HEDGE_PERCENTILE of its successes since start), a duplicate is sent
+        and whichever answers first is used.
+        """
+        if not Config.HEDGE_READS:
+            return self.retry.call(lambda: self._call(endpoint, **params), endpoint)
+        delay = self.metrics.percentile(endpoint, Config.HEDGE_PERCENTILE)
+        if delay is None:
+            delay = Config.HEDGE_DELAY
+        return self.retry.call(
+            lambda: hedged(self._hedge_pool, lambda: self._call(endpoint, **params), delay),
+            endpoint
+        )
+    
+    def _check_slippage(self, symbol: str, estimate: Dict[str, Any], max_slippage_bps: Optional[float]):
+        """Log a fill estimate and enforce the slippage limit"""
+        limit = Config.MAX_SLIPPAGE_BPS if max_slippage_bps is None else max_slippage_bps
+        slippage = estimate['slippage_bps']
+        logger.info(
+            "Estimated fill for %s: avg %s, worst %s, slippage %s bps over %s levels",
+            symbol, estimate['avg_price'], estimate['worst_price'],
+            None if slippage is None else round(slippage, 2), estimate['levels']
+        )
+        if not limit:
+            return
+        if not estimate['complete']:
+            raise ValueError(
+                f"Order book depth for {symbol} cannot fill the order "
+                f"(only {estimate['filled_qty']} available)"
+            )
+        if slippage is not None and slippage > limit:
+            raise ValueError(
+                f"Estimated slippage {slippage:.2f} bps exceeds the limit of {limit} bps"
+            )
+    
     def place_limit_order(
         self,
         symbol: str,
         side: str,
         quantity: float,
         price: float,
-        time_in_force: str = 'GTC'
+        time_in_force: str = 'GTC',
+        client_order_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Place a limit order
@@ -124,6 +655,7 @@ class BasicBot:
             quantity: Order quantity
             price: Limit price
             time_in_force: Time in force (default: 'GTC' - Good Till Cancel)
+            client_order_id: newClientOrderId (default: generated)
             
         Returns:
             Order response from Binance API
@@ -134,31 +666,35 @@ class BasicBot:
             side = OrderValidator.validate_side(side)
             quantity = OrderValidator.validate_quantity(quantity)
             price = OrderValidator.validate_price(price)
+            quantity, price = OrderValidator.validate_filters_fixed(self._filters(symbol), quantity, price)
             
-            logger.info(f"Placing LIMIT order: {side} {quantity} {symbol} @ {price}")
+            logger.info("Placing LIMIT order: %s %s %s @ %s", side, quantity, symbol, price)
             
             # Place order
-            order = self.client.futures_create_order(
+            order = self._submit_order(
+                client_order_id,
                 symbol=symbol,
                 side=side,
                 type=OrderType.LIMIT.value,
-                quantity=quantity,
-                price=price,
+                quantity=str(quantity),
+                price=str(price),
                 timeInForce=time_in_force
             )
             
-            logger.info(f"✓ Limit order placed successfully")
-            logger.info(f"Order ID: {order['orderId']}, Status: {order['status']}")
-            logger.debug(f"Full order response: {order}")
+            self.snapshots.invalidate()
+            self._record_orders(order)
+            logger.info("✓ Limit order placed successfully")
+            logger.info("Order ID: %s, Status: %s", order['orderId'], order['status'])
+            logger.debug("Full order response: %s", order)
             
             return order
             
-        except BinanceAPIException as e:
-            logger.error(f"Binance API Error: {e}")
-            logger.error(f"Error code: {e.code}, Message: {e.message}")
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            logger.error("Error code: %s, Message: %s", e.code, e.message)
             raise
         except Exception as e:
-            logger.error(f"Error placing limit order: {e}")
+            logger.error("Error placing limit order: %s", e)
             raise
     
     def place_stop_limit_order(
@@ -168,7 +704,8 @@ class BasicBot:
         quantity: float,
         price: float,
         stop_price: float,
-        time_in_force: str = 'GTC'
+        time_in_force: str = 'GTC',
+        client_order_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Place a stop-limit order (BONUS FEATURE)
@@ -180,6 +717,7 @@ class BasicBot:
             price: Limit price (price to execute at when stop is triggered)
             stop_price: Stop price (trigger price)
             time_in_force: Time in force (default: 'GTC')
+            client_order_id: newClientOrderId (default: generated)
             
         Returns:
             Order response from Binance API
@@ -191,108 +729,240 @@ class BasicBot:
             quantity = OrderValidator.validate_quantity(quantity)
             price = OrderValidator.validate_price(price)
             stop_price = OrderValidator.validate_price(stop_price)
+            filters = self._filters(symbol)
+            quantity, price = OrderValidator.validate_filters_fixed(filters, quantity, price)
+            stop_price = OrderValidator.snap_price(filters, stop_price)
             
             logger.info(
-                f"Placing STOP-LIMIT order: {side} {quantity} {symbol} "
-                f"@ {price} (stop: {stop_price})"
+                "Placing STOP-LIMIT order: %s %s %s @ %s (stop: %s)",
+                side, quantity, symbol, price, stop_price
             )
             
             # Place order
-            order = self.client.futures_create_order(
+            order = self._submit_order(
+                client_order_id,
                 symbol=symbol,
                 side=side,
                 type=OrderType.STOP.value,
-                quantity=quantity,
-                price=price,
-                stopPrice=stop_price,
+                quantity=str(quantity),
+                price=str(price),
+                stopPrice=str(stop_price),
                 timeInForce=time_in_force
             )
             
-            logger.info(f"✓ Stop-limit order placed successfully")
-            logger.info(f"Order ID: {order['orderId']}, Status: {order['status']}")
-            logger.debug(f"Full order response: {order}")
+            self.snapshots.invalidate()
+            self._record_orders(order)
+            logger.info("✓ Stop-limit order placed successfully")
+            logger.info("Order ID: %s, Status: %s", order['orderId'], order['status'])
+            logger.debug("Full order response: %s", order)
             
             return order
             
-        except BinanceAPIException as e:
-            logger.error(f"Binance API Error: {e}")
-            logger.error(f"Error code: {e.code}, Message: {e.message}")
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
+            logger.error("Error code: %s, Message: %s", e.code, e.message)
             raise
         except Exception as e:
-            logger.error(f"Error placing stop-limit order: {e}")
+            logger.error("Error placing stop-limit order: %s", e)
             raise
     
-    def get_account_balance(self) -> Dict[str, Any]:
+    def place_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place many orders through the futures batchOrders endpoint
+        
+        Orders are validated locally, split into chunks of 5 (the exchange
+        limit per batch request) and the chunks are sent concurrently.
+        Each order gets a client order ID, so failed chunks are retried
+        like single orders (see _submit_order).
+        
+        Args:
+            orders: List of order specs, e.g.
+                {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT',
+                 'quantity': 0.001, 'price': 40000}
+                Stop-limit specs use type 'STOP' and also need 'stop_price'.
+                An optional 'client_order_id' sets newClientOrderId.
+            
+        Returns:
+            One result per input order, in order:
+            {'index', 'success', 'order', 'error': {'code', 'msg'} or None}
+        """
+        results, chunks = BatchOrders.prepare(orders, self.symbols)
+        rejected = len(orders) - sum(len(chunk) for chunk in chunks)
+        logger.info(
+            "Placing batch of %s order(s) in %s request(s)%s",
+            len(orders), len(chunks), f" ({rejected} failed validation)" if rejected else ''
+        )
+        
+        def send(chunk):
+            try:
+                return self._send_batch([params for _, params in chunk])
+            except Exception as e:
+                logger.error("Batch order request failed: %s", e)
+                return e
+        
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(len(chunks), Config.BATCH_MAX_WORKERS)) as pool:
+                for chunk, response in zip(chunks, pool.map(send, chunks)):
+                    BatchOrders.record(results, chunk, response)
+        
+        placed = sum(1 for r in results if r['success'])
+        if placed:
+            self.snapshots.invalidate()
+            self._record_orders(*(r['order'] for r in results if r['success']))
+        logger.info("✓ Batch complete: %s/%s order(s) placed", placed, len(orders))
+        for result in results:
+            if result['error']:
+                logger.error("Batch order #%s failed: %s", result['index'], result['error']['msg'])
+        logger.debug("Batch results: %s", results)
+        
+        return results
+    
+    def _send_batch(self, batch: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Send one batchOrders request, retrying transient failures
+        
+        After a failure whose outcome is unknown, each order is looked up by
+        client order ID and only the ones the exchange never received are
+        resent. An order whose lookup fails is reported as failed rather
+        than resent.
+        
+        Returns:
+            One response item (order or {'code', 'msg'}) per order, in order
+        """
+        for params in batch:
+            params.setdefault('newClientOrderId', self._next_client_order_id(params))
+        items = [None] * len(batch)
+        todo = list(range(len(batch)))
+        error = None
+        for attempt in range(1, self.retry.attempts + 1):
+            if error is not None:
+                delay = self.retry.delay(attempt - 1)
+                logger.warning(
+                    "Batch of %s order(s) failed (%s), retry %s/%s in %.2fs",
+                    len(todo), error, attempt - 1, self.retry.attempts - 1, delay
+                )
+                time.sleep(delay)
+                if is_unknown_status(error):
+                    for i in todo:
+                        items[i] = self._find_batch_order(batch[i], error)
+                    todo = [i for i in todo if items[i] is None]
+                    if not todo:
+                        return items
+            try:
+                response = self._call('futures_place_batch_order', batchOrders=[batch[i] for i in todo])
+            except Exception as e:
+                error = e
+                if attempt == self.retry.attempts or not is_retryable(e):
+                    raise
+                continue
+            for i, item in zip(todo, response):
+                if item.get('code') == DUPLICATE_CLIENT_ORDER_ID_CODE and attempt > 1:
+                    item = self._find_batch_order(batch[i], error) or item
+                items[i] = item
+            return items
+    
+    def _find_batch_order(self, params: Dict[str, str], cause: BaseException) -> Optional[Dict[str, Any]]:
+        """Look up a batch order by client order ID (an error item if the lookup fails)"""
+        try:
+            return self._find_order(params['symbol'], params['newClientOrderId'], cause)
+        except Exception as e:
+            return {'code': getattr(e, 'code', None), 'msg': f"Order status unknown: {getattr(e, 'message', e)}"}
+    
+    def get_account_balance(self, typed: bool = False):
         """
         Get account balance information
         
+        Args:
+            typed: Return one Balance model per asset instead of the raw record
+            
         Returns:
-            Account balance data
+            Account balance data (or List[Balance])
         """
         try:
+            if self._mirror_fresh():
+                logger.debug("Serving account balance from user-data stream mirror")
+                account = self.user_stream.mirror.get_account()
+                return Balance.from_account(account) if typed else account
+            
             logger.info("Fetching account balance...")
-            balance = self.client.futures_account_balance()
-            account = self.client.futures_account()
+            account = self.snapshots.get('account', lambda: self._read('futures_account'))
             
-            logger.debug(f"Balance data: {balance}")
-            return account
+            logger.debug("Balance data: %s", account.get('assets'))
+            return Balance.from_account(account) if typed else account
             
-        except BinanceAPIException as e:
-            logger.error(f"Binance API Error: {e}")
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error fetching balance: {e}")
+            logger.error("Error fetching balance: %s", e)
             raise
     
-    def get_open_orders(self, symbol: Optional[str] = None) -> list:
+    def get_open_orders(self, symbol: Optional[str] = None, typed: bool = False) -> list:
         """
         Get open orders
         
         Args:
             symbol: Optional symbol to filter orders
+            typed: Return Order models instead of raw dicts
             
         Returns:
             List of open orders
         """
         try:
-            logger.info(f"Fetching open orders{' for ' + symbol if symbol else ''}...")
+            logger.info("Fetching open orders%s...", ' for ' + symbol if symbol else '')
             
             params = {}
             if symbol:
                 params['symbol'] = OrderValidator.validate_symbol(symbol)
             
-            orders = self.client.futures_get_open_orders(**params)
-            logger.info(f"Found {len(orders)} open order(s)")
-            logger.debug(f"Orders: {orders}")
+            if self._mirror_fresh():
+                mirror = self.user_stream.mirror
+                orders = mirror.get_orders(params.get('symbol')) if typed else mirror.get_open_orders(params.get('symbol'))
+                logger.info("Found %s open order(s) (user-data stream)", len(orders))
+                return orders
             
-            return orders
+            orders = self.snapshots.get(
+                ('open_orders', params.get('symbol')),
+                lambda: self._read('futures_get_open_orders', **params)
+            )
+            logger.info("Found %s open order(s)", len(orders))
+            logger.debug("Orders: %s", orders)
+            
+            return [Order.from_dict(o) for o in orders] if typed else orders
             
-        except BinanceAPIException as e:
-            logger.error(f"Binance API Error: {e}")
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error fetching open orders: {e}")
+            logger.error("Error fetching open orders: %s", e)
             raise
     
-    def get_positions(self) -> list:
+    def get_positions(self, typed: bool = False) -> list:
         """
         Get open positions
         
+        Args:
+            typed: Return Position models instead of raw dicts
+            
         Returns:
             List of positions
         """
         try:
-            logger.info("Fetching positions...")
-            positions = self.client.futures_position_information()
-            logger.debug(f"Positions: {positions}")
+            if self._mirror_fresh():
+                logger.debug("Serving positions from user-data stream mirror")
+                positions = self.user_stream.mirror.get_positions()
+            else:
+                logger.info("Fetching positions...")
+                positions = self.snapshots.get('positions', lambda: self._read('futures_position_information'))
+                logger.debug("Positions: %s", positions)
             
-            return positions
+            return [Position.from_dict(p) for p in positions] if typed else positions
             
-        except BinanceAPIException as e:
-            logger.error(f"Binance API Error: {e}")
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error fetching positions: {e}")
+            logger.error("Error fetching positions: %s", e)
             raise
     
     def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
@@ -308,21 +978,201 @@ class BasicBot:
         """
         try:
             symbol = OrderValidator.validate_symbol(symbol)
-            logger.info(f"Cancelling order {order_id} for {symbol}...")
+            logger.info("Cancelling order %s for %s...", order_id, symbol)
             
-            result = self.client.futures_cancel_order(
+            result = self._call(
+                'futures_cancel_order',
                 symbol=symbol,
                 orderId=order_id
             )
             
-            logger.info(f"✓ Order cancelled successfully")
-            logger.debug(f"Cancellation response: {result}")
+            self.snapshots.invalidate()
+            self._record_orders(result)
+            logger.info("✓ Order cancelled successfully")
+            logger.debug("Cancellation response: %s", result)
             
             return result
             
-        except BinanceAPIException as e:
-            logger.error(f"Binance API Error: {e}")
+        except exceptions.BinanceAPIException as e:
+            logger.error("Binance API Error: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error cancelling order: {e}")
+            logger.error("Error cancelling order: %s", e)
             raise
+    
+    def cancel_orders(
+        self,
+        symbol: Optional[str] = None,
+        side: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Cancel all open orders, or the ones matching a filter
+        
+        Without side/price filters each symbol is cleared with one
+        cancel-all request; with filters, the matching order ids are
+        cancelled through the batch-cancel endpoint (10 per request).
+        Symbols are processed concurrently.
+        
+        Args:
+            symbol: Only this symbol (default: every symbol with open orders)
+            side: Only BUY or SELL orders
+            min_price: Only orders priced at or above this
+            max_price: Only orders priced at or below this
+            
+        Returns:
+            Per-symbol reports (see _run_per_symbol); 'cancelled' is None
+            where cancel-all was used (the endpoint returns no count)
+        """
+        symbol = OrderValidator.validate_symbol(symbol) if symbol else None
+        side = OrderValidator.validate_side(side) if side else None
+        filtered = side is not None or min_price is not None or max_price is not None
+        
+        jobs = []
+        if symbol and not filtered:
+            jobs.append((symbol, 'cancelled', lambda: self._cancel_all(symbol)))
+        else:
+            self.snapshots.invalidate()
+            by_symbol: Dict[str, List[int]] = {}
+            for order in self.get_open_orders(symbol):
+                price = float(order.get('price') or 0) or float(order.get('stopPrice') or 0)
+                if side and order['side'] != side:
+                    continue
+                if (min_price is not None and price < min_price) or (max_price is not None and price > max_price):
+                    continue
+                by_symbol.setdefault(order['symbol'], []).append(order['orderId'])
+            for sym, ids in by_symbol.items():
+                if not filtered:
+                    jobs.append((sym, 'cancelled', lambda sym=sym: self._cancel_all(sym)))
+                    continue
+                for i in range(0, len(ids), BATCH_CANCEL_LIMIT):
+                    chunk = ids[i:i + BATCH_CANCEL_LIMIT]
+                    jobs.append((sym, 'cancelled', lambda sym=sym, chunk=chunk: self._cancel_batch(sym, chunk)))
+        
+        logger.info("Cancelling orders on %s symbol(s) in %s request(s)...", len({job[0] for job in jobs}), len(jobs))
+        return self._run_per_symbol(jobs)
+    
+    def flatten_all(self, symbol: Optional[str] = None, cancel_orders: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Close every open position with reduce-only market orders
+        
+        Positions are read fresh (not from a cached snapshot). All closes,
+        and the cancel-all requests if cancel_orders is set, are sent
+        concurrently.
+        
+        Args:
+            symbol: Only this symbol (default: every symbol)
+            cancel_orders: Also cancel all open orders on symbols with a
+                position, so resting orders cannot reopen it
+            
+        Returns:
+            Per-symbol reports (see _run_per_symbol); 'closed' counts
+            the positions closed
+        """
+        symbol = OrderValidator.validate_symbol(symbol) if symbol else None
+        self.snapshots.invalidate()
+        positions = [
+            p for p in self.get_positions()
+            if float(p.get('positionAmt', 0)) and (symbol is None or p['symbol'] == symbol)
+        ]
+        
+        jobs = []
+        for position in positions:
+            jobs.append((position['symbol'], 'closed', lambda position=position: self._close_position(position)))
+        if cancel_orders:
+            for sym in dict.fromkeys(p['symbol'] for p in positions):
+                jobs.append((sym, 'cancelled', lambda sym=sym: self._cancel_all(sym)))
+        
+        logger.warning("Flattening %s position(s)...", len(positions))
+        return self._run_per_symbol(jobs)
+    
+    def _cancel_all(self, symbol: str) -> None:
+        """Cancel every open order of a symbol (the count is not reported)"""
+        self._call('futures_cancel_all_open_orders', symbol=symbol)
+    
+    def _cancel_batch(self, symbol: str, order_ids: List[int]) -> tuple:
+        """
+        Cancel up to BATCH_CANCEL_LIMIT orders
+        
+        Returns:
+            (number cancelled, [{'code', 'msg', 'orderId'} per failed cancel])
+        """
+        response = self._call('futures_cancel_orders', symbol=symbol, orderIdList=json.dumps(order_ids))
+        cancelled = [item for item in response if 'orderId' in item]
+        self._record_orders(*cancelled)
+        # Response items are in request order; errors carry no orderId
+        errors = [
+            {'code': item.get('code'), 'msg': f"Order {order_id}: {item.get('msg')}", 'orderId': order_id}
+            for order_id, item in zip(order_ids, response) if 'orderId' not in item
+        ]
+        return len(cancelled), errors
+    
+    def _close_position(self, position: Dict[str, Any]) -> int:
+        """Send a market order that closes one position; returns 1"""
+        amount = float(position['positionAmt'])
+        params = {
+            'symbol': position['symbol'],
+            'side': OrderSide.SELL.value if amount > 0 else OrderSide.BUY.value,
+            'type': OrderType.MARKET.value,
+            'quantity': position['positionAmt'].lstrip('-'),
+        }
+        if position.get('positionSide', 'BOTH') != 'BOTH':
+            # Hedge mode: the position side identifies what to close
+            # (reduceOnly is rejected in hedge mode)
+            params['positionSide'] = position['positionSide']
+        else:
+            params['reduceOnly'] = 'true'
+        self._record_orders(self._submit_order(**params))
+        return 1
+    
+    def _run_per_symbol(self, jobs: List[tuple]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run (symbol, count key, callable) jobs concurrently and report per symbol
+        
+        A job returns its count, or (count, errors) when part of it failed.
+        
+        Returns:
+            symbol -> {'symbol', 'success', 'cancelled', 'closed' (sums of
+            the job results per key, None if a job could not count),
+            'errors', 'elapsed_ms' (time until the symbol's last job finished)}
+        """
+        reports: Dict[str, Dict[str, Any]] = {}
+        for sym, _, _ in jobs:
+            reports.setdefault(sym, {
+                'symbol': sym, 'success': True, 'cancelled': 0, 'closed': 0, 'errors': [], 'elapsed_ms': 0.0
+            })
+        if not jobs:
+            return reports
+        
+        start = time.perf_counter()
+        
+        def run(job):
+            sym, key, fn = job
+            try:
+                result, errors = fn(), []
+                if isinstance(result, tuple):
+                    result, errors = result
+            except Exception as e:
+                result, errors = 0, [{'code': getattr(e, 'code', None), 'msg': getattr(e, 'message', str(e))}]
+            return sym, key, result, errors, (time.perf_counter() - start) * 1000
+        
+        with ThreadPoolExecutor(max_workers=min(len(jobs), Config.BATCH_MAX_WORKERS)) as pool:
+            for sym, key, result, errors, elapsed_ms in pool.map(run, jobs):
+                report = reports[sym]
+                report[key] = None if result is None or report[key] is None else report[key] + result
+                if errors:
+                    report['success'] = False
+                    report['errors'] += errors
+                report['elapsed_ms'] = max(report['elapsed_ms'], elapsed_ms)
+        
+        self.snapshots.invalidate()
+        failed = [sym for sym, report in reports.items() if not report['success']]
+        logger.info(
+            "✓ %s symbol(s) done in %.0fms%s", len(reports) - len(failed),
+            (time.perf_counter() - start) * 1000, f", {len(failed)} failed: {', '.join(failed)}" if failed else ''
+        )
+        for sym in failed:
+            for error in reports[sym]['errors']:
+                logger.error("%s: %s", sym, error['msg'])
+        return reports
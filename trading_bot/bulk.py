@@ -0,0 +1,205 @@
+"""
+Bulk order submission from CSV/JSONL order files
+
+Order specs are streamed from a file (or stdin), validated with
+OrderValidator as they are read, grouped into batchOrders-sized chunks
+and sent through a bounded pool of concurrent batch requests. One JSONL
+result line is written per input order as soon as its chunk completes,
+so memory use does not grow with the file size.
+
+Input formats:
+    CSV   header row with symbol,side,type,quantity[,price,stop_price,time_in_force,client_order_id]
+    JSONL one order spec object per line (same keys)
+
+Usage:
+    python main.py bulk orders.csv --dry-run
+    python main.py bulk orders.jsonl -o results.jsonl
+    cat orders.jsonl | python main.py bulk - --format jsonl
+"""
+import csv
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+from .config import Config
+from .logger import logger
+from .orders import BATCH_ORDER_LIMIT, OrderValidator, SymbolInfoCache
+
+
+def detect_format(path: str) -> str:
+    """Guess the input format from a file name ('csv' unless it ends in .jsonl/.json/.ndjson)"""
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.json', '.ndjson')) else 'csv'
+
+
+def read_specs(stream: IO[str], fmt: str = 'csv') -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Stream order specs from a CSV or JSONL file
+
+    Args:
+        stream: Open text file (open CSV files with newline='' so quoted
+            multi-line fields are read intact)
+        fmt: 'csv' or 'jsonl'
+
+    Yields:
+        (line number, spec or None, parse error or None); blank lines and
+        lines starting with '#' are skipped
+    """
+    if fmt == 'jsonl':
+        for line_no, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                spec = json.loads(line)
+            except ValueError as e:
+                yield line_no, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(spec, dict):
+                yield line_no, None, "Order spec must be a JSON object"
+                continue
+            yield line_no, spec, None
+        return
+
+    if fmt != 'csv':
+        raise ValueError(f"Unsupported format: {fmt}. Must be csv or jsonl")
+    header = None
+    reader = csv.reader(stream)
+    last_line = 0
+    for row in reader:
+        # Quoted fields may span lines; report the line the record starts on
+        line_no, last_line = last_line + 1, reader.line_num
+        if not any(cell.strip() for cell in row) or row[0].startswith('#'):
+            continue
+        if header is None:
+            header = [name.strip().lower() for name in row]
+            continue
+        # Empty cells mean "not given" so optional columns can be left blank
+        yield line_no, {k: v.strip() for k, v in zip(header, row) if k and v.strip()}, None
+
+
+class BulkSubmitter:
+    """
+    Validate and submit a stream of order specs through batchOrders
+
+    Valid orders are grouped into chunks of BATCH_ORDER_LIMIT and sent by
+    up to `concurrency` workers; reading stops while 2x that many chunks
+    are in flight, which bounds memory and keeps the rate limiter (shared
+    by all workers) in charge of pacing.
+    """
+
+    def __init__(self, bot=None, symbols: Optional[SymbolInfoCache] = None,
+                 concurrency: Optional[int] = None, dry_run: bool = False):
+        """
+        Initialize the submitter
+
+        Args:
+            bot: BasicBot used to place orders (not needed for dry runs)
+            symbols: Symbol filters to validate against (default: the bot's)
+            concurrency: Max concurrent batch requests (default: Config.BATCH_MAX_WORKERS)
+            dry_run: Only validate; nothing is sent
+        """
+        if bot is None and not dry_run:
+            raise ValueError("A bot is required unless dry_run is set")
+        self.bot = bot
+        self.symbols = symbols if symbols is not None else getattr(bot, 'symbols', None)
+        self.concurrency = max(1, concurrency or Config.BATCH_MAX_WORKERS)
+        self.dry_run = dry_run
+        self.stats = {'read': 0, 'valid': 0, 'rejected': 0, 'placed': 0, 'failed': 0, 'requests': 0}
+
+    def validate(self, spec: Dict[str, Any]) -> Dict[str, str]:
+        """Validate one spec against the symbol filters and return exchange parameters"""
+        filters = None
+        if self.symbols is not None:
+            filters = self.symbols.get(OrderValidator.validate_symbol(spec.get('symbol', '')))
+        return OrderValidator.validate_order_spec(spec, filters)
+
+    def run(self, specs: Iterable[Tuple[int, Optional[Dict[str, Any]], Optional[str]]], out: IO[str]) -> Dict[str, Any]:
+        """
+        Validate, submit and write results for every spec
+
+        Args:
+            specs: (line, spec, parse error) tuples, e.g. from read_specs()
+            out: Text stream receiving one JSON result per line:
+                {'line', 'success', 'order' (or 'params' in dry runs), 'error'}
+
+        Returns:
+            Counts (read, valid, rejected, placed, failed, requests),
+            elapsed seconds and orders_per_second
+        """
+        start = time.perf_counter()
+        group: List[Tuple[int, Dict[str, Any]]] = []
+        pending = set()
+        max_pending = self.concurrency * 2
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='Bulk') as pool:
+            for line, spec, error in specs:
+                self.stats['read'] += 1
+                code = None
+                if error is None:
+                    try:
+                        params = self.validate(spec)
+                    except (ValueError, TypeError, AttributeError) as e:
+                        error = str(e)
+                    except Exception as e:
+                        # Loading the symbol filters failed (API or network
+                        # error); reject this line and keep going
+                        code, error = getattr(e, 'code', None), getattr(e, 'message', str(e))
+                if error is not None:
+                    self.stats['rejected'] += 1
+                    self._write(out, {'line': line, 'success': False, 'order': None,
+                                      'error': {'code': code, 'msg': error}})
+                    continue
+
+                self.stats['valid'] += 1
+                if self.dry_run:
+                    self._write(out, {'line': line, 'success': True, 'params': params, 'error': None})
+                    continue
+
+                group.append((line, spec))
+                if len(group) == BATCH_ORDER_LIMIT:
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self._collect(done, out)
+                    pending.add(pool.submit(self._send, group))
+                    group = []
+
+            if group:
+                pending.add(pool.submit(self._send, group))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                self._collect(done, out)
+
+        elapsed = time.perf_counter() - start
+        summary = dict(self.stats)
+        summary['elapsed'] = elapsed
+        summary['orders_per_second'] = (summary['valid'] if self.dry_run else summary['placed']) / elapsed if elapsed else 0.0
+        logger.info(
+            "Bulk %s: %s read, %s rejected, %s placed, %s failed in %.2fs",
+            'dry run' if self.dry_run else 'submit', summary['read'], summary['rejected'],
+            summary['placed'], summary['failed'], elapsed
+        )
+        return summary
+
+    def _send(self, group: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Place one chunk; returns result lines in input order"""
+        try:
+            results = self.bot.place_orders_batch([spec for _, spec in group])
+        except Exception as e:
+            error = {'code': getattr(e, 'code', None), 'msg': getattr(e, 'message', str(e))}
+            results = [{'success': False, 'order': None, 'error': error} for _ in group]
+        return [
+            {'line': line, 'success': result['success'], 'order': result['order'], 'error': result['error']}
+            for (line, _), result in zip(group, results)
+        ]
+
+    def _collect(self, futures, out: IO[str]):
+        for future in futures:
+            self.stats['requests'] += 1
+            for result in future.result():
+                self.stats['placed' if result['success'] else 'failed'] += 1
+                self._write(out, result)
+        out.flush()
+
+    @staticmethod
+    def _write(out: IO[str], result: Dict[str, Any]):
+        out.write(json.dumps(result, separators=(',', ':')) + '\n')
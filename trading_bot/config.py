@@ -21,6 +21,96 @@ class Config:
     # Binance URLs
     TESTNET_BASE_URL = 'https://testnet.binancefuture.com'
     MAINNET_BASE_URL = 'https://fapi.binance.com'
+    TESTNET_WS_URL = 'wss://stream.binancefuture.com'
+    MAINNET_WS_URL = 'wss://fstream.binance.com'
+    
+    # Point the bot at another endpoint, e.g. a local fake exchange
+    # (python -m trading_bot.fake_exchange); empty uses the URLs above
+    BASE_URL_OVERRIDE = os.getenv('BINANCE_BASE_URL', '').rstrip('/')
+    WS_URL_OVERRIDE = os.getenv('BINANCE_WS_URL', '').rstrip('/')
+    
+    # Logging
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
+    LOG_ASYNC = os.getenv('LOG_ASYNC', 'False').lower() == 'true'
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+    LOG_JSON = os.getenv('LOG_JSON', 'False').lower() == 'true'
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', '0'))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    
+    # HTTP connection pool (AsyncBasicBot)
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '100'))
+    HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+    
+    # Max concurrent batchOrders requests (BasicBot)
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '10'))
+    
+    # Retries of transient failures (timeouts, 5xx, 429) with full-jitter
+    # exponential backoff; orders are resubmitted only after a lookup by
+    # their client order ID shows the exchange never received them
+    RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', '3'))
+    RETRY_BACKOFF = float(os.getenv('RETRY_BACKOFF', '0.2'))
+    RETRY_MAX_BACKOFF = float(os.getenv('RETRY_MAX_BACKOFF', '2'))
+    CLIENT_ORDER_ID_PREFIX = os.getenv('CLIENT_ORDER_ID_PREFIX', 'tb')
+    
+    # Hedged reads (open orders, positions, balance): send a duplicate
+    # request once the first is slower than this percentile of the
+    # endpoint's successful latencies since start (HEDGE_DELAY seconds
+    # until there is enough history)
+    HEDGE_READS = os.getenv('HEDGE_READS', 'True').lower() == 'true'
+    HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '95'))
+    HEDGE_DELAY = float(os.getenv('HEDGE_DELAY', '0.5'))
+    
+    # Fast start: build the client and test the connection on first use
+    FAST_START = os.getenv('FAST_START', 'False').lower() == 'true'
+    CONNECTIVITY_CACHE_PATH = os.getenv('CONNECTIVITY_CACHE_PATH', '.cache/connectivity.json')
+    CONNECTIVITY_CACHE_TTL = float(os.getenv('CONNECTIVITY_CACHE_TTL', '300'))
+    
+    # User-data stream: max age (seconds) of the account mirror before
+    # read methods fall back to REST
+    USER_STREAM_MAX_STALENESS = float(os.getenv('USER_STREAM_MAX_STALENESS', '60'))
+    LISTEN_KEY_KEEPALIVE = float(os.getenv('LISTEN_KEY_KEEPALIVE', '1800'))
+    
+    # Account/position/open-order snapshot reuse window (seconds)
+    ACCOUNT_SNAPSHOT_TTL = float(os.getenv('ACCOUNT_SNAPSHOT_TTL', '2'))
+    
+    # Fraction of the exchange rate limits the client-side limiter uses
+    RATE_LIMIT_SAFETY = float(os.getenv('RATE_LIMIT_SAFETY', '0.9'))
+    
+    # exchangeInfo symbol filter cache
+    SYMBOL_FILTERS = os.getenv('SYMBOL_FILTERS', 'True').lower() == 'true'
+    SYMBOL_CACHE_PATH = os.getenv('SYMBOL_CACHE_PATH', '.cache/exchange_info.json')
+    SYMBOL_CACHE_TTL = float(os.getenv('SYMBOL_CACHE_TTL', '3600'))
+    
+    # Local order/fill history (SQLite, see trading_bot/history.py)
+    ORDER_HISTORY = os.getenv('ORDER_HISTORY', 'True').lower() == 'true'
+    ORDER_HISTORY_PATH = os.getenv('ORDER_HISTORY_PATH', '.cache/history.db')
+    
+    # Multi-account profiles (trading_bot/accounts.py): a JSON file, or
+    # BINANCE_ACCOUNTS=main,sub1 with BINANCE_API_KEY_<NAME>/BINANCE_API_SECRET_<NAME>
+    ACCOUNTS_PATH = os.getenv('ACCOUNTS_PATH', 'accounts.json')
+    ACCOUNTS = os.getenv('BINANCE_ACCOUNTS', '')
+    
+    # Downloaded klines (python -m trading_bot.klines)
+    KLINE_STORE_PATH = os.getenv('KLINE_STORE_PATH', 'data/klines')
+    
+    # Prometheus metrics endpoint (0 disables)
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    
+    # Live dashboard max frames per second
+    DASHBOARD_FPS = float(os.getenv('DASHBOARD_FPS', '4'))
+    
+    # Local order books: max age (seconds) of a book used for fill
+    # estimates, and the slippage (bps vs mid) above which market orders
+    # are rejected (0 = estimate and log only)
+    ORDER_BOOK_MAX_STALENESS = float(os.getenv('ORDER_BOOK_MAX_STALENESS', '5'))
+    MAX_SLIPPAGE_BPS = float(os.getenv('MAX_SLIPPAGE_BPS', '0'))
+    
+    # Streaming PnL engine: asset backing cross positions, and the
+    # maintenance margin rate used when leverage brackets are unavailable
+    PNL_MARGIN_ASSET = os.getenv('PNL_MARGIN_ASSET', 'USDT')
+    PNL_MAINT_MARGIN_RATE = float(os.getenv('PNL_MAINT_MARGIN_RATE', '0.004'))
     
     @classmethod
     def validate(cls):
@@ -40,6 +130,17 @@ class Config:
         return True
     
     @classmethod
-    def get_base_url(cls):
-        """Get the appropriate base URL"""
-        return cls.TESTNET_BASE_URL if cls.TESTNET else cls.MAINNET_BASE_URL
+    def get_base_url(cls, testnet=None):
+        """Get the appropriate REST base URL"""
+        if cls.BASE_URL_OVERRIDE:
+            return cls.BASE_URL_OVERRIDE
+        testnet = cls.TESTNET if testnet is None else testnet
+        return cls.TESTNET_BASE_URL if testnet else cls.MAINNET_BASE_URL
+    
+    @classmethod
+    def get_ws_url(cls, testnet=None):
+        """Get the appropriate WebSocket stream base URL"""
+        if cls.WS_URL_OVERRIDE:
+            return cls.WS_URL_OVERRIDE
+        testnet = cls.TESTNET if testnet is None else testnet
+        return cls.TESTNET_WS_URL if testnet else cls.MAINNET_WS_URL
@@ -0,0 +1,368 @@
+"""
+Live account dashboard
+
+Shows balances, positions with live PnL, and open orders in one
+rich.live screen. The data is pushed, not polled: the user-data stream
+keeps BasicBot's account mirror current and the streaming PnL engine
+revalues positions on every mark price. Only orders and positions that
+changed since the last frame are reformatted, frames are drawn at most
+`refresh_per_second` times a second and only when something changed,
+and open orders are paged so a frame never holds more rows than fit on
+screen, however many orders are open.
+
+Keys: n / p (or space / b) next / previous page, g first page, q quit.
+"""
+import bisect
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from rich import box
+from rich.console import Console, Group
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+from .logger import logger
+from .models import Order
+from .orders import format_decimal, format_number, format_percent
+
+# Rows used by everything except the open-order rows (header, positions
+# frame, table borders, footer)
+CHROME_ROWS = 16
+
+
+class _KeyReader:
+    """Read single key presses without echo (POSIX terminals; otherwise no keys)"""
+
+    def __init__(self):
+        self._saved = None
+        self._tty = sys.stdin.isatty()
+
+    def __enter__(self) -> "_KeyReader":
+        if self._tty:
+            try:
+                import termios
+                import tty
+                self._saved = termios.tcgetattr(sys.stdin)
+                tty.setcbreak(sys.stdin.fileno())
+            except (ImportError, OSError):
+                self._tty = False
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._saved is not None:
+            import termios
+            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self._saved)
+
+    def read(self, timeout: float) -> Optional[str]:
+        """Wait up to timeout seconds for a key"""
+        if not self._tty:
+            time.sleep(timeout)
+            return None
+        import select
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        return sys.stdin.read(1) if ready else None
+
+
+def _color(value: float, text: str) -> str:
+    color = "green" if value >= 0 else "red"
+    return f"[{color}]{text}[/{color}]"
+
+
+class Dashboard:
+    """
+    rich.live view of an account mirror
+
+    Change notifications from the mirror and the PnL engine only
+    mark orders/positions dirty; the UI thread reformats the dirty rows
+    into cached cell tuples before drawing a frame, and draws only the
+    visible page of orders.
+    """
+
+    def __init__(
+        self,
+        bot,
+        refresh_per_second: float = 4.0,
+        page_size: Optional[int] = None,
+        symbol: Optional[str] = None,
+        console: Optional[Console] = None
+    ):
+        """
+        Initialize the dashboard
+
+        Args:
+            bot: Connected BasicBot (its user-data stream is started if needed)
+            refresh_per_second: Max frames per second
+            page_size: Order rows per page (default: what fits the terminal)
+            symbol: Only show orders and positions for this symbol
+            console: Console to draw on (default: a new one)
+        """
+        self.bot = bot
+        self.refresh_per_second = refresh_per_second
+        self.page_size = page_size
+        self.symbol = symbol.upper() if symbol else None
+        self.console = console or Console()
+        self.page = 0
+        self.frames = 0
+        self.changes = 0
+        self.render_time = 0.0
+
+        self._lock = threading.Lock()
+        self._dirty_orders: Set[int] = set()
+        self._positions_dirty = True
+        self._account_dirty = True
+        self._full_sync = True
+        self._changed = threading.Event()
+
+        self._order_rows: Dict[int, Tuple[str, ...]] = {}
+        self._order_keys: List[Tuple[str, int]] = []  # (symbol, orderId), sorted
+        self._position_rows: List[Tuple[str, ...]] = []
+        self._balance_rows: List[Tuple[str, ...]] = []
+        self._unrealized = 0.0
+        self._margin_ratio = float('inf')
+        self._running = False
+        self._owns_pnl = False  # Whether start() started the PnL engine
+
+    @property
+    def mirror(self):
+        return self.bot.user_stream.mirror
+
+    @property
+    def engine(self):
+        return self.bot.pnl_stream.engine
+
+    def start(self):
+        """Start the user-data stream and the PnL engine and subscribe to changes"""
+        self.bot.start_user_stream()
+        self.mirror.on_change = self._on_change
+        self._owns_pnl = self.bot.pnl_stream is None
+        self.bot.start_pnl_stream()
+        self.engine.on_update = self._on_pnl
+        self._on_change('snapshot', None)
+
+    def stop(self):
+        """
+        Unsubscribe and stop the PnL engine if start() started it
+
+        The user-data stream keeps running, as does a PnL engine that was
+        already running before start().
+        """
+        self._running = False
+        if self.bot.user_stream is not None:
+            self.mirror.on_change = None
+        if self.bot.pnl_stream is not None:
+            self.engine.on_update = None
+            if self._owns_pnl:
+                self.bot.stop_pnl_stream()
+        self._owns_pnl = False
+
+    def _on_change(self, kind: str, key: Any):
+        with self._lock:
+            self.changes += 1
+            if kind == 'order':
+                self._dirty_orders.add(key)
+            elif kind == 'position':
+                self._positions_dirty = True
+            elif kind == 'account':
+                self._account_dirty = True
+            else:
+                self._full_sync = True
+        self._changed.set()
+
+    def _on_pnl(self):
+        with self._lock:
+            self._positions_dirty = True
+        self._changed.set()
+
+    # Row caches
+
+    def _apply_changes(self):
+        """Reformat the rows that changed since the last frame"""
+        with self._lock:
+            full, self._full_sync = self._full_sync, False
+            dirty_orders, self._dirty_orders = self._dirty_orders, set()
+            positions_dirty, self._positions_dirty = self._positions_dirty, False
+            account_dirty, self._account_dirty = self._account_dirty, False
+            self._changed.clear()
+
+        if full:
+            orders = self.mirror.get_orders(self.symbol)
+            self._order_rows = {o.order_id: self._format_order(o) for o in orders}
+            self._order_keys = sorted((o.symbol, o.order_id) for o in orders)
+            positions_dirty = account_dirty = True
+        else:
+            for order_id in dirty_orders:
+                order = self.mirror.get_order(order_id)
+                if order is not None and self.symbol and order.symbol != self.symbol:
+                    continue
+                known = order_id in self._order_rows
+                if order is None:
+                    if known:
+                        row = self._order_rows.pop(order_id)
+                        index = bisect.bisect_left(self._order_keys, (row[1], order_id))
+                        del self._order_keys[index]
+                    continue
+                self._order_rows[order_id] = self._format_order(order)
+                if not known:
+                    bisect.insort(self._order_keys, (order.symbol, order_id))
+
+        if positions_dirty:
+            self._format_positions()
+        if account_dirty or positions_dirty:
+            self._format_balances()
+
+    @staticmethod
+    def _format_order(order: Order) -> Tuple[str, ...]:
+        side_color = "green" if order.side == 'BUY' else "red"
+        updated = datetime.fromtimestamp(order.update_time / 1000).strftime('%H:%M:%S')
+        return (
+            str(order.order_id),
+            order.symbol,
+            f"[{side_color}]{order.side}[/{side_color}]",
+            order.type,
+            format_number(order.price or order.stop_price),
+            f"{format_number(order.executed_qty)}/{format_number(order.orig_qty)}",
+            order.status,
+            updated,
+        )
+
+    def _format_positions(self):
+        rows = []
+        unrealized = 0.0
+        for pos in self.engine.snapshot(self.symbol):
+            unrealized += pos.unrealized_profit
+            rows.append((
+                pos.symbol,
+                "LONG" if pos.position_amt > 0 else "SHORT",
+                format_number(pos.position_amt),
+                format_number(pos.entry_price),
+                format_number(pos.mark_price),
+                _color(pos.unrealized_profit, f"{pos.unrealized_profit:,.2f}"),
+                format_decimal(pos.liquidation_price, 7) if pos.liquidation_price else "-",
+                format_percent(pos.liquidation_distance),
+            ))
+        self._position_rows = rows
+        self._unrealized = unrealized
+        self._margin_ratio = self.engine.totals()['margin_ratio']
+
+    def _format_balances(self):
+        rows = []
+        for asset in self.mirror.get_account().get('assets', []):
+            wallet = float(asset.get('walletBalance', 0))
+            if not wallet:
+                continue
+            rows.append((asset['asset'], f"{wallet:,.4f}", f"{float(asset.get('availableBalance', 0)):,.4f}"))
+        self._balance_rows = rows
+
+    # Rendering
+
+    def _rows_per_page(self) -> int:
+        if self.page_size:
+            return self.page_size
+        return max(5, self.console.size.height - CHROME_ROWS - len(self._position_rows) - len(self._balance_rows))
+
+    def render(self):
+        """Apply pending changes and build the current frame"""
+        start = time.perf_counter()
+        self._apply_changes()
+
+        balances = Table(box=box.SIMPLE, show_header=True, header_style="bold magenta", expand=True)
+        balances.add_column("Asset", style="cyan")
+        balances.add_column("Wallet", justify="right")
+        balances.add_column("Available", style="green", justify="right")
+        for row in self._balance_rows:
+            balances.add_row(*row)
+        summary = Text.from_markup(
+            f"Unrealized PnL: {_color(self._unrealized, f'{self._unrealized:,.2f}')}   "
+            f"Margin ratio: {format_percent(self._margin_ratio)}   "
+            f"Positions: {len(self._position_rows)}   Open orders: {len(self._order_keys)}"
+        )
+
+        positions = Table(box=box.SIMPLE, show_header=True, header_style="bold magenta", expand=True)
+        for name, justify in (("Symbol", "left"), ("Side", "left"), ("Amount", "right"),
+                              ("Entry", "right"), ("Mark", "right"), ("Unrealized PnL", "right"),
+                              ("Liq. Price", "right"), ("Liq. Dist", "right")):
+            positions.add_column(name, justify=justify)
+        for row in self._position_rows:
+            positions.add_row(*row)
+        if not self._position_rows:
+            positions.add_row("[dim]No open positions[/dim]", "", "", "", "", "", "", "")
+
+        per_page = self._rows_per_page()
+        pages = max(1, -(-len(self._order_keys) // per_page))
+        self.page = min(self.page, pages - 1)
+        first = self.page * per_page
+        visible = self._order_keys[first:first + per_page]
+
+        orders = Table(box=box.SIMPLE, show_header=True, header_style="bold magenta", expand=True)
+        for name, justify in (("Order ID", "left"), ("Symbol", "left"), ("Side", "left"), ("Type", "left"),
+                              ("Price", "right"), ("Filled/Qty", "right"), ("Status", "left"), ("Updated", "right")):
+            orders.add_column(name, justify=justify)
+        for _, order_id in visible:
+            orders.add_row(*self._order_rows[order_id])
+        if not visible:
+            orders.add_row("[dim]No open orders[/dim]", "", "", "", "", "", "", "")
+
+        stream_ok = self.bot.user_stream is not None and self.bot.user_stream.is_fresh(self.bot.max_staleness)
+        shown = f"{first + 1}-{first + len(visible)}" if visible else "0"
+        footer = Text.from_markup(
+            f"[dim]Orders {shown} of {len(self._order_keys)} · page {self.page + 1}/{pages} · "
+            f"n/p page · q quit · stream {'[green]live[/green]' if stream_ok else '[red]stale[/red]'} · "
+            f"{self.changes} updates · frame {self.render_time * 1000:.1f}ms[/dim]"
+        )
+
+        frame = Group(
+            Panel(Group(balances, summary), title="[bold]Account[/bold]", border_style="cyan"),
+            Panel(positions, title="[bold]Positions[/bold]", border_style="cyan"),
+            Panel(orders, title="[bold]Open Orders[/bold]", border_style="cyan"),
+            footer,
+        )
+        self.render_time = time.perf_counter() - start
+        self.frames += 1
+        return frame
+
+    def handle_key(self, key: str):
+        """Apply a key press (paging / quit)"""
+        if key in ('n', ' ', 'j'):
+            self.page += 1
+        elif key in ('p', 'b', 'k'):
+            self.page = max(0, self.page - 1)
+        elif key == 'g':
+            self.page = 0
+        elif key in ('q', 'Q', '\x1b'):
+            self._running = False
+        self._changed.set()
+
+    def run(self, duration: Optional[float] = None):
+        """
+        Show the dashboard until 'q', Ctrl+C or the duration elapses
+
+        Args:
+            duration: Seconds to run (default: until quit)
+        """
+        from rich.live import Live
+
+        self.start()
+        self._running = True
+        interval = 1.0 / self.refresh_per_second
+        deadline = time.monotonic() + duration if duration else None
+        try:
+            with _KeyReader() as keys, Live(self.render(), console=self.console, auto_refresh=False,
+                                             screen=self.console.is_terminal) as live:
+                while self._running and (deadline is None or time.monotonic() < deadline):
+                    frame_start = time.monotonic()
+                    key = keys.read(interval)
+                    if key:
+                        self.handle_key(key)
+                    if self._changed.is_set():
+                        live.update(self.render(), refresh=True)
+                        # Cap the frame rate even when keys or updates keep arriving
+                        spare = interval - (time.monotonic() - frame_start)
+                        if spare > 0:
+                            time.sleep(spare)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            logger.info("Dashboard closed after %s frame(s), %s update(s)", self.frames, self.changes)
@@ -0,0 +1,48 @@
+"""
+Binance exception classes, imported on first use
+
+`import binance.exceptions` first runs binance/__init__.py, which pulls in
+the sync and async clients, websockets and dateparser (~0.7s). The
+exception names of this module are resolved on first attribute access
+(PEP 562), so importing the bot costs nothing until a client is built or
+an error is raised or handled. Refer to them through the module, e.g.
+
+    from . import exceptions
+    ...
+    except exceptions.BinanceAPIException as e:
+
+since `from .exceptions import BinanceAPIException` resolves the name (and
+imports the SDK) at import time. An `except` clause is only evaluated when
+an exception reaches it.
+
+Use load_client_class() to import the SDK client on first real use.
+"""
+import importlib
+
+_NAMES = ('BinanceAPIException', 'BinanceRequestException', 'BinanceOrderException')
+
+
+def _import(name: str):
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        raise ImportError("python-binance is not installed. Run: pip install -r requirements.txt") from e
+
+
+def __getattr__(name: str):
+    if name not in _NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = _import('binance.exceptions')
+    for attr in _NAMES:
+        globals()[attr] = getattr(module, attr)
+    return globals()[name]
+
+
+def load_client_class():
+    """
+    Import binance.client.Client on first use
+
+    Returns:
+        The python-binance Client class
+    """
+    return _import('binance.client').Client
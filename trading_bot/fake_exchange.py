@@ -0,0 +1,1313 @@
+"""
+In-process fake Binance Futures exchange for offline load testing
+
+Serves the futures REST endpoints and WebSocket streams the bot uses,
+backed by a price-time-priority matching engine with synthetic maker
+liquidity. Point the bot at it through Config:
+
+    python -m trading_bot.fake_exchange --port 8765 --latency-ms 2
+    BINANCE_BASE_URL=http://127.0.0.1:8765 BINANCE_WS_URL=ws://127.0.0.1:8765 python main.py
+
+or run it inside a test/benchmark process:
+
+    with FakeExchange(latency=0.001, error_rate=0.01) as exchange:
+        os.environ.update(exchange.env())
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import math
+import random
+import secrets
+import socket
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import unquote_plus
+from aiohttp import web, WSMsgType
+from .klines import INTERVAL_MS
+from .orders import format_decimal
+from .ratelimit import DEFAULT_RATE_LIMITS, endpoint_cost
+
+# Symbol specs (filters mirror the real USD-M contracts)
+DEFAULT_SYMBOLS = {
+    'BTCUSDT': {'price': 50000.0, 'tick_size': 0.1, 'step_size': 0.001, 'min_qty': 0.001,
+                'max_qty': 1000.0, 'min_notional': 5.0},
+    'ETHUSDT': {'price': 3000.0, 'tick_size': 0.01, 'step_size': 0.001, 'min_qty': 0.001,
+                'max_qty': 10000.0, 'min_notional': 5.0},
+    'BNBUSDT': {'price': 400.0, 'tick_size': 0.01, 'step_size': 0.01, 'min_qty': 0.01,
+                'max_qty': 100000.0, 'min_notional': 5.0},
+}
+
+# First open time of the synthetic kline history (2020-01-01 UTC)
+KLINE_HISTORY_START = 1_577_836_800_000
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+_EPS = 1e-9
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _is_multiple(value: float, step: float) -> bool:
+    ratio = value / step
+    return abs(ratio - round(ratio)) < 1e-6
+
+
+class FakeExchangeError(Exception):
+    """Binance-style API error ({"code": ..., "msg": ...})"""
+
+    def __init__(self, code: int, msg: str, status: int = 400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+
+def _missing(name: str) -> FakeExchangeError:
+    return FakeExchangeError(-1102, f"Mandatory parameter '{name}' was not sent, was empty/null, or malformed.")
+
+
+class _Order:
+    """One order (user or synthetic maker) inside the engine"""
+
+    __slots__ = (
+        'order_id', 'client_order_id', 'account', 'symbol', 'side', 'type', 'orig_type',
+        'time_in_force', 'price', 'tick', 'stop_price', 'qty', 'executed', 'cum_quote',
+        'status', 'reduce_only', 'time', 'update_time'
+    )
+
+    def __init__(self, order_id, account, symbol, side, order_type, qty, price=0.0, tick=0,
+                 stop_price=0.0, time_in_force='GTC', client_order_id='', reduce_only=False):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.account = account
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.orig_type = order_type
+        self.time_in_force = time_in_force
+        self.price = price
+        self.tick = tick
+        self.stop_price = stop_price
+        self.qty = qty
+        self.executed = 0.0
+        self.cum_quote = 0.0
+        self.status = 'NEW'
+        self.reduce_only = reduce_only
+        self.time = self.update_time = _now_ms()
+
+    @property
+    def remaining(self) -> float:
+        return self.qty - self.executed
+
+    def to_dict(self) -> Dict[str, Any]:
+        avg = self.cum_quote / self.executed if self.executed else 0.0
+        return {
+            'orderId': self.order_id,
+            'symbol': self.symbol,
+            'status': self.status,
+            'clientOrderId': self.client_order_id,
+            'price': format_decimal(self.price),
+            'avgPrice': format_decimal(avg),
+            'origQty': format_decimal(self.qty),
+            'executedQty': format_decimal(self.executed),
+            'cumQty': format_decimal(self.executed),
+            'cumQuote': format_decimal(self.cum_quote),
+            'timeInForce': self.time_in_force,
+            'type': self.type,
+            'reduceOnly': self.reduce_only,
+            'closePosition': False,
+            'side': self.side,
+            'positionSide': 'BOTH',
+            'stopPrice': format_decimal(self.stop_price),
+            'workingType': 'CONTRACT_PRICE',
+            'priceProtect': False,
+            'origType': self.orig_type,
+            'time': self.time,
+            'updateTime': self.update_time,
+        }
+
+
+class _Account:
+    """Wallet, one-way positions, orders and trades of one API key"""
+
+    def __init__(self, api_key: str, balance: float):
+        self.api_key = api_key
+        self.balance = balance
+        self.positions: Dict[str, List[float]] = {}  # symbol -> [amount, entry price]
+        self.leverage: Dict[str, int] = {}
+        self.open_orders: Dict[int, _Order] = {}
+        self.open_client_ids: Dict[str, _Order] = {}
+        self.orders: Dict[int, _Order] = {}
+        self.trades: List[Dict[str, Any]] = []
+        self.listen_key: Optional[str] = None
+
+    def track(self, order: _Order):
+        self.open_orders[order.order_id] = order
+        self.open_client_ids[order.client_order_id] = order
+
+    def untrack(self, order: _Order):
+        self.open_orders.pop(order.order_id, None)
+        if self.open_client_ids.get(order.client_order_id) is order:
+            del self.open_client_ids[order.client_order_id]
+
+
+class _Book:
+    """Price-time-priority book for one symbol: FIFO queues keyed by integer ticks"""
+
+    def __init__(self, symbol: str, spec: Dict[str, float]):
+        self.symbol = symbol
+        self.tick_size = spec['tick_size']
+        self.step_size = spec['step_size']
+        self.min_qty = spec['min_qty']
+        self.max_qty = spec['max_qty']
+        self.min_notional = spec['min_notional']
+        self.ref_tick = round(spec['price'] / self.tick_size)
+        self.base_price = spec['price']
+        self.last_price = spec['price']
+        self.levels: Tuple[Dict[int, deque], Dict[int, deque]] = ({}, {})  # (asks, bids)
+        self.ticks: Tuple[List[int], List[int]] = ([], [])  # ascending
+        self.stops: List[_Order] = []
+        self.update_id = 1
+        self.flushed_id = 1
+        self.dirty = set()
+        self.trade_id = 0
+
+    def price(self, tick: int) -> float:
+        return round(tick * self.tick_size, 10)
+
+    def best(self, is_bid: bool) -> Optional[int]:
+        ticks = self.ticks[is_bid]
+        if not ticks:
+            return None
+        return ticks[-1] if is_bid else ticks[0]
+
+    def level_qty(self, is_bid: bool, tick: int) -> float:
+        queue = self.levels[is_bid].get(tick)
+        return sum(o.remaining for o in queue) if queue else 0.0
+
+    def add(self, order: _Order):
+        is_bid = order.side == 'BUY'
+        queue = self.levels[is_bid].get(order.tick)
+        if queue is None:
+            queue = self.levels[is_bid][order.tick] = deque()
+            insort(self.ticks[is_bid], order.tick)
+        queue.append(order)
+        self.touch(is_bid, order.tick)
+
+    def remove(self, order: _Order):
+        is_bid = order.side == 'BUY'
+        queue = self.levels[is_bid].get(order.tick)
+        if queue is None:
+            return
+        try:
+            queue.remove(order)
+        except ValueError:
+            return
+        if not queue:
+            self.drop_level(is_bid, order.tick)
+        self.touch(is_bid, order.tick)
+
+    def drop_level(self, is_bid: bool, tick: int):
+        del self.levels[is_bid][tick]
+        ticks = self.ticks[is_bid]
+        del ticks[bisect_left(ticks, tick)]
+
+    def touch(self, is_bid: bool, tick: int):
+        self.update_id += 1
+        self.dirty.add((is_bid, tick))
+
+    def mark_price(self) -> float:
+        bid, ask = self.best(True), self.best(False)
+        if bid is None or ask is None:
+            return self.last_price
+        return self.price(bid + ask) / 2
+
+    def depth(self, limit: int) -> Dict[str, Any]:
+        bids = [[format_decimal(self.price(t)), format_decimal(self.level_qty(True, t))]
+                for t in reversed(self.ticks[True][-limit:])]
+        asks = [[format_decimal(self.price(t)), format_decimal(self.level_qty(False, t))]
+                for t in self.ticks[False][:limit]]
+        now = _now_ms()
+        return {'lastUpdateId': self.update_id, 'E': now, 'T': now, 'bids': bids, 'asks': asks}
+
+    def flush_depth(self) -> Optional[Dict[str, Any]]:
+        """Build a depthUpdate event for the levels changed since the last flush"""
+        if not self.dirty:
+            return None
+        bids, asks = [], []
+        for is_bid, tick in self.dirty:
+            level = [format_decimal(self.price(tick)), format_decimal(self.level_qty(is_bid, tick))]
+            (bids if is_bid else asks).append(level)
+        self.dirty.clear()
+        now = _now_ms()
+        event = {
+            'e': 'depthUpdate', 'E': now, 'T': now, 's': self.symbol,
+            'U': self.flushed_id + 1, 'u': self.update_id, 'pu': self.flushed_id,
+            'b': bids, 'a': asks,
+        }
+        self.flushed_id = self.update_id
+        return event
+
+
+class MatchingEngine:
+    """
+    Price-time-priority matching engine with synthetic maker liquidity
+
+    Each symbol's book is seeded with a ladder of maker orders around a
+    reference price, refilled after every match, so market orders always
+    find liquidity and move the price. User orders rest in the same FIFO
+    queues and trade against each other and the makers. Supports MARKET,
+    LIMIT (GTC/IOC/FOK/GTX), STOP and STOP_MARKET orders, reduce-only
+    orders and one-way positions with fees and realized PnL.
+
+    The engine is synchronous and single-threaded; FakeExchange drives it
+    from its event loop. Events (user-data and aggTrade) are passed to
+    on_event(key, payload), where key is ('user', api_key) or
+    ('aggTrade', symbol).
+    """
+
+    def __init__(
+        self,
+        symbols: Optional[Dict[str, Dict[str, float]]] = None,
+        maker_levels: int = 20,
+        maker_qty: float = 5.0,
+        starting_balance: float = 10000.0,
+        maker_fee: float = 0.0002,
+        taker_fee: float = 0.0004,
+        leverage: int = 20,
+        seed: Optional[int] = None,
+        rate_limits: Optional[List[Dict[str, Any]]] = None,
+        on_event: Optional[Callable[[Tuple[str, str], Dict[str, Any]], None]] = None
+    ):
+        """
+        Initialize the engine
+
+        Args:
+            symbols: Symbol -> {'price', 'tick_size', 'step_size', 'min_qty',
+                'max_qty', 'min_notional'} (default: DEFAULT_SYMBOLS)
+            maker_levels: Synthetic maker price levels kept on each side
+            maker_qty: Quantity of each synthetic maker level
+            starting_balance: USDT wallet balance of new accounts
+            maker_fee: Maker commission rate
+            taker_fee: Taker commission rate
+            leverage: Default leverage reported for positions
+            seed: Random seed for price drift
+            rate_limits: exchangeInfo rateLimits advertised and enforced
+                (default: the Binance futures limits)
+            on_event: Callback for user-data and trade events
+        """
+        self.books = {symbol: _Book(symbol, spec) for symbol, spec in (symbols or DEFAULT_SYMBOLS).items()}
+        self.maker_levels = maker_levels
+        self.maker_qty = maker_qty
+        self.starting_balance = starting_balance
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.default_leverage = leverage
+        self.rate_limits = rate_limits or DEFAULT_RATE_LIMITS
+        self.on_event = on_event
+        self.accounts: Dict[str, _Account] = {}
+        self.listen_keys: Dict[str, str] = {}
+        self.random = random.Random(seed)
+        self._order_ids = 0
+        for book in self.books.values():
+            self._replenish(book)
+
+    # Accounts and lookups
+
+    def account(self, api_key: str) -> _Account:
+        account = self.accounts.get(api_key)
+        if account is None:
+            account = self.accounts[api_key] = _Account(api_key, self.starting_balance)
+        return account
+
+    def book(self, symbol: Optional[str]) -> _Book:
+        if not symbol:
+            raise _missing('symbol')
+        book = self.books.get(symbol.upper())
+        if book is None:
+            raise FakeExchangeError(-1121, "Invalid symbol.")
+        return book
+
+    def _next_order_id(self) -> int:
+        self._order_ids += 1
+        return self._order_ids
+
+    def _emit(self, key: Tuple[str, str], payload: Dict[str, Any]):
+        if self.on_event is not None:
+            self.on_event(key, payload)
+
+    # Orders
+
+    def place(self, api_key: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate and submit an order (POST /fapi/v1/order parameters)
+
+        Returns:
+            The order as returned by the REST API
+        """
+        account = self.account(api_key)
+        book = self.book(params.get('symbol'))
+        side = str(params.get('side', '')).upper()
+        if side not in ('BUY', 'SELL'):
+            raise FakeExchangeError(-1117, "Invalid side.")
+        order_type = str(params.get('type', '')).upper()
+        if order_type not in ('MARKET', 'LIMIT', 'STOP', 'STOP_MARKET'):
+            raise FakeExchangeError(-1116, "Invalid orderType.")
+
+        qty = self._float(params, 'quantity')
+        if qty <= 0:
+            raise FakeExchangeError(-4003, "Quantity less than or equal to zero.")
+        if not _is_multiple(qty, book.step_size):
+            raise FakeExchangeError(-1111, "Precision is over the maximum defined for this asset.")
+        if qty < book.min_qty - _EPS or qty > book.max_qty + _EPS:
+            raise FakeExchangeError(-1013, "Filter failure: LOT_SIZE")
+
+        price, tick = 0.0, 0
+        if order_type in ('LIMIT', 'STOP'):
+            price = self._float(params, 'price')
+            if price <= 0 or not _is_multiple(price, book.tick_size):
+                raise FakeExchangeError(-4014, "Price not increased by tick size.")
+            tick = round(price / book.tick_size)
+        time_in_force = str(params.get('timeInForce') or 'GTC').upper()
+        if order_type in ('LIMIT', 'STOP') and time_in_force not in ('GTC', 'IOC', 'FOK', 'GTX'):
+            raise FakeExchangeError(-1115, "Invalid timeInForce.")
+
+        reduce_only = str(params.get('reduceOnly', 'false')).lower() == 'true'
+        if not reduce_only:
+            notional = qty * (price or book.mark_price())
+            if notional < book.min_notional - _EPS:
+                raise FakeExchangeError(
+                    -4164,
+                    f"Order's notional must be no smaller than {format_decimal(book.min_notional)} "
+                    f"(unless you choose reduce only)."
+                )
+
+        stop_price = 0.0
+        if order_type in ('STOP', 'STOP_MARKET'):
+            stop_price = self._float(params, 'stopPrice')
+            if (side == 'BUY' and book.last_price >= stop_price) or (side == 'SELL' and book.last_price <= stop_price):
+                raise FakeExchangeError(-2021, "Order would immediately trigger.")
+
+        client_order_id = params.get('newClientOrderId') or f"fake_{secrets.token_hex(8)}"
+        if client_order_id in account.open_client_ids:
+            raise FakeExchangeError(-4116, "ClientOrderId is duplicated.")
+
+        if reduce_only:
+            amount = account.positions.get(book.symbol, [0.0, 0.0])[0]
+            closable = -amount if side == 'BUY' else amount
+            if closable <= _EPS:
+                raise FakeExchangeError(-2022, "ReduceOnly Order is rejected.")
+            qty = min(qty, closable)
+
+        order = _Order(
+            self._next_order_id(), account, book.symbol, side, order_type, qty, price, tick,
+            stop_price, time_in_force if order_type in ('LIMIT', 'STOP') else 'GTC',
+            client_order_id, reduce_only
+        )
+        account.orders[order.order_id] = order
+
+        if order_type in ('STOP', 'STOP_MARKET'):
+            account.track(order)
+            book.stops.append(order)
+            self._order_event(order, 'NEW')
+            return order.to_dict()
+
+        self._execute(book, order)
+        return order.to_dict()
+
+    @staticmethod
+    def _float(params: Dict[str, Any], name: str) -> float:
+        value = params.get(name)
+        if value in (None, ''):
+            raise _missing(name)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise FakeExchangeError(-1100, f"Illegal characters found in parameter '{name}'.")
+
+    def _execute(self, book: _Book, order: _Order):
+        """Match an incoming (or triggered) order, then rest or expire the remainder"""
+        account = order.account
+        if order.type == 'LIMIT' and order.time_in_force == 'GTX' and self._crosses(book, order):
+            order.status = 'EXPIRED'
+            self._order_event(order, 'EXPIRED')
+            return
+        if order.type == 'LIMIT' and order.time_in_force == 'FOK' and self._available(book, order) < order.qty - _EPS:
+            order.status = 'EXPIRED'
+            self._order_event(order, 'EXPIRED')
+            return
+
+        if account is not None:
+            account.track(order)
+            self._order_event(order, 'NEW')
+        self._match(book, order)
+
+        if order.remaining > _EPS:
+            if order.type == 'LIMIT' and order.time_in_force == 'GTC':
+                book.add(order)
+            else:
+                order.status = 'EXPIRED'
+                if account is not None:
+                    account.untrack(order)
+                    self._order_event(order, 'EXPIRED')
+        self._replenish(book)
+        self._check_stops(book)
+
+    def _crosses(self, book: _Book, order: _Order) -> bool:
+        best = book.best(order.side == 'SELL')
+        if best is None:
+            return False
+        return best <= order.tick if order.side == 'BUY' else best >= order.tick
+
+    def _available(self, book: _Book, order: _Order) -> float:
+        is_bid = order.side == 'SELL'
+        ticks = book.ticks[is_bid]
+        crossing = [t for t in ticks if (t <= order.tick if order.side == 'BUY' else t >= order.tick)]
+        return sum(book.level_qty(is_bid, t) for t in crossing)
+
+    def _match(self, book: _Book, taker: _Order):
+        is_bid = taker.side == 'SELL'  # side of the book being taken
+        levels = book.levels[is_bid]
+        while taker.remaining > _EPS:
+            best = book.best(is_bid)
+            if best is None:
+                break
+            if taker.type == 'LIMIT' and (best > taker.tick if taker.side == 'BUY' else best < taker.tick):
+                break
+            queue = levels[best]
+            maker = queue[0]
+            qty = min(taker.remaining, maker.remaining)
+            price = book.price(best)
+            self._fill(book, maker, price, qty, is_maker=True)
+            self._fill(book, taker, price, qty, is_maker=False)
+            book.trade_id += 1
+            book.last_price = price
+            book.ref_tick = best
+            self._emit(('aggTrade', book.symbol), {
+                'e': 'aggTrade', 'E': _now_ms(), 's': book.symbol, 'a': book.trade_id,
+                'p': format_decimal(price), 'q': format_decimal(qty), 'f': book.trade_id,
+                'l': book.trade_id, 'T': _now_ms(), 'm': taker.side == 'SELL',
+            })
+            if maker.remaining <= _EPS:
+                queue.popleft()
+                if not queue:
+                    book.drop_level(is_bid, best)
+            book.touch(is_bid, best)
+
+    def _fill(self, book: _Book, order: _Order, price: float, qty: float, is_maker: bool):
+        order.executed += qty
+        order.cum_quote += price * qty
+        order.status = 'FILLED' if order.remaining <= _EPS else 'PARTIALLY_FILLED'
+        order.update_time = _now_ms()
+        account = order.account
+        if account is None:
+            return  # Synthetic maker
+
+        # One-way position accounting
+        signed = qty if order.side == 'BUY' else -qty
+        position = account.positions.setdefault(book.symbol, [0.0, 0.0])
+        amount, entry = position
+        realized = 0.0
+        if amount and (amount > 0) != (signed > 0):
+            closed = min(abs(amount), qty)
+            realized = closed * (price - entry) * (1 if amount > 0 else -1)
+        new_amount = amount + signed
+        if abs(new_amount) <= _EPS:
+            position[:] = [0.0, 0.0]
+        elif amount == 0 or (amount > 0) != (new_amount > 0):
+            position[:] = [new_amount, price]
+        elif abs(new_amount) > abs(amount):
+            position[:] = [new_amount, (abs(amount) * entry + qty * price) / abs(new_amount)]
+        else:
+            position[0] = new_amount
+        commission = price * qty * (self.maker_fee if is_maker else self.taker_fee)
+        account.balance += realized - commission
+
+        now = _now_ms()
+        trade = {
+            'symbol': book.symbol, 'id': book.trade_id + 1, 'orderId': order.order_id,
+            'side': order.side, 'price': format_decimal(price), 'qty': format_decimal(qty),
+            'realizedPnl': format_decimal(realized), 'marginAsset': 'USDT',
+            'quoteQty': format_decimal(price * qty), 'commission': format_decimal(commission),
+            'commissionAsset': 'USDT', 'time': now, 'positionSide': 'BOTH',
+            'buyer': order.side == 'BUY', 'maker': is_maker,
+        }
+        account.trades.append(trade)
+        if order.status == 'FILLED':
+            account.untrack(order)
+
+        self._order_event(order, 'TRADE', last_qty=qty, last_price=price, commission=commission,
+                          realized=realized, trade_id=trade['id'], is_maker=is_maker)
+        self._emit(('user', account.api_key), {
+            'e': 'ACCOUNT_UPDATE', 'E': now, 'T': now,
+            'a': {
+                'm': 'ORDER',
+                'B': [{'a': 'USDT', 'wb': format_decimal(account.balance),
+                       'cw': format_decimal(account.balance), 'bc': '0'}],
+                'P': [{
+                    's': book.symbol, 'pa': format_decimal(position[0]), 'ep': format_decimal(position[1]),
+                    'bep': format_decimal(position[1]), 'cr': '0',
+                    'up': format_decimal(position[0] * (book.mark_price() - position[1])),
+                    'mt': 'cross', 'iw': '0', 'ps': 'BOTH',
+                }],
+            },
+        })
+
+    def _order_event(self, order: _Order, execution: str, last_qty: float = 0.0, last_price: float = 0.0,
+                     commission: float = 0.0, realized: float = 0.0, trade_id: int = 0, is_maker: bool = False):
+        if order.account is None:
+            return
+        now = _now_ms()
+        avg = order.cum_quote / order.executed if order.executed else 0.0
+        self._emit(('user', order.account.api_key), {
+            'e': 'ORDER_TRADE_UPDATE', 'E': now, 'T': now,
+            'o': {
+                's': order.symbol, 'c': order.client_order_id, 'S': order.side, 'o': order.type,
+                'f': order.time_in_force, 'q': format_decimal(order.qty), 'p': format_decimal(order.price),
+                'ap': format_decimal(avg), 'sp': format_decimal(order.stop_price), 'x': execution,
+                'X': order.status, 'i': order.order_id, 'l': format_decimal(last_qty),
+                'z': format_decimal(order.executed), 'L': format_decimal(last_price), 'N': 'USDT',
+                'n': format_decimal(commission), 'T': order.update_time, 't': trade_id, 'b': '0',
+                'a': '0', 'm': is_maker, 'R': order.reduce_only, 'wt': 'CONTRACT_PRICE',
+                'ot': order.orig_type, 'ps': 'BOTH', 'cp': False, 'rp': format_decimal(realized),
+            },
+        })
+
+    def _check_stops(self, book: _Book):
+        """Trigger stop orders crossed by the last trade price"""
+        while True:
+            triggered = [
+                o for o in book.stops
+                if (o.side == 'BUY' and book.last_price >= o.stop_price)
+                or (o.side == 'SELL' and book.last_price <= o.stop_price)
+            ]
+            if not triggered:
+                return
+            for order in triggered:
+                book.stops.remove(order)
+            for order in triggered:
+                order.account.untrack(order)
+                order.type = 'LIMIT' if order.orig_type == 'STOP' else 'MARKET'
+                order.update_time = _now_ms()
+                self._execute(book, order)
+
+    def _replenish(self, book: _Book):
+        """Refill the synthetic maker ladder around the reference price"""
+        best_bid, best_ask = book.best(True), book.best(False)
+        for i in range(1, self.maker_levels + 1):
+            tick = book.ref_tick + i
+            if tick not in book.levels[False] and (best_bid is None or tick > best_bid):
+                book.add(_Order(0, None, book.symbol, 'SELL', 'LIMIT', self.maker_qty, book.price(tick), tick))
+            tick = book.ref_tick - i
+            if tick > 0 and tick not in book.levels[True] and (best_ask is None or tick < best_ask):
+                book.add(_Order(0, None, book.symbol, 'BUY', 'LIMIT', self.maker_qty, book.price(tick), tick))
+
+    def drift(self, volatility: float):
+        """
+        Move every symbol's reference price by a random walk step
+
+        Simulates outside flow: maker orders left on the wrong side of the
+        new price are pulled, user orders it crosses are filled against an
+        outside taker, and the maker ladder is rebuilt around the new price.
+        """
+        for book in self.books.values():
+            step = self.random.gauss(0.0, volatility)
+            ref_tick = max(1, round(book.ref_tick * math.exp(step)))
+            if ref_tick == book.ref_tick:
+                continue
+            book.ref_tick = ref_tick
+            for is_bid in (True, False):
+                for tick in list(book.ticks[is_bid]):
+                    if (is_bid and tick < ref_tick) or (not is_bid and tick > ref_tick):
+                        continue
+                    queue = book.levels[is_bid].get(tick)
+                    if queue is None:
+                        continue  # Swept together with a level above
+                    for order in list(queue):
+                        if order.account is None:
+                            book.remove(order)
+                    if tick in book.levels[is_bid]:
+                        # User orders the price moved through trade with outside flow
+                        side = 'SELL' if is_bid else 'BUY'
+                        sweep = _Order(0, None, book.symbol, side, 'LIMIT', book.level_qty(is_bid, tick),
+                                       book.price(tick), tick, time_in_force='IOC')
+                        self._match(book, sweep)
+            book.ref_tick = ref_tick
+            book.last_price = book.price(ref_tick)
+            self._replenish(book)
+            self._check_stops(book)
+
+    def cancel(self, api_key: str, symbol: str, order_id: Any = None, client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """Cancel one open order by orderId or origClientOrderId"""
+        account = self.account(api_key)
+        book = self.book(symbol)
+        order = self._find(account, book.symbol, order_id, client_order_id)
+        if order is None or order.status not in OPEN_STATUSES:
+            raise FakeExchangeError(-2011, "Unknown order sent.")
+        self._cancel(book, order)
+        return order.to_dict()
+
+    def _cancel(self, book: _Book, order: _Order):
+        if order in book.stops:
+            book.stops.remove(order)
+        else:
+            book.remove(order)
+        order.status = 'CANCELED'
+        order.update_time = _now_ms()
+        order.account.untrack(order)
+        self._order_event(order, 'CANCELED')
+
+    def cancel_all(self, api_key: str, symbol: str) -> Dict[str, Any]:
+        account = self.account(api_key)
+        book = self.book(symbol)
+        for order in [o for o in account.open_orders.values() if o.symbol == book.symbol]:
+            self._cancel(book, order)
+        return {'code': 200, 'msg': 'The operation of cancel all open order is done.'}
+
+    def query(self, api_key: str, symbol: str, order_id: Any = None, client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        account = self.account(api_key)
+        book = self.book(symbol)
+        order = self._find(account, book.symbol, order_id, client_order_id)
+        if order is None:
+            raise FakeExchangeError(-2013, "Order does not exist.")
+        return order.to_dict()
+
+    @staticmethod
+    def _find(account: _Account, symbol: str, order_id: Any, client_order_id: Optional[str]) -> Optional[_Order]:
+        if order_id not in (None, ''):
+            try:
+                order = account.orders.get(int(order_id))
+            except (TypeError, ValueError):
+                raise FakeExchangeError(-1100, "Illegal characters found in parameter 'orderId'.")
+        elif client_order_id:
+            order = next((o for o in reversed(list(account.orders.values()))
+                          if o.client_order_id == client_order_id), None)
+        else:
+            raise _missing('orderId')
+        return order if order is not None and order.symbol == symbol else None
+
+    # Account reads
+
+    def open_orders(self, api_key: str, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        account = self.account(api_key)
+        if symbol:
+            symbol = self.book(symbol).symbol
+        return [o.to_dict() for o in account.open_orders.values() if not symbol or o.symbol == symbol]
+
+    def all_orders(self, api_key: str, symbol: str, limit: int = 500) -> List[Dict[str, Any]]:
+        account = self.account(api_key)
+        symbol = self.book(symbol).symbol
+        orders = [o.to_dict() for o in account.orders.values() if o.symbol == symbol]
+        return orders[-limit:]
+
+    def user_trades(self, api_key: str, symbol: str, from_id: Optional[int] = None, start_time: Optional[int] = None,
+                    end_time: Optional[int] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        account = self.account(api_key)
+        symbol = self.book(symbol).symbol
+        trades = [t for t in account.trades if t['symbol'] == symbol]
+        if from_id is not None:
+            return [t for t in trades if t['id'] >= from_id][:limit]
+        if start_time is not None:
+            trades = [t for t in trades if t['time'] >= start_time]
+        if end_time is not None:
+            trades = [t for t in trades if t['time'] <= end_time]
+        # Without a cursor or start time the most recent trades are returned
+        return trades[:limit] if start_time is not None else trades[-limit:]
+
+    def positions(self, api_key: str, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        account = self.account(api_key)
+        result = []
+        for book in self.books.values():
+            if symbol and book.symbol != symbol.upper():
+                continue
+            amount, entry = account.positions.get(book.symbol, (0.0, 0.0))
+            mark = book.mark_price()
+            leverage = account.leverage.get(book.symbol, self.default_leverage)
+            result.append({
+                'symbol': book.symbol, 'positionAmt': format_decimal(amount),
+                'entryPrice': format_decimal(entry), 'breakEvenPrice': format_decimal(entry),
+                'markPrice': format_decimal(mark), 'unRealizedProfit': format_decimal(amount * (mark - entry)),
+                'liquidationPrice': '0', 'leverage': str(leverage), 'maxNotionalValue': '1000000',
+                'marginType': 'cross', 'isolatedMargin': '0', 'isAutoAddMargin': 'false',
+                'positionSide': 'BOTH', 'notional': format_decimal(amount * mark),
+                'isolatedWallet': '0', 'updateTime': _now_ms(),
+            })
+        return result
+
+    def account_info(self, api_key: str) -> Dict[str, Any]:
+        account = self.account(api_key)
+        positions = self.positions(api_key)
+        unrealized = sum(float(p['unRealizedProfit']) for p in positions)
+        margin = sum(abs(float(p['notional'])) / int(p['leverage']) for p in positions)
+        margin_balance = account.balance + unrealized
+        available = max(margin_balance - margin, 0.0)
+        asset = {
+            'asset': 'USDT', 'walletBalance': format_decimal(account.balance),
+            'unrealizedProfit': format_decimal(unrealized), 'marginBalance': format_decimal(margin_balance),
+            'maintMargin': '0', 'initialMargin': format_decimal(margin), 'positionInitialMargin': format_decimal(margin),
+            'openOrderInitialMargin': '0', 'crossWalletBalance': format_decimal(account.balance),
+            'crossUnPnl': format_decimal(unrealized), 'availableBalance': format_decimal(available),
+            'maxWithdrawAmount': format_decimal(available), 'marginAvailable': True, 'updateTime': _now_ms(),
+        }
+        return {
+            'feeTier': 0, 'canTrade': True, 'canDeposit': True, 'canWithdraw': True, 'updateTime': 0,
+            'totalInitialMargin': format_decimal(margin), 'totalMaintMargin': '0',
+            'totalWalletBalance': format_decimal(account.balance),
+            'totalUnrealizedProfit': format_decimal(unrealized),
+            'totalMarginBalance': format_decimal(margin_balance),
+            'totalPositionInitialMargin': format_decimal(margin), 'totalOpenOrderInitialMargin': '0',
+            'totalCrossWalletBalance': format_decimal(account.balance),
+            'totalCrossUnPnl': format_decimal(unrealized), 'availableBalance': format_decimal(available),
+            'maxWithdrawAmount': format_decimal(available),
+            'assets': [asset],
+            'positions': [
+                {k: p[k] for k in ('symbol', 'positionAmt', 'entryPrice', 'breakEvenPrice', 'unRealizedProfit',
+                                   'leverage', 'isolatedWallet', 'positionSide', 'notional', 'updateTime')}
+                for p in positions
+            ],
+        }
+
+    def balance(self, api_key: str) -> List[Dict[str, Any]]:
+        asset = self.account_info(api_key)['assets'][0]
+        return [{'accountAlias': 'fake', 'asset': 'USDT', 'balance': asset['walletBalance'],
+                 'crossWalletBalance': asset['crossWalletBalance'], 'crossUnPnl': asset['crossUnPnl'],
+                 'availableBalance': asset['availableBalance'], 'maxWithdrawAmount': asset['maxWithdrawAmount'],
+                 'marginAvailable': True, 'updateTime': asset['updateTime']}]
+
+    def leverage_brackets(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Two maintenance margin tiers per symbol (0.4% up to 50k notional, then 0.5%)"""
+        books = [self.book(symbol)] if symbol else list(self.books.values())
+        return [{'symbol': book.symbol, 'brackets': [
+            {'bracket': 1, 'initialLeverage': 125, 'notionalCap': 50000, 'notionalFloor': 0,
+             'maintMarginRatio': 0.004, 'cum': 0.0},
+            {'bracket': 2, 'initialLeverage': 100, 'notionalCap': 250000, 'notionalFloor': 50000,
+             'maintMarginRatio': 0.005, 'cum': 50.0},
+        ]} for book in books]
+
+    def listen_key(self, api_key: str) -> str:
+        account = self.account(api_key)
+        if account.listen_key is None:
+            account.listen_key = secrets.token_hex(32)
+            self.listen_keys[account.listen_key] = api_key
+        return account.listen_key
+
+    def close_listen_key(self, api_key: str):
+        account = self.account(api_key)
+        if account.listen_key is not None:
+            self.listen_keys.pop(account.listen_key, None)
+            account.listen_key = None
+
+    # Market data
+
+    def exchange_info(self) -> Dict[str, Any]:
+        symbols = []
+        for book in self.books.values():
+            symbols.append({
+                'symbol': book.symbol, 'pair': book.symbol, 'contractType': 'PERPETUAL', 'status': 'TRADING',
+                'baseAsset': book.symbol[:-4], 'quoteAsset': 'USDT', 'marginAsset': 'USDT',
+                'pricePrecision': len(format_decimal(book.tick_size).partition('.')[2]),
+                'quantityPrecision': len(format_decimal(book.step_size).partition('.')[2]),
+                'orderTypes': ['LIMIT', 'MARKET', 'STOP', 'STOP_MARKET'],
+                'timeInForce': ['GTC', 'IOC', 'FOK', 'GTX'],
+                'filters': [
+                    {'filterType': 'PRICE_FILTER', 'tickSize': format_decimal(book.tick_size),
+                     'minPrice': format_decimal(book.tick_size), 'maxPrice': '10000000'},
+                    {'filterType': 'LOT_SIZE', 'stepSize': format_decimal(book.step_size),
+                     'minQty': format_decimal(book.min_qty), 'maxQty': format_decimal(book.max_qty)},
+                    {'filterType': 'MARKET_LOT_SIZE', 'stepSize': format_decimal(book.step_size),
+                     'minQty': format_decimal(book.min_qty), 'maxQty': format_decimal(book.max_qty)},
+                    {'filterType': 'MIN_NOTIONAL', 'notional': format_decimal(book.min_notional)},
+                ],
+            })
+        return {'timezone': 'UTC', 'serverTime': _now_ms(), 'rateLimits': self.rate_limits, 'symbols': symbols}
+
+    def klines(self, symbol: str, interval: Optional[str], start_time: Optional[int] = None,
+               end_time: Optional[int] = None, limit: int = 500) -> List[list]:
+        """Synthetic, deterministic kline history (smooth waves around the symbol's start price)"""
+        book = self.book(symbol)
+        step = INTERVAL_MS.get(interval or '')
+        if step is None:
+            raise FakeExchangeError(-1120, "Invalid interval.")
+        now = _now_ms()
+        last = min(end_time if end_time is not None else now, now) // step * step
+        if start_time is None:
+            first = max(last - (limit - 1) * step, KLINE_HISTORY_START)
+        else:
+            first = max(-(-start_time // step) * step, KLINE_HISTORY_START)
+
+        def price(t):
+            minutes = t / 60000
+            return book.base_price * math.exp(
+                0.05 * math.sin(minutes / 7919) + 0.01 * math.sin(minutes / 331) + 0.002 * math.sin(minutes / 17)
+            )
+
+        rows = []
+        for open_time in range(first, last + 1, step)[:limit]:
+            o, c = price(open_time), price(open_time + step)
+            wick = 1 + (open_time // step * 2654435761 % 1000) / 1e6
+            volume = 10 + open_time // step % 90
+            rows.append([
+                open_time, format_decimal(round(o, 2)), format_decimal(round(max(o, c) * wick, 2)),
+                format_decimal(round(min(o, c) / wick, 2)), format_decimal(round(c, 2)), str(volume),
+                open_time + step - 1, format_decimal(round(volume * c, 2)), volume * 3,
+                str(volume // 2), format_decimal(round(volume // 2 * c, 2)), '0',
+            ])
+        return rows
+
+    def mark_price_event(self, book: _Book) -> Dict[str, Any]:
+        now = _now_ms()
+        mark = format_decimal(round(book.mark_price(), 8))
+        return {'e': 'markPriceUpdate', 'E': now, 's': book.symbol, 'p': mark, 'i': mark,
+                'P': mark, 'r': '0.00010000', 'T': now}
+
+
+class FakeExchange:
+    """
+    aiohttp server exposing a MatchingEngine as Binance Futures REST + WebSocket APIs
+
+    REST: /fapi/v1/{ping,time,exchangeInfo,depth,klines,premiumIndex,order,batchOrders,
+    allOpenOrders,openOrders,allOrders,userTrades,leverageBracket,listenKey} and
+    /fapi/v2/{account,balance,positionRisk}.
+
+    WebSocket: /ws/<stream> and /stream?streams=a/b for <symbol>@depth@100ms,
+    <symbol>@aggTrade, <symbol>@markPrice, !markPrice@arr and user-data
+    streams (/ws/<listenKey>).
+
+    Every REST response is delayed by `latency` plus a uniform `jitter`,
+    fails with HTTP 503 at `error_rate`, and carries X-MBX-USED-WEIGHT-1M /
+    X-MBX-ORDER-COUNT-* headers (HTTP 429 past the limits if enforced).
+    """
+
+    def __init__(
+        self,
+        engine: Optional[MatchingEngine] = None,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        volatility: float = 0.0,
+        api_secrets: Optional[Dict[str, str]] = None,
+        enforce_rate_limits: bool = True,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the exchange
+
+        Args:
+            engine: Matching engine (default: MatchingEngine with DEFAULT_SYMBOLS)
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency: Fixed delay added to every REST response, in seconds
+            jitter: Max extra uniform random delay, in seconds
+            error_rate: Fraction of REST requests answered with HTTP 503
+            volatility: Std-dev of the per-second log price drift (0 = price
+                only moves with trades)
+            api_secrets: API key -> secret; when given, signatures are
+                verified and unknown keys are rejected
+            enforce_rate_limits: Answer HTTP 429 once the weight/order limits are used
+            seed: Random seed for latency, errors and drift
+        """
+        self.engine = engine or MatchingEngine(seed=seed)
+        self.engine.on_event = self._publish
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.volatility = volatility
+        self.api_secrets = api_secrets
+        self.enforce_rate_limits = enforce_rate_limits
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors_injected = 0
+        self._subscribers: Dict[Hashable, Dict[asyncio.Queue, str]] = {}
+        self._sockets = set()
+        self._usage: Dict[Tuple[str, int], List[int]] = {}  # (type, seconds) -> [window, used]
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point Config at this exchange"""
+        return {'BINANCE_BASE_URL': self.base_url, 'BINANCE_WS_URL': self.ws_url}
+
+    # Lifecycle
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        routes = [
+            ('GET', '/fapi/v1/ping', None, False, lambda key, p: {}),
+            ('GET', '/fapi/v1/time', None, False, lambda key, p: {'serverTime': _now_ms()}),
+            ('GET', '/fapi/v1/exchangeInfo', 'futures_exchange_info', False, lambda key, p: self.engine.exchange_info()),
+            ('GET', '/fapi/v1/depth', 'futures_order_book', False,
+             lambda key, p: self.engine.book(p.get('symbol')).depth(int(p.get('limit', 500)))),
+            ('GET', '/fapi/v1/premiumIndex', 'futures_mark_price', False, self._premium_index),
+            ('GET', '/fapi/v1/klines', 'futures_klines', False, self._klines),
+            ('POST', '/fapi/v1/order', 'futures_create_order', True, self.engine.place),
+            ('GET', '/fapi/v1/order', 'futures_get_order', True,
+             lambda key, p: self.engine.query(key, p.get('symbol'), p.get('orderId'), p.get('origClientOrderId'))),
+            ('DELETE', '/fapi/v1/order', 'futures_cancel_order', True,
+             lambda key, p: self.engine.cancel(key, p.get('symbol'), p.get('orderId'), p.get('origClientOrderId'))),
+            ('POST', '/fapi/v1/batchOrders', 'futures_place_batch_order', True, self._batch_orders),
+            ('DELETE', '/fapi/v1/batchOrders', 'futures_cancel_orders', True, self._batch_cancel),
+            ('DELETE', '/fapi/v1/allOpenOrders', 'futures_cancel_all_open_orders', True,
+             lambda key, p: self.engine.cancel_all(key, p.get('symbol'))),
+            ('GET', '/fapi/v1/openOrders', 'futures_get_open_orders', True,
+             lambda key, p: self.engine.open_orders(key, p.get('symbol'))),
+            ('GET', '/fapi/v1/allOrders', 'futures_get_all_orders', True,
+             lambda key, p: self.engine.all_orders(key, p.get('symbol'), int(p.get('limit', 500)))),
+            ('GET', '/fapi/v1/userTrades', 'futures_account_trades', True, self._user_trades),
+            ('GET', '/fapi/v2/account', 'futures_account', True, lambda key, p: self.engine.account_info(key)),
+            ('GET', '/fapi/v2/balance', 'futures_account_balance', True, lambda key, p: self.engine.balance(key)),
+            ('GET', '/fapi/v2/positionRisk', 'futures_position_information', True,
+             lambda key, p: self.engine.positions(key, p.get('symbol'))),
+            ('GET', '/fapi/v1/leverageBracket', 'futures_leverage_bracket', True,
+             lambda key, p: self.engine.leverage_brackets(p.get('symbol'))),
+            ('POST', '/fapi/v1/listenKey', 'futures_stream_get_listen_key', 'key',
+             lambda key, p: {'listenKey': self.engine.listen_key(key)}),
+            ('PUT', '/fapi/v1/listenKey', 'futures_stream_keepalive', 'key', lambda key, p: {}),
+            ('DELETE', '/fapi/v1/listenKey', 'futures_stream_close', 'key',
+             lambda key, p: self.engine.close_listen_key(key) or {}),
+        ]
+        for method, path, endpoint, auth, handler in routes:
+            app.router.add_route(method, path, self._handler(endpoint, auth, handler))
+        app.router.add_get('/ws/{stream}', self._ws_handler)
+        app.router.add_get('/stream', self._ws_handler)
+        return app
+
+    async def start_async(self):
+        """Start serving on the running event loop"""
+        self._loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+        self._tasks = [asyncio.ensure_future(self._market_data_loop())]
+
+    async def stop_async(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        for ws in list(self._sockets):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start(self) -> "FakeExchange":
+        """Serve from a background thread (for synchronous callers such as BasicBot)"""
+        started = threading.Event()
+        errors: List[BaseException] = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.start_async())
+            except BaseException as e:
+                errors.append(e)
+                started.set()
+                return
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop_async())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name='FakeExchange', daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self):
+        if self._thread is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+            self._thread = None
+
+    def __enter__(self) -> "FakeExchange":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # REST
+
+    def _handler(self, endpoint: Optional[str], auth: Any, fn: Callable[[Optional[str], Dict[str, Any]], Any]):
+        async def handle(request: web.Request) -> web.Response:
+            self.requests += 1
+            params: Dict[str, Any] = dict(request.query)
+            if request.can_read_body:
+                params.update(await request.post())
+
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if delay:
+                await asyncio.sleep(delay)
+
+            headers: Dict[str, str] = {}
+            try:
+                if self.error_rate and self.random.random() < self.error_rate:
+                    self.errors_injected += 1
+                    raise FakeExchangeError(
+                        -1001, "Internal error; unable to process your request. Please try again.", status=503
+                    )
+                api_key = self._authenticate(request, auth) if auth else None
+                if endpoint is not None:
+                    headers = self._count_usage(endpoint, params)
+                result = fn(api_key, params)
+                return web.Response(text=json.dumps(result), content_type='application/json', headers=headers)
+            except FakeExchangeError as e:
+                if e.status == 429:
+                    headers['Retry-After'] = '1'
+                return web.Response(
+                    status=e.status, text=json.dumps({'code': e.code, 'msg': e.msg}),
+                    content_type='application/json', headers=headers
+                )
+
+        return handle
+
+    def _authenticate(self, request: web.Request, auth: Any) -> str:
+        api_key = request.headers.get('X-MBX-APIKEY')
+        if not api_key or (self.api_secrets is not None and api_key not in self.api_secrets):
+            raise FakeExchangeError(-2015, "Invalid API-key, IP, or permissions for action.", status=401)
+        if auth is True:
+            signature = request.query.get('signature')
+            if not signature or 'timestamp' not in request.query:
+                raise _missing('signature' if not signature else 'timestamp')
+            if self.api_secrets is not None:
+                # Clients sign either the encoded query or its decoded form
+                payload = request.raw_path.partition('?')[2].rsplit('&signature=', 1)[0]
+                secret = self.api_secrets[api_key].encode('utf-8')
+                if not any(
+                    hmac.compare_digest(hmac.new(secret, text.encode('utf-8'), hashlib.sha256).hexdigest(), signature)
+                    for text in (payload, unquote_plus(payload))
+                ):
+                    raise FakeExchangeError(-1022, "Signature for this request is not valid.")
+        return api_key
+
+    def _count_usage(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, str]:
+        if endpoint == 'futures_place_batch_order':
+            try:
+                params = {'batchOrders': json.loads(params.get('batchOrders', '[]'))}
+            except ValueError:
+                params = {}
+        weight, orders, _ = endpoint_cost(endpoint, params)
+        now = int(time.time())
+        headers = {}
+        for limit in self.engine.rate_limits:
+            seconds = (60 if limit['interval'] == 'MINUTE' else 1) * limit['intervalNum']
+            amount = weight if limit['rateLimitType'] == 'REQUEST_WEIGHT' else orders
+            key = (limit['rateLimitType'], seconds)
+            window = now // seconds
+            usage = self._usage.setdefault(key, [window, 0])
+            if usage[0] != window:
+                usage[:] = [window, 0]
+            if amount and self.enforce_rate_limits and usage[1] + amount > limit['limit']:
+                raise FakeExchangeError(-1003, "Too many requests; current limit is "
+                                               f"{limit['limit']} per {seconds}s.", status=429)
+            usage[1] += amount
+            if limit['rateLimitType'] == 'REQUEST_WEIGHT':
+                headers[f"X-MBX-USED-WEIGHT-{seconds // 60}M"] = str(usage[1])
+            elif seconds < 60:
+                headers[f"X-MBX-ORDER-COUNT-{seconds}S"] = str(usage[1])
+            else:
+                headers[f"X-MBX-ORDER-COUNT-{seconds // 60}M"] = str(usage[1])
+        return headers
+
+    def _batch_orders(self, api_key: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        try:
+            batch = json.loads(params.get('batchOrders') or '')
+        except ValueError:
+            raise _missing('batchOrders')
+        if not isinstance(batch, list) or not 1 <= len(batch) <= 5:
+            raise FakeExchangeError(-1130, "Data sent for parameter 'batchOrders' is not valid.")
+        results = []
+        for spec in batch:
+            try:
+                results.append(self.engine.place(api_key, spec))
+            except FakeExchangeError as e:
+                results.append({'code': e.code, 'msg': e.msg})
+        return results
+
+    def _batch_cancel(self, api_key: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        ids = params.get('orderIdList')
+        client_ids = params.get('origClientOrderIdList')
+        try:
+            targets = [(i, None) for i in json.loads(ids)] if ids else [(None, c) for c in json.loads(client_ids or '')]
+        except ValueError:
+            raise _missing('orderIdList')
+        if not 1 <= len(targets) <= 10:
+            raise FakeExchangeError(-1130, "Data sent for parameter 'orderIdList' is not valid.")
+        results = []
+        for order_id, client_order_id in targets:
+            try:
+                results.append(self.engine.cancel(api_key, params.get('symbol'), order_id, client_order_id))
+            except FakeExchangeError as e:
+                results.append({'code': e.code, 'msg': e.msg})
+        return results
+
+    def _user_trades(self, api_key: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        def opt_int(name):
+            value = params.get(name)
+            return int(value) if value not in (None, '') else None
+
+        return self.engine.user_trades(
+            api_key, params.get('symbol'), opt_int('fromId'), opt_int('startTime'),
+            opt_int('endTime'), min(opt_int('limit') or 500, 1000)
+        )
+
+    def _klines(self, api_key: Optional[str], params: Dict[str, Any]) -> List[list]:
+        def opt_int(name):
+            value = params.get(name)
+            return int(value) if value not in (None, '') else None
+
+        return self.engine.klines(
+            params.get('symbol'), params.get('interval'), opt_int('startTime'),
+            opt_int('endTime'), min(opt_int('limit') or 500, 1500)
+        )
+
+    def _premium_index(self, api_key: Optional[str], params: Dict[str, Any]) -> Any:
+        events = [self.engine.mark_price_event(book) for book in self.engine.books.values()]
+        results = [{'symbol': e['s'], 'markPrice': e['p'], 'indexPrice': e['i'],
+                    'lastFundingRate': e['r'], 'time': e['E']} for e in events]
+        symbol = params.get('symbol')
+        if symbol:
+            self.engine.book(symbol)
+            return next(r for r in results if r['symbol'] == symbol.upper())
+        return results
+
+    # WebSocket
+
+    def _publish(self, key: Hashable, payload: Any):
+        subscribers = self._subscribers.get(key)
+        if not subscribers:
+            return
+        for queue, name in subscribers.items():
+            queue.put_nowait((name, payload))
+
+    def _stream_key(self, name: str) -> Optional[Hashable]:
+        if name in self.engine.listen_keys:
+            return ('user', self.engine.listen_keys[name])
+        if name.startswith('!markPrice@arr'):
+            return ('markPrice', '!arr')
+        symbol, _, kind = name.partition('@')
+        symbol = symbol.upper()
+        if symbol not in self.engine.books:
+            return None
+        if kind.startswith('depth'):
+            return ('depth', symbol)
+        if kind == 'aggTrade':
+            return ('aggTrade', symbol)
+        if kind.startswith('markPrice'):
+            return ('markPrice', symbol)
+        return None
+
+    async def _ws_handler(self, request: web.Request) -> web.WebSocketResponse:
+        combined = request.path == '/stream'
+        names = request.query.get('streams', '').split('/') if combined else [request.match_info['stream']]
+        keys = [(self._stream_key(name), name) for name in names if name]
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if not keys or any(key is None for key, _ in keys):
+            await ws.close(code=1008, message=b'Invalid stream')
+            return ws
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for key, name in keys:
+            self._subscribers.setdefault(key, {})[queue] = name
+        sender = asyncio.ensure_future(self._send_loop(ws, queue, combined))
+        self._sockets.add(ws)
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+        finally:
+            self._sockets.discard(ws)
+            sender.cancel()
+            for key, _ in keys:
+                self._subscribers.get(key, {}).pop(queue, None)
+        return ws
+
+    @staticmethod
+    async def _send_loop(ws: web.WebSocketResponse, queue: asyncio.Queue, combined: bool):
+        while True:
+            name, payload = await queue.get()
+            if combined:
+                payload = {'stream': name, 'data': payload}
+            await ws.send_str(json.dumps(payload))
+
+    async def _market_data_loop(self):
+        """Publish depth diffs every 100ms and mark prices (and drift) every second"""
+        ticks = 0
+        while True:
+            await asyncio.sleep(0.1)
+            ticks += 1
+            if ticks % 10 == 0:
+                if self.volatility:
+                    self.engine.drift(self.volatility)
+                events = []
+                for book in self.engine.books.values():
+                    event = self.engine.mark_price_event(book)
+                    events.append(event)
+                    self._publish(('markPrice', book.symbol), event)
+                self._publish(('markPrice', '!arr'), events)
+            for book in self.engine.books.values():
+                event = book.flush_depth()
+                if event is not None:
+                    self._publish(('depth', book.symbol), event)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a fake Binance Futures exchange for offline testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Fixed delay added to every REST response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Max extra uniform random delay')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with HTTP 503')
+    parser.add_argument('--volatility', type=float, default=0.0, help='Per-second log price drift std-dev')
+    parser.add_argument('--no-rate-limits', action='store_true', help='Never answer HTTP 429')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    exchange = FakeExchange(
+        host=args.host, port=args.port, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate, volatility=args.volatility,
+        enforce_rate_limits=not args.no_rate_limits, seed=args.seed
+    )
+
+    async def serve():
+        await exchange.start_async()
+        print(f"Fake Binance Futures exchange listening on {exchange.base_url}")
+        for name, value in exchange.env().items():
+            print(f"  export {name}={value}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
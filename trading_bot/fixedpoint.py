@@ -0,0 +1,332 @@
+"""
+Fixed-point prices and quantities
+
+A Fixed is an integer number of 10**-scale units, where the scale comes
+from the symbol's tick or step size. Snapping to the tick/step grid,
+filter checks and notional/PnL math are then exact integer operations,
+and values are encoded for the exchange straight from the integer (no
+float repr, no Decimal). FixedArray keeps many values of one scale in an
+array('q') for ladders and other batches.
+
+    grid = Grid('0.10')                  # BTCUSDT tick size
+    price = grid.round(50000.04)         # Fixed('50000.0')
+    str(price + grid.step * 3)           # '50000.3'
+    FixedArray.ladder(price, grid.step_units, 5).strings()
+"""
+import math
+import operator
+from array import array
+from typing import Iterable, Iterator, List, Optional, Union
+
+# Scale used when a symbol's precision is unknown (exchange max is 8)
+DEFAULT_SCALE = 8
+
+_POW10 = [10 ** i for i in range(37)]
+
+
+def decimals(text: str) -> int:
+    """Number of significant decimal places in a decimal string (e.g. '0.010' -> 2)"""
+    text = text.rstrip('0')
+    return len(text.split('.')[1]) if '.' in text else 0
+
+
+def round_half_away(value: float) -> int:
+    """Round a float to the nearest integer, halves away from zero (the rule used throughout this module)"""
+    if value < 0:
+        return -round_half_away(-value)
+    whole = math.floor(value)
+    return whole + 1 if value - whole >= 0.5 else whole
+
+
+def parse_units(text: str, scale: int) -> int:
+    """
+    Parse a decimal string into integer units of 10**-scale
+
+    Digits beyond the scale are rounded half away from zero; exponent
+    notation goes through float.
+    """
+    text = text.strip()
+    if 'e' in text or 'E' in text:
+        return round_half_away(float(text) * _POW10[scale])
+    negative = text.startswith('-')
+    if negative or text.startswith('+'):
+        text = text[1:]
+    whole, _, frac = text.partition('.')
+    units = int((whole or '0') + frac[:scale].ljust(scale, '0'))
+    if len(frac) > scale and frac[scale] >= '5':
+        units += 1
+    return -units if negative else units
+
+
+def format_units(units: int, scale: int) -> str:
+    """Format integer units of 10**-scale as a plain decimal string without trailing zeros"""
+    if not units:
+        return '0'
+    if not scale:
+        return str(units)
+    digits = str(abs(units)).rjust(scale + 1, '0')
+    frac = digits[-scale:].rstrip('0')
+    text = f"{digits[:-scale]}.{frac}" if frac else digits[:-scale]
+    return '-' + text if units < 0 else text
+
+
+class Fixed:
+    """
+    Immutable fixed-point number: `units` of 10**-`scale`
+
+    Supports +, -, * (scales add), comparisons and hashing across scales.
+    str() gives the exchange encoding; float() is exact up to float precision.
+    Comparisons with a float compare float(self), the nearest float, so
+    Fixed.parse('0.1') == 0.1 and equal values hash alike; arithmetic with
+    floats is not supported (convert with Fixed.from_float or a Grid).
+    Rounding is half away from zero everywhere.
+    """
+
+    __slots__ = ('units', 'scale')
+
+    def __init__(self, units: int, scale: int):
+        self.units = units
+        self.scale = scale
+
+    @classmethod
+    def parse(cls, text: str, scale: Optional[int] = None) -> 'Fixed':
+        """Parse a decimal string (scale: taken from the string if not given)"""
+        text = str(text)
+        if scale is None:
+            scale = len(text.partition('.')[2]) if 'e' not in text.lower() else DEFAULT_SCALE
+        return cls(parse_units(text, scale), scale)
+
+    @classmethod
+    def from_float(cls, value: float, scale: int = DEFAULT_SCALE) -> 'Fixed':
+        """Round a float to the nearest 10**-scale"""
+        return cls(round_half_away(value * _POW10[scale]), scale)
+
+    def rescale(self, scale: int) -> 'Fixed':
+        """Convert to another scale (rounding half away from zero when reducing)"""
+        if scale >= self.scale:
+            return Fixed(self.units * _POW10[scale - self.scale], scale)
+        q, r = divmod(abs(self.units), _POW10[self.scale - scale])
+        if 2 * r >= _POW10[self.scale - scale]:
+            q += 1
+        return Fixed(-q if self.units < 0 else q, scale)
+
+    def _align(self, other: Union['Fixed', int]):
+        """(units, other units, scale) at the larger of the two scales"""
+        if isinstance(other, int):
+            return self.units, other * _POW10[self.scale], self.scale
+        if not isinstance(other, Fixed):
+            return None
+        if self.scale == other.scale:
+            return self.units, other.units, self.scale
+        if self.scale > other.scale:
+            return self.units, other.units * _POW10[self.scale - other.scale], self.scale
+        return self.units * _POW10[other.scale - self.scale], other.units, other.scale
+
+    def __add__(self, other):
+        aligned = self._align(other)
+        if aligned is None:
+            return NotImplemented
+        a, b, scale = aligned
+        return Fixed(a + b, scale)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        aligned = self._align(other)
+        if aligned is None:
+            return NotImplemented
+        a, b, scale = aligned
+        return Fixed(a - b, scale)
+
+    def __rsub__(self, other):
+        aligned = self._align(other)
+        if aligned is None:
+            return NotImplemented
+        a, b, scale = aligned
+        return Fixed(b - a, scale)
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            return Fixed(self.units * other, self.scale)
+        if isinstance(other, Fixed):
+            return Fixed(self.units * other.units, self.scale + other.scale)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Fixed':
+        return Fixed(-self.units, self.scale)
+
+    def __abs__(self) -> 'Fixed':
+        return Fixed(abs(self.units), self.scale)
+
+    def __bool__(self) -> bool:
+        return bool(self.units)
+
+    def _compare(self, other, op):
+        if isinstance(other, float):
+            return op(self.units / _POW10[self.scale], other)
+        aligned = self._align(other)
+        if aligned is None:
+            return NotImplemented
+        return op(aligned[0], aligned[1])
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    def __hash__(self) -> int:
+        # int / int division is correctly rounded, so equal values hash equally
+        return hash(self.units / _POW10[self.scale])
+
+    def __float__(self) -> float:
+        return self.units / _POW10[self.scale]
+
+    def __str__(self) -> str:
+        return format_units(self.units, self.scale)
+
+    def __repr__(self) -> str:
+        return f"Fixed('{self}')"
+
+
+class Grid:
+    """
+    Tick or step grid of one symbol (PRICE_FILTER tickSize, LOT_SIZE stepSize)
+
+    Values on the grid are Fixed numbers at the step's scale whose units
+    are multiples of step_units.
+    """
+
+    __slots__ = ('scale', 'step_units', 'min_units', 'max_units', '_pow')
+
+    def __init__(self, step: str = '0', minimum: str = '0', maximum: str = '0'):
+        """
+        Build a grid from exchange filter strings
+
+        Args:
+            step: tickSize/stepSize ('0' means no grid: DEFAULT_SCALE units)
+            minimum: minPrice/minQty
+            maximum: maxPrice/maxQty (0 means no maximum)
+        """
+        step = str(step)
+        self.scale = decimals(step)
+        self.step_units = parse_units(step, self.scale)
+        if not self.step_units:
+            self.scale, self.step_units = DEFAULT_SCALE, 1
+        self._pow = _POW10[self.scale]
+        self.min_units = parse_units(str(minimum), self.scale)
+        self.max_units = parse_units(str(maximum), self.scale)
+
+    @property
+    def step(self) -> Fixed:
+        return Fixed(self.step_units, self.scale)
+
+    def units(self, value: Union[float, str, Fixed]) -> int:
+        """Convert a value to units at this grid's scale (not snapped to the step)"""
+        if isinstance(value, Fixed):
+            return value.rescale(self.scale).units
+        if isinstance(value, str):
+            return parse_units(value, self.scale)
+        return round_half_away(value * self._pow)
+
+    def round_units(self, value: Union[float, str, Fixed]) -> int:
+        """Snap a value to the nearest step (halves away from zero), in units"""
+        if type(value) is float or type(value) is int:
+            return round_half_away(value * self._pow / self.step_units) * self.step_units
+        units = self.units(value)
+        steps, rest = divmod(abs(units), self.step_units)
+        if 2 * rest >= self.step_units:
+            steps += 1
+        return (-steps if units < 0 else steps) * self.step_units
+
+    def floor_units(self, value: Union[float, str, Fixed]) -> int:
+        """Round a value down to the step, in units"""
+        if type(value) is float or type(value) is int:
+            # Small epsilon so 0.3 at step 0.1 (2.9999999999999996 steps) still floors to 3
+            return math.floor(value * self._pow / self.step_units + 1e-9) * self.step_units
+        return self.units(value) // self.step_units * self.step_units
+
+    def round(self, value: Union[float, str, Fixed]) -> Fixed:
+        """Snap a value to the nearest step"""
+        return Fixed(self.round_units(value), self.scale)
+
+    def floor(self, value: Union[float, str, Fixed]) -> Fixed:
+        """Round a value down to the step"""
+        return Fixed(self.floor_units(value), self.scale)
+
+    def fixed(self, units: int) -> Fixed:
+        return Fixed(units, self.scale)
+
+    def format(self, units: int) -> str:
+        return format_units(units, self.scale)
+
+
+class FixedArray:
+    """
+    Fixed-point values of one scale stored in an array('q')
+
+    Used for price ladders and batch conversions: one allocation for the
+    whole batch instead of an object per value.
+    """
+
+    __slots__ = ('units', 'scale')
+
+    def __init__(self, scale: int, units: Iterable[int] = ()):
+        self.scale = scale
+        self.units = array('q', units)
+
+    @classmethod
+    def ladder(cls, start: Fixed, step_units: int, count: int) -> 'FixedArray':
+        """
+        Build `count` evenly spaced values
+
+        Args:
+            start: First value
+            step_units: Spacing in units of start's scale (negative to step down)
+            count: Number of values
+        """
+        first = start.units
+        return cls(start.scale, (first + step_units * i for i in range(count)))
+
+    @classmethod
+    def from_values(cls, values: Iterable[Union[float, str, Fixed]], grid: Grid, floor: bool = False) -> 'FixedArray':
+        """Snap many values to a grid (nearest step, or down if floor)"""
+        snap = grid.floor_units if floor else grid.round_units
+        return cls(grid.scale, (snap(value) for value in values))
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def __getitem__(self, index: int) -> Fixed:
+        return Fixed(self.units[index], self.scale)
+
+    def __iter__(self) -> Iterator[Fixed]:
+        scale = self.scale
+        return (Fixed(units, scale) for units in self.units)
+
+    def strings(self) -> List[str]:
+        """Encode every value for the exchange"""
+        scale = self.scale
+        return [format_units(units, scale) for units in self.units]
+
+    def floats(self) -> List[float]:
+        pow10 = _POW10[self.scale]
+        return [units / pow10 for units in self.units]
+
+    def sum(self) -> Fixed:
+        return Fixed(sum(self.units), self.scale)
+
+    def dot(self, other: 'FixedArray') -> Fixed:
+        """Sum of pairwise products, e.g. the notional of a price/quantity ladder"""
+        return Fixed(sum(a * b for a, b in zip(self.units, other.units)), self.scale + other.scale)
@@ -0,0 +1,484 @@
+"""
+Local order and fill history store (SQLite, WAL mode)
+"""
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+from .logger import logger
+
+# Max trades per userTrades request
+USER_TRADES_LIMIT = 1000
+
+# How far back the first sync of a symbol reaches (userTrades only
+# accepts a 7-day window per request)
+INITIAL_SYNC_DAYS = 7
+
+# Longest startTime..endTime span userTrades accepts
+USER_TRADES_WINDOW_MS = 7 * 86400 * 1000
+
+TimeArg = Union[int, float, datetime, None]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    symbol TEXT NOT NULL,
+    order_id INTEGER NOT NULL,
+    client_order_id TEXT,
+    side TEXT,
+    type TEXT,
+    time_in_force TEXT,
+    price REAL,
+    stop_price REAL,
+    orig_qty REAL,
+    executed_qty REAL,
+    avg_price REAL,
+    status TEXT,
+    reduce_only INTEGER,
+    created_time INTEGER NOT NULL,
+    update_time INTEGER NOT NULL,
+    PRIMARY KEY (symbol, order_id)
+);
+CREATE INDEX IF NOT EXISTS orders_symbol_time ON orders (symbol, created_time);
+CREATE INDEX IF NOT EXISTS orders_time ON orders (created_time);
+CREATE INDEX IF NOT EXISTS orders_client_id ON orders (client_order_id);
+
+CREATE TABLE IF NOT EXISTS order_events (
+    symbol TEXT NOT NULL,
+    order_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    executed_qty REAL NOT NULL,
+    avg_price REAL,
+    time INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    UNIQUE (symbol, order_id, status, executed_qty)
+);
+CREATE INDEX IF NOT EXISTS order_events_time ON order_events (time);
+
+CREATE TABLE IF NOT EXISTS fills (
+    symbol TEXT NOT NULL,
+    trade_id INTEGER NOT NULL,
+    order_id INTEGER NOT NULL,
+    side TEXT,
+    price REAL NOT NULL,
+    qty REAL NOT NULL,
+    quote_qty REAL,
+    realized_pnl REAL,
+    commission REAL,
+    commission_asset TEXT,
+    maker INTEGER,
+    time INTEGER NOT NULL,
+    PRIMARY KEY (symbol, trade_id)
+);
+CREATE INDEX IF NOT EXISTS fills_symbol_time ON fills (symbol, time);
+CREATE INDEX IF NOT EXISTS fills_time ON fills (time);
+CREATE INDEX IF NOT EXISTS fills_order ON fills (symbol, order_id);
+
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    symbol TEXT PRIMARY KEY,
+    last_trade_id INTEGER NOT NULL,
+    synced_at INTEGER NOT NULL
+);
+"""
+
+# Newer updates win; equal timestamps still update so the REST response
+# for a cancel (same updateTime as the stream event) is not dropped
+UPSERT_ORDER = """
+INSERT INTO orders (
+    symbol, order_id, client_order_id, side, type, time_in_force, price, stop_price,
+    orig_qty, executed_qty, avg_price, status, reduce_only, created_time, update_time
+) VALUES (
+    :symbol, :order_id, :client_order_id, :side, :type, :time_in_force, :price, :stop_price,
+    :orig_qty, :executed_qty, :avg_price, :status, :reduce_only, :created_time, :update_time
+)
+ON CONFLICT (symbol, order_id) DO UPDATE SET
+    executed_qty = excluded.executed_qty,
+    avg_price = excluded.avg_price,
+    status = excluded.status,
+    update_time = excluded.update_time
+WHERE excluded.update_time >= orders.update_time
+"""
+
+INSERT_EVENT = """
+INSERT OR IGNORE INTO order_events (symbol, order_id, status, executed_qty, avg_price, time, source)
+VALUES (:symbol, :order_id, :status, :executed_qty, :avg_price, :update_time, :source)
+"""
+
+INSERT_FILL = """
+INSERT OR IGNORE INTO fills (
+    symbol, trade_id, order_id, side, price, qty, quote_qty, realized_pnl,
+    commission, commission_asset, maker, time
+) VALUES (
+    :symbol, :trade_id, :order_id, :side, :price, :qty, :quote_qty, :realized_pnl,
+    :commission, :commission_asset, :maker, :time
+)
+"""
+
+
+def _to_ms(value: TimeArg) -> Optional[int]:
+    """Convert a datetime or epoch seconds/milliseconds to epoch milliseconds"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    # Values below 1e11 are epoch seconds (1e11 ms is March 1973)
+    return int(value * 1000) if value < 1e11 else int(value)
+
+
+def _float(value: Any) -> Optional[float]:
+    return None if value in (None, '') else float(value)
+
+
+def _order_row(order: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """Map a REST order response to an orders row"""
+    update_time = order.get('updateTime') or int(time.time() * 1000)
+    return {
+        'symbol': order['symbol'],
+        'order_id': order['orderId'],
+        'client_order_id': order.get('clientOrderId'),
+        'side': order.get('side'),
+        'type': order.get('origType') or order.get('type'),
+        'time_in_force': order.get('timeInForce'),
+        'price': _float(order.get('price')),
+        'stop_price': _float(order.get('stopPrice')),
+        'orig_qty': _float(order.get('origQty')),
+        'executed_qty': _float(order.get('executedQty')) or 0.0,
+        'avg_price': _float(order.get('avgPrice')),
+        'status': order.get('status'),
+        'reduce_only': int(bool(order.get('reduceOnly'))),
+        'created_time': order.get('time') or update_time,
+        'update_time': update_time,
+        'source': source,
+    }
+
+
+def _stream_order_row(o: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an ORDER_TRADE_UPDATE 'o' payload to an orders row"""
+    return {
+        'symbol': o['s'],
+        'order_id': o['i'],
+        'client_order_id': o.get('c'),
+        'side': o.get('S'),
+        'type': o.get('ot') or o.get('o'),
+        'time_in_force': o.get('f'),
+        'price': _float(o.get('p')),
+        'stop_price': _float(o.get('sp')),
+        'orig_qty': _float(o.get('q')),
+        'executed_qty': _float(o.get('z')) or 0.0,
+        'avg_price': _float(o.get('ap')),
+        'status': o['X'],
+        'reduce_only': int(bool(o.get('R'))),
+        'created_time': o['T'],
+        'update_time': o['T'],
+        'source': 'stream',
+    }
+
+
+def _fill_row(trade: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a userTrades record to a fills row"""
+    return {
+        'symbol': trade['symbol'],
+        'trade_id': trade['id'],
+        'order_id': trade['orderId'],
+        'side': trade.get('side'),
+        'price': float(trade['price']),
+        'qty': float(trade['qty']),
+        'quote_qty': _float(trade.get('quoteQty')),
+        'realized_pnl': _float(trade.get('realizedPnl')),
+        'commission': _float(trade.get('commission')),
+        'commission_asset': trade.get('commissionAsset'),
+        'maker': int(bool(trade.get('maker'))),
+        'time': trade['time'],
+    }
+
+
+class OrderHistory:
+    """
+    Append-only local store of placed orders, status transitions and fills
+
+    Orders are recorded from REST responses and user-data stream updates;
+    every distinct (status, executed qty) an order passes through is kept
+    in order_events. Fills come from the stream (TRADE executions) and
+    from sync_fills(), which pages userTrades forward from a per-symbol
+    trade-id cursor so each trade is downloaded once.
+
+    Tables are indexed on symbol + time, time and clientOrderId, so
+    history queries are answered locally instead of paging the exchange.
+    The database runs in WAL mode, so readers (e.g. another process or
+    the CLI) never block the bot's writes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the history database
+
+        Args:
+            path: SQLite file path (':memory:' for a throwaway store)
+        """
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # WAL + NORMAL only fsyncs on checkpoints; a crash can lose the
+        # last few commits, which sync_fills() recovers from the exchange
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, statements: List[tuple]) -> int:
+        """Run (sql, params) statements in one transaction; returns rows changed"""
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute('BEGIN')
+            try:
+                for sql, params in statements:
+                    if isinstance(params, list):
+                        self._conn.executemany(sql, params)
+                    else:
+                        self._conn.execute(sql, params)
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+            return self._conn.total_changes - before
+
+    def record_order(self, order: Dict[str, Any], source: str = 'rest'):
+        """
+        Record an order response (placement, query or cancellation)
+
+        Args:
+            order: REST order record (futures_create_order() response etc.)
+            source: Where the record came from, stored with the status event
+        """
+        row = _order_row(order, source)
+        self._write([(UPSERT_ORDER, row), (INSERT_EVENT, row)])
+
+    def record_orders(self, orders: List[Dict[str, Any]], source: str = 'rest'):
+        """Record several order responses in one transaction"""
+        rows = [_order_row(order, source) for order in orders]
+        if rows:
+            self._write([(UPSERT_ORDER, rows), (INSERT_EVENT, rows)])
+
+    def record_order_update(self, o: Dict[str, Any]):
+        """
+        Record a user-data stream order update
+
+        Args:
+            o: The 'o' payload of an ORDER_TRADE_UPDATE event; TRADE
+                executions are also stored as fills
+        """
+        row = _stream_order_row(o)
+        statements = [(UPSERT_ORDER, row), (INSERT_EVENT, row)]
+        if o.get('x') == 'TRADE' and o.get('t'):
+            price = float(o['L'])
+            qty = float(o['l'])
+            statements.append((INSERT_FILL, {
+                'symbol': o['s'],
+                'trade_id': o['t'],
+                'order_id': o['i'],
+                'side': o.get('S'),
+                'price': price,
+                'qty': qty,
+                'quote_qty': price * qty,
+                'realized_pnl': _float(o.get('rp')),
+                'commission': _float(o.get('n')),
+                'commission_asset': o.get('N'),
+                'maker': int(bool(o.get('m'))),
+                'time': o['T'],
+            }))
+        self._write(statements)
+
+    def record_fills(self, trades: List[Dict[str, Any]]) -> int:
+        """
+        Record userTrades records (already-stored trades are skipped)
+
+        Returns:
+            Number of new fills stored
+        """
+        if not trades:
+            return 0
+        return self._write([(INSERT_FILL, [_fill_row(t) for t in trades])])
+
+    def sync_fills(self, symbol: str, fetch: Callable[..., List[Dict[str, Any]]],
+                   since: TimeArg = None) -> int:
+        """
+        Download new fills for a symbol from the exchange
+
+        Continues from the stored cursor (the last synced trade id) with
+        fromId, a page of USER_TRADES_LIMIT trades at a time, until a short
+        page. A symbol's first sync starts at `since` and steps through
+        7-day windows until it finds a trade (or reaches the present), so
+        an empty window does not stall it.
+
+        Args:
+            symbol: Trading pair symbol
+            fetch: Calls userTrades, e.g.
+                lambda **p: bot._call('futures_account_trades', **p)
+            since: Start of the first sync (default: INITIAL_SYNC_DAYS ago)
+
+        Returns:
+            Number of new fills stored
+        """
+        cursor = self.get_cursor(symbol)
+        if since is not None:
+            start = _to_ms(since)
+        else:
+            start = int((time.time() - INITIAL_SYNC_DAYS * 86400) * 1000)
+        added = 0
+        while True:
+            params = {'symbol': symbol, 'limit': USER_TRADES_LIMIT}
+            if cursor is not None:
+                params['fromId'] = cursor + 1
+            else:
+                params['startTime'] = start
+                params['endTime'] = start + USER_TRADES_WINDOW_MS - 1
+            trades = fetch(**params)
+            if trades:
+                added += self.record_fills(trades)
+                cursor = max(t['id'] for t in trades)
+                self._set_cursor(symbol, cursor)
+            if 'fromId' in params:
+                if len(trades) < USER_TRADES_LIMIT:
+                    break
+            elif not trades:
+                # Nothing in this window; try the next one up to now
+                start += USER_TRADES_WINDOW_MS
+                if start > time.time() * 1000:
+                    break
+            # Otherwise continue from the window's last trade with fromId
+        logger.info("Synced %s new fill(s) for %s", added, symbol)
+        return added
+
+    def get_cursor(self, symbol: str) -> Optional[int]:
+        """Get the last trade id synced for a symbol"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT last_trade_id FROM sync_cursors WHERE symbol = ?', (symbol,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_cursor(self, symbol: str, trade_id: int):
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO sync_cursors (symbol, last_trade_id, synced_at) VALUES (?, ?, ?) '
+                'ON CONFLICT (symbol) DO UPDATE SET last_trade_id = excluded.last_trade_id, '
+                'synced_at = excluded.synced_at',
+                (symbol, trade_id, int(time.time() * 1000))
+            )
+
+    def _query(self, table: str, time_column: str, filters: Dict[str, Any], start: TimeArg,
+               end: TimeArg, limit: Optional[int]) -> List[Dict[str, Any]]:
+        clauses = [f'{column} = ?' for column, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        if start is not None:
+            clauses.append(f'{time_column} >= ?')
+            params.append(_to_ms(start))
+        if end is not None:
+            clauses.append(f'{time_column} <= ?')
+            params.append(_to_ms(end))
+        sql = f'SELECT * FROM {table}'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f' ORDER BY {time_column}'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_orders(
+        self,
+        symbol: Optional[str] = None,
+        start: TimeArg = None,
+        end: TimeArg = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get recorded orders, oldest first
+
+        Args:
+            symbol: Only this symbol
+            start: Created at or after (datetime, epoch seconds or ms)
+            end: Created at or before
+            status: Only orders whose latest status is this
+            limit: Max rows
+
+        Returns:
+            Order rows (prices and quantities as floats, times in epoch ms)
+        """
+        return self._query('orders', 'created_time', {'symbol': symbol, 'status': status}, start, end, limit)
+
+    def get_order(self, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """Get the most recent order with a clientOrderId"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT * FROM orders WHERE client_order_id = ? ORDER BY created_time DESC LIMIT 1',
+                (client_order_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_order_events(self, symbol: str, order_id: int) -> List[Dict[str, Any]]:
+        """Get the status transitions recorded for an order, oldest first"""
+        return self._query('order_events', 'time', {'symbol': symbol, 'order_id': order_id}, None, None, None)
+
+    def get_fills(
+        self,
+        symbol: Optional[str] = None,
+        start: TimeArg = None,
+        end: TimeArg = None,
+        order_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get recorded fills, oldest first
+
+        Args:
+            symbol: Only this symbol
+            start: Filled at or after (datetime, epoch seconds or ms)
+            end: Filled at or before
+            order_id: Only fills of this order (needs symbol)
+            limit: Max rows
+
+        Returns:
+            Fill rows (prices and quantities as floats, times in epoch ms)
+        """
+        return self._query('fills', 'time', {'symbol': symbol, 'order_id': order_id}, start, end, limit)
+
+    def fill_summary(self, symbol: Optional[str] = None, start: TimeArg = None,
+                     end: TimeArg = None) -> List[Dict[str, Any]]:
+        """
+        Aggregate fills per symbol and side
+
+        Returns:
+            Rows with symbol, side, fills, qty, notional, avg_price,
+            realized_pnl and commission
+        """
+        clauses, params = [], []
+        if symbol is not None:
+            clauses.append('symbol = ?')
+            params.append(symbol)
+        if start is not None:
+            clauses.append('time >= ?')
+            params.append(_to_ms(start))
+        if end is not None:
+            clauses.append('time <= ?')
+            params.append(_to_ms(end))
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        sql = (
+            'SELECT symbol, side, COUNT(*) AS fills, SUM(qty) AS qty, SUM(price * qty) AS notional, '
+            'SUM(price * qty) / SUM(qty) AS avg_price, SUM(realized_pnl) AS realized_pnl, '
+            f'SUM(commission) AS commission FROM fills{where} GROUP BY symbol, side ORDER BY symbol, side'
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
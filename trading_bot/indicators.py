@@ -0,0 +1,515 @@
+"""
+Incremental technical indicators
+
+Every indicator updates in O(1) per new price: moving averages keep
+running state, and windowed indicators keep their window in an
+array-backed RingBuffer. seed() initializes an indicator from history
+in one vectorized NumPy pass, so warming up on a year of bars does not
+replay it price by price.
+
+Strategies on the same symbol and timeframe share indicators through
+an IndicatorRegistry, which applies each price once no matter how many
+strategies read the result:
+
+    ema = REGISTRY.get('BTCUSDT', 'ema', 20)
+    REGISTRY.update('BTCUSDT', price, time=trade_time)
+    hourly = REGISTRY.get('BTCUSDT', 'ema', 20, interval='1h')
+    REGISTRY.update_bar('BTCUSDT', hourly_bar, interval='1h')
+    if ema.ready and price > ema.value: ...
+"""
+import threading
+from array import array
+from typing import Dict, Optional, Tuple, Type, Union
+
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-size circular buffer of floats backed by array('d')"""
+
+    __slots__ = ('size', 'data', 'head', 'count')
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("Ring buffer size must be at least 1")
+        self.size = size
+        self.data = array('d', bytes(8 * size))
+        self.head = 0  # Next slot to write
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+    def append(self, value: float) -> Optional[float]:
+        """
+        Add a value, overwriting the oldest one when full
+
+        Returns:
+            The value that was overwritten (None while not full)
+        """
+        evicted = self.data[self.head] if self.count == self.size else None
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.size
+        if evicted is None:
+            self.count += 1
+        return evicted
+
+    def __getitem__(self, index: int) -> float:
+        """Get a value by age: 0 is the oldest, -1 the newest"""
+        if not -self.count <= index < self.count:
+            raise IndexError("RingBuffer index out of range")
+        if index < 0:
+            index += self.count
+        return self.data[(self.head - self.count + index) % self.size]
+
+    def load(self, values: np.ndarray):
+        """Replace the contents with the last `size` values of an array"""
+        values = np.asarray(values, dtype=np.float64)[-self.size:]
+        self.data[:len(values)] = array('d', values.tobytes())
+        self.count = len(values)
+        self.head = len(values) % self.size
+
+    def to_numpy(self) -> np.ndarray:
+        """Copy of the contents, oldest first"""
+        data = np.frombuffer(self.data, dtype=np.float64)
+        if self.count < self.size:
+            return data[:self.count].copy()
+        return np.concatenate((data[self.head:], data[:self.head]))
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+
+def _smoothed(values: np.ndarray, period: int, alpha: float) -> float:
+    """
+    Final value of an exponential average seeded with the simple average
+    of its first `period` inputs, computed in closed form:
+
+        s_n = s_0 * (1 - a)^n + a * sum((1 - a)^(n - 1 - i) * x_i)
+    """
+    seed = float(values[:period].mean())
+    rest = values[period:]
+    if not len(rest):
+        return seed
+    decay = (1 - alpha) ** np.arange(len(rest) - 1, -1, -1, dtype=np.float64)
+    return float(seed * (1 - alpha) ** len(rest) + alpha * np.dot(decay, rest))
+
+
+class Indicator:
+    """
+    Base class for incremental indicators
+
+    All indicators share the update/seed signature so a registry can feed
+    them uniformly; inputs an indicator does not use are ignored. `value`
+    is None until enough prices have been seen.
+    """
+
+    __slots__ = ('period', 'value')
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError("Indicator period must be at least 1")
+        self.period = period
+        self.value: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, price: float, high: Optional[float] = None, low: Optional[float] = None,
+               volume: float = 0.0) -> Optional[float]:
+        """
+        Apply one new price (or closed bar)
+
+        Args:
+            price: Last price (bar close)
+            high: Bar high (default: price)
+            low: Bar low (default: price)
+            volume: Traded volume
+
+        Returns:
+            The updated value (None while warming up)
+        """
+        raise NotImplementedError
+
+    def seed(self, close, high=None, low=None, volume=None) -> Optional[float]:
+        """
+        Reset and initialize from history (arrays, oldest first)
+
+        Returns:
+            The value after the last element
+        """
+        raise NotImplementedError
+
+    def reset(self):
+        self.value = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.period}, value={self.value})"
+
+
+class SMA(Indicator):
+    """Simple moving average over a ring buffer with a running sum"""
+
+    __slots__ = ('_window', '_sum')
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self._window = RingBuffer(period)
+        self._sum = 0.0
+
+    def update(self, price, high=None, low=None, volume=0.0):
+        window = self._window
+        evicted = window.append(price)
+        self._sum += price if evicted is None else price - evicted
+        if window.head == 0:
+            # Re-sum once per lap so float error cannot accumulate
+            self._sum = sum(window.data)
+        if window.full:
+            self.value = self._sum / self.period
+        return self.value
+
+    def seed(self, close, high=None, low=None, volume=None):
+        self.reset()
+        self._window.load(close)
+        self._sum = float(self._window.to_numpy().sum())
+        if self._window.full:
+            self.value = self._sum / self.period
+        return self.value
+
+    def reset(self):
+        super().reset()
+        self._window.clear()
+        self._sum = 0.0
+
+
+class EMA(Indicator):
+    """Exponential moving average, seeded with the SMA of the first `period` prices"""
+
+    __slots__ = ('alpha', '_count', '_sum')
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.alpha = 2.0 / (period + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, price, high=None, low=None, volume=0.0):
+        if self.value is not None:
+            self.value += self.alpha * (price - self.value)
+        else:
+            self._count += 1
+            self._sum += price
+            if self._count == self.period:
+                self.value = self._sum / self.period
+        return self.value
+
+    def seed(self, close, high=None, low=None, volume=None):
+        self.reset()
+        close = np.asarray(close, dtype=np.float64)
+        if len(close) < self.period:
+            for price in close.tolist():
+                self.update(price)
+        else:
+            self.value = _smoothed(close, self.period, self.alpha)
+        return self.value
+
+    def reset(self):
+        super().reset()
+        self._count = 0
+        self._sum = 0.0
+
+
+class RSI(Indicator):
+    """Relative strength index with Wilder smoothing"""
+
+    __slots__ = ('_prev', '_avg_gain', '_avg_loss', '_count', '_gain_sum', '_loss_sum')
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.reset()
+
+    def _set_value(self):
+        if self._avg_loss == 0:
+            self.value = 100.0 if self._avg_gain > 0 else 50.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+
+    def update(self, price, high=None, low=None, volume=0.0):
+        prev = self._prev
+        self._prev = price
+        if prev is None:
+            return None
+        change = price - prev
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        if self._avg_gain is not None:
+            self._avg_gain += (gain - self._avg_gain) / self.period
+            self._avg_loss += (loss - self._avg_loss) / self.period
+        else:
+            self._count += 1
+            self._gain_sum += gain
+            self._loss_sum += loss
+            if self._count < self.period:
+                return None
+            self._avg_gain = self._gain_sum / self.period
+            self._avg_loss = self._loss_sum / self.period
+        self._set_value()
+        return self.value
+
+    def seed(self, close, high=None, low=None, volume=None):
+        self.reset()
+        close = np.asarray(close, dtype=np.float64)
+        if len(close) <= self.period:
+            for price in close.tolist():
+                self.update(price)
+            return self.value
+        changes = np.diff(close)
+        self._avg_gain = _smoothed(np.maximum(changes, 0.0), self.period, 1.0 / self.period)
+        self._avg_loss = _smoothed(np.maximum(-changes, 0.0), self.period, 1.0 / self.period)
+        self._prev = float(close[-1])
+        self._set_value()
+        return self.value
+
+    def reset(self):
+        self.value = None
+        self._prev = None
+        self._avg_gain = None
+        self._avg_loss = None
+        self._count = 0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+
+
+class ATR(Indicator):
+    """Average true range with Wilder smoothing"""
+
+    __slots__ = ('_prev_close', '_count', '_sum')
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.reset()
+
+    def update(self, price, high=None, low=None, volume=0.0):
+        high = price if high is None else high
+        low = price if low is None else low
+        prev = self._prev_close
+        self._prev_close = price
+        true_range = high - low if prev is None else max(high, prev) - min(low, prev)
+        if self.value is not None:
+            self.value += (true_range - self.value) / self.period
+        else:
+            self._count += 1
+            self._sum += true_range
+            if self._count == self.period:
+                self.value = self._sum / self.period
+        return self.value
+
+    def seed(self, close, high=None, low=None, volume=None):
+        self.reset()
+        close = np.asarray(close, dtype=np.float64)
+        high = close if high is None else np.asarray(high, dtype=np.float64)
+        low = close if low is None else np.asarray(low, dtype=np.float64)
+        if len(close) < self.period:
+            for c, h, l in zip(close.tolist(), high.tolist(), low.tolist()):
+                self.update(c, h, l)
+            return self.value
+        prev = np.r_[close[0], close[:-1]]
+        true_range = np.maximum(high, prev) - np.minimum(low, prev)
+        true_range[0] = high[0] - low[0]
+        self.value = _smoothed(true_range, self.period, 1.0 / self.period)
+        self._prev_close = float(close[-1])
+        return self.value
+
+    def reset(self):
+        self.value = None
+        self._prev_close = None
+        self._count = 0
+        self._sum = 0.0
+
+
+class VWAP(Indicator):
+    """
+    Volume-weighted average price over the last `period` updates
+
+    Price x volume and volume are kept in two ring buffers with running
+    sums. Updates without volume are ignored.
+    """
+
+    __slots__ = ('_pv', '_volume', '_pv_sum', '_volume_sum')
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self._pv = RingBuffer(period)
+        self._volume = RingBuffer(period)
+        self._pv_sum = 0.0
+        self._volume_sum = 0.0
+
+    def update(self, price, high=None, low=None, volume=0.0):
+        if volume <= 0:
+            return self.value
+        evicted_pv = self._pv.append(price * volume)
+        evicted_volume = self._volume.append(volume)
+        if evicted_pv is None:
+            self._pv_sum += price * volume
+            self._volume_sum += volume
+        else:
+            self._pv_sum += price * volume - evicted_pv
+            self._volume_sum += volume - evicted_volume
+        if self._pv.head == 0:
+            self._pv_sum = sum(self._pv.data)
+            self._volume_sum = sum(self._volume.data)
+        self.value = self._pv_sum / self._volume_sum if self._volume_sum > 0 else None
+        return self.value
+
+    def seed(self, close, high=None, low=None, volume=None):
+        self.reset()
+        if volume is None:
+            return None
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.asarray(volume, dtype=np.float64)
+        traded = volume > 0
+        close, volume = close[traded], volume[traded]
+        self._pv.load(close * volume)
+        self._volume.load(volume)
+        self._pv_sum = float(self._pv.to_numpy().sum())
+        self._volume_sum = float(self._volume.to_numpy().sum())
+        self.value = self._pv_sum / self._volume_sum if self._volume_sum > 0 else None
+        return self.value
+
+    def reset(self):
+        super().reset()
+        self._pv.clear()
+        self._volume.clear()
+        self._pv_sum = 0.0
+        self._volume_sum = 0.0
+
+
+# Indicator names accepted by IndicatorRegistry.get
+INDICATORS: Dict[str, Type[Indicator]] = {
+    'sma': SMA,
+    'ema': EMA,
+    'rsi': RSI,
+    'atr': ATR,
+    'vwap': VWAP,
+}
+
+
+class IndicatorRegistry:
+    """
+    Shared indicators per symbol and timeframe
+
+    get() returns the same instance for the same (symbol, interval, kind,
+    period), and update() feeds every indicator of a symbol and interval
+    once. Each interval ('1m', '1h', ...; None for raw ticks) is a separate
+    stream with its own indicators and its own last applied time. When
+    updates carry a time, repeats of an already-applied time are ignored,
+    so each strategy can forward the prices it sees without double-counting.
+    """
+
+    def __init__(self):
+        self._indicators: Dict[Tuple[str, Optional[str]], Dict[Tuple[str, int], Indicator]] = {}
+        self._last_time: Dict[Tuple[str, Optional[str]], int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, kind: Union[str, Type[Indicator]], period: int,
+            interval: Optional[str] = None) -> Indicator:
+        """
+        Get (or create) a shared indicator
+
+        Args:
+            symbol: Trading pair symbol
+            kind: Indicator name ('sma', 'ema', 'rsi', 'atr', 'vwap') or class
+            period: Indicator period
+            interval: Bar interval the indicator runs on (None: raw ticks)
+
+        Returns:
+            The shared indicator (seed it or wait for updates before reading)
+        """
+        cls = INDICATORS.get(kind.lower()) if isinstance(kind, str) else kind
+        if cls is None:
+            raise ValueError(f"Unknown indicator {kind}. Must be one of {', '.join(INDICATORS)}")
+        key = (cls.__name__, period)
+        with self._lock:
+            indicators = self._indicators.setdefault((symbol, interval), {})
+            indicator = indicators.get(key)
+            if indicator is None:
+                indicator = indicators[key] = cls(period)
+            return indicator
+
+    def update(self, symbol: str, price: float, high: Optional[float] = None, low: Optional[float] = None,
+               volume: float = 0.0, time: Optional[int] = None, interval: Optional[str] = None) -> bool:
+        """
+        Apply a new price (or closed bar) to every indicator of a symbol and interval
+
+        Args:
+            symbol: Trading pair symbol
+            price: Last price (bar close)
+            high: Bar high
+            low: Bar low
+            volume: Traded volume
+            time: Event or bar time; updates at or before the last applied
+                time of this interval are skipped
+            interval: Bar interval of the update (None: raw ticks)
+
+        Returns:
+            Whether the update was applied
+        """
+        stream = (symbol, interval)
+        with self._lock:
+            if time is not None:
+                if time <= self._last_time.get(stream, -1):
+                    return False
+                self._last_time[stream] = time
+            for indicator in self._indicators.get(stream, {}).values():
+                indicator.update(price, high, low, volume)
+            return True
+
+    def update_bar(self, symbol: str, bar, interval: Optional[str] = None) -> bool:
+        """Apply a closed bar (e.g. a backtest Bar) of an interval, keyed by its open time"""
+        return self.update(symbol, bar.close, bar.high, bar.low, bar.volume, bar.open_time, interval)
+
+    def seed(self, symbol: str, close, high=None, low=None, volume=None, time: Optional[int] = None,
+             interval: Optional[str] = None):
+        """
+        Seed every indicator of a symbol and interval from history arrays
+
+        Args:
+            symbol: Trading pair symbol
+            close, high, low, volume: History arrays (oldest first)
+            time: Time of the last history element; older live updates
+                are then skipped
+            interval: Bar interval of the history (None: raw ticks)
+        """
+        stream = (symbol, interval)
+        with self._lock:
+            for indicator in self._indicators.get(stream, {}).values():
+                indicator.seed(close, high, low, volume)
+            if time is not None:
+                self._last_time[stream] = time
+
+    def indicators(self, symbol: str, interval: Optional[str] = None) -> Dict[Tuple[str, int], Indicator]:
+        """Get the indicators registered for a symbol and interval"""
+        with self._lock:
+            return dict(self._indicators.get((symbol, interval), {}))
+
+    def clear(self, symbol: Optional[str] = None, interval: Optional[str] = None):
+        """Drop the indicators of one symbol (all its intervals unless interval is given), or all"""
+        with self._lock:
+            if symbol is None:
+                self._indicators.clear()
+                self._last_time.clear()
+                return
+            for stream in [k for k in self._indicators.keys() | self._last_time.keys() if k[0] == symbol]:
+                if interval is None or stream[1] == interval:
+                    self._indicators.pop(stream, None)
+                    self._last_time.pop(stream, None)
+
+
+# Shared registry for all strategies in the process
+REGISTRY = IndicatorRegistry()
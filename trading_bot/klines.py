@@ -0,0 +1,362 @@
+"""
+Historical kline downloader and memory-mapped columnar kline store
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from .backtest import Bars
+from .config import Config
+from .logger import logger
+
+# Max klines per futures_klines request
+KLINES_LIMIT = 1500
+
+# Interval lengths; '1M' has no fixed length and is paged by last open time
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000, '3d': 259_200_000,
+    '1w': 604_800_000, '1M': 2_592_000_000,
+}
+
+# Stored columns and their position in a futures_klines row
+COLUMNS = (
+    ('open_time', '<i8', 0),
+    ('open', '<f8', 1),
+    ('high', '<f8', 2),
+    ('low', '<f8', 3),
+    ('close', '<f8', 4),
+    ('volume', '<f8', 5),
+    ('quote_volume', '<f8', 7),
+    ('trades', '<i8', 8),
+    ('taker_buy_volume', '<f8', 9),
+)
+
+TimeArg = Union[int, float, str, datetime, None]
+
+
+def _to_ms(value: TimeArg) -> Optional[int]:
+    """Convert a datetime, ISO date string or epoch seconds/ms to epoch ms"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return int(value * 1000) if value < 1e11 else int(value)
+
+
+class KlineStore:
+    """
+    Append-only columnar kline files, read through memory maps
+
+    Each (symbol, interval) series is a directory with one little-endian
+    binary file per column (open_time.i8, close.f8, ...). Appends write
+    raw array bytes to the end of every file; reads map the files with
+    np.memmap, so loading is zero-copy and slicing a time range only
+    touches the pages it needs.
+
+    Readers only see rows present in every column, so they can map a
+    series while a downloader appends to it. A series whose columns have
+    different lengths (an append interrupted mid-way) is truncated back to
+    its last complete row before the next append.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the store
+
+        Args:
+            root: Directory holding the series (default: Config.KLINE_STORE_PATH)
+        """
+        self.root = Path(root or Config.KLINE_STORE_PATH)
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _dir(self, symbol: str, interval: str) -> Path:
+        return self.root / symbol.upper() / interval
+
+    def _path(self, symbol: str, interval: str, name: str, dtype: str) -> Path:
+        return self._dir(symbol, interval) / f"{name}.{dtype[1:]}"
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        key = (symbol.upper(), interval)
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def series(self) -> List[Tuple[str, str]]:
+        """List stored (symbol, interval) series"""
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            (path.parent.name, path.name) for path in self.root.glob('*/*')
+            if (path / 'open_time.i8').exists()
+        )
+
+    def _sizes(self, symbol: str, interval: str) -> Dict[Path, int]:
+        sizes = {}
+        for name, dtype, _ in COLUMNS:
+            path = self._path(symbol, interval, name, dtype)
+            sizes[path] = path.stat().st_size if path.exists() else 0
+        return sizes
+
+    def count(self, symbol: str, interval: str) -> int:
+        """Number of complete rows in a series"""
+        return min(size // 8 for size in self._sizes(symbol, interval).values())
+
+    def _repair(self, symbol: str, interval: str) -> int:
+        """Truncate every column to the last complete row (writers only)"""
+        sizes = self._sizes(symbol, interval)
+        rows = min(size // 8 for size in sizes.values())
+        for path, size in sizes.items():
+            if size != rows * 8:
+                logger.warning("Truncating %s to %s rows (incomplete append)", path, rows)
+                with open(path, 'ab') as f:
+                    f.truncate(rows * 8)
+        return rows
+
+    def last_open_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Open time of the last stored kline (None if the series is empty)"""
+        rows = self.count(symbol, interval)
+        if not rows:
+            return None
+        with open(self._path(symbol, interval, 'open_time', '<i8'), 'rb') as f:
+            f.seek((rows - 1) * 8)
+            return int(np.frombuffer(f.read(8), dtype='<i8')[0])
+
+    def append(self, symbol: str, interval: str, klines: List[list]) -> int:
+        """
+        Append futures_klines rows newer than the last stored one
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval (e.g. '1m')
+            klines: Rows in ascending open time
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock(symbol, interval):
+            rows = self._repair(symbol, interval)
+            if rows:
+                with open(self._path(symbol, interval, 'open_time', '<i8'), 'rb') as f:
+                    f.seek((rows - 1) * 8)
+                    last = int(np.frombuffer(f.read(8), dtype='<i8')[0])
+                klines = [k for k in klines if k[0] > last]
+            if not klines:
+                return 0
+
+            self._dir(symbol, interval).mkdir(parents=True, exist_ok=True)
+            columns = list(zip(*klines))
+            for name, dtype, position in COLUMNS:
+                values = np.asarray(columns[position], dtype=np.float64 if dtype == '<f8' else np.int64)
+                with open(self._path(symbol, interval, name, dtype), 'ab') as f:
+                    f.write(values.astype(dtype, copy=False).tobytes())
+            return len(klines)
+
+    def columns(self, symbol: str, interval: str, start: TimeArg = None,
+                end: TimeArg = None) -> Dict[str, np.ndarray]:
+        """
+        Map a series' columns (read-only, zero-copy)
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval
+            start: First open time to include (datetime, ISO date or epoch)
+            end: Last open time to include
+
+        Returns:
+            {column name: array}, sliced to [start, end]
+        """
+        rows = self.count(symbol, interval)
+        if not rows:
+            return {name: np.empty(0, dtype=dtype) for name, dtype, _ in COLUMNS}
+
+        arrays = {
+            name: np.memmap(self._path(symbol, interval, name, dtype), dtype=dtype, mode='r', shape=(rows,))
+            for name, dtype, _ in COLUMNS
+        }
+        open_time = arrays['open_time']
+        lo = 0 if start is None else int(np.searchsorted(open_time, _to_ms(start), side='left'))
+        hi = rows if end is None else int(np.searchsorted(open_time, _to_ms(end), side='right'))
+        return {name: array[lo:hi] for name, array in arrays.items()}
+
+    def load(self, symbol: str, interval: str, start: TimeArg = None, end: TimeArg = None) -> Bars:
+        """
+        Load a series as backtester Bars (memory-mapped, no copy)
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval
+            start: First open time to include
+            end: Last open time to include
+        """
+        c = self.columns(symbol, interval, start, end)
+        return Bars(c['open_time'], c['open'], c['high'], c['low'], c['close'], c['volume'])
+
+
+class KlineDownloader:
+    """
+    Download klines for many symbols and intervals into a KlineStore
+
+    Every series resumes after its last stored kline. Fixed-length
+    intervals are split into windows of KLINES_LIMIT klines that are
+    requested concurrently (up to `workers` requests in flight across all
+    series) and appended in order. Requests go through `fetch`, normally
+    a BasicBot's rate-limited _call, so downloads queue behind the weight
+    limits instead of running into 429s, and trading calls keep priority.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[..., List[list]],
+        store: KlineStore,
+        workers: int = 8,
+        limit: int = KLINES_LIMIT
+    ):
+        """
+        Initialize the downloader
+
+        Args:
+            fetch: Calls futures_klines, e.g.
+                lambda **p: bot._call('futures_klines', **p)
+            store: Store to append to
+            workers: Max concurrent requests
+            limit: Klines per request
+        """
+        self.fetch = fetch
+        self.store = store
+        self.workers = workers
+        self.limit = limit
+
+    @classmethod
+    def for_bot(cls, bot, store: KlineStore, **kwargs) -> 'KlineDownloader':
+        """Create a downloader that fetches through a bot's rate limiter"""
+        return cls(lambda **params: bot._call('futures_klines', **params), store, **kwargs)
+
+    def download(
+        self,
+        symbols: Iterable[str],
+        intervals: Iterable[str],
+        since: TimeArg,
+        until: TimeArg = None
+    ) -> Dict[Tuple[str, str], int]:
+        """
+        Download or update every (symbol, interval) series
+
+        Args:
+            symbols: Trading pair symbols
+            intervals: Kline intervals (e.g. ['1m', '1h'])
+            since: Start for series with nothing stored yet
+            until: Last open time to download (default: now)
+
+        Returns:
+            {(symbol, interval): rows appended}
+        """
+        for interval in intervals:
+            if interval not in INTERVAL_MS:
+                raise ValueError(f"Invalid interval {interval}. Must be one of {', '.join(INTERVAL_MS)}")
+        jobs = [(symbol.upper(), interval) for symbol in symbols for interval in intervals]
+        since_ms = _to_ms(since)
+        until_ms = _to_ms(until) if until is not None else int(time.time() * 1000)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pages, \
+                ThreadPoolExecutor(max_workers=min(len(jobs), self.workers) or 1) as series:
+            futures = {
+                job: series.submit(self._download_series, pages, job[0], job[1], since_ms, until_ms)
+                for job in jobs
+            }
+            results = {}
+            for job, future in futures.items():
+                try:
+                    results[job] = future.result()
+                except Exception as e:
+                    logger.error("Kline download failed for %s %s: %s", job[0], job[1], e)
+                    results[job] = 0
+        logger.info(
+            "Downloaded %s kline(s) for %s series in %.1fs",
+            sum(results.values()), len(jobs), time.perf_counter() - started
+        )
+        return results
+
+    def _page(self, symbol: str, interval: str, start: int, end: Optional[int],
+              limit: Optional[int] = None) -> List[list]:
+        params = {'symbol': symbol, 'interval': interval, 'startTime': start, 'limit': limit or self.limit}
+        if end is not None:
+            params['endTime'] = end
+        return self.fetch(**params)
+
+    def _download_series(self, pages: ThreadPoolExecutor, symbol: str, interval: str,
+                         since: int, until: int) -> int:
+        last = self.store.last_open_time(symbol, interval)
+        step = INTERVAL_MS[interval]
+        if last is not None:
+            start = last + 1
+        else:
+            # Jump to the first kline at or after `since` (e.g. the listing date)
+            first = self._page(symbol, interval, since, None, limit=1)
+            if not first:
+                return 0
+            start = first[0][0]
+
+        written = 0
+        fixed = interval != '1M'
+        while start <= until:
+            # Klines still open at this moment are not stored
+            closed_before = int(time.time() * 1000)
+            if fixed:
+                span = step * self.limit
+                windows = [(s, min(s + span - 1, until)) for s in range(start, until + 1, span)][:self.workers]
+                batches = list(pages.map(lambda w: self._page(symbol, interval, w[0], w[1]), windows))
+                start = windows[-1][1] + 1
+            else:
+                batches = [self._page(symbol, interval, start, until)]
+                start = batches[0][-1][0] + 1 if batches[0] else until + 1
+
+            for batch in batches:
+                closed = [k for k in batch if k[6] < closed_before]
+                written += self.store.append(symbol, interval, closed)
+                if len(closed) < len(batch):
+                    start = until + 1  # Reached the open kline
+                    break
+        logger.info("%s %s: %s new kline(s)", symbol, interval, written)
+        return written
+
+
+def main():
+    """Download klines into a local store: python -m trading_bot.klines"""
+    import argparse
+    from .bot import BasicBot
+
+    parser = argparse.ArgumentParser(description="Download futures klines into a memory-mapped store")
+    parser.add_argument('symbols', nargs='+', help="Symbols, e.g. BTCUSDT ETHUSDT")
+    parser.add_argument('--interval', nargs='+', default=['1m'], help="Intervals (default: 1m)")
+    parser.add_argument('--since', default='2024-01-01', help="Start for new series (ISO date)")
+    parser.add_argument('--until', default=None, help="End (ISO date, default: now)")
+    parser.add_argument('--root', default=Config.KLINE_STORE_PATH, help="Store directory")
+    parser.add_argument('--workers', type=int, default=8, help="Max concurrent requests")
+    args = parser.parse_args()
+
+    Config.validate()
+    bot = BasicBot(Config.API_KEY, Config.API_SECRET, Config.TESTNET)
+    store = KlineStore(args.root)
+    results = KlineDownloader.for_bot(bot, store, workers=args.workers).download(
+        args.symbols, args.interval, args.since, args.until
+    )
+    for (symbol, interval), count in results.items():
+        print(f"{symbol:>12} {interval:>4}: +{count} ({store.count(symbol, interval)} stored)")
+
+
+if __name__ == '__main__':
+    main()
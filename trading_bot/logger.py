@@ -1,10 +1,99 @@
 """
 Logging configuration for the trading bot
 """
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
 from pathlib import Path
+from .config import Config
+
+
+class _LazyOpenMixin:
+    """Create the log directory when the file is first opened"""
+    
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
+class LazyFileHandler(_LazyOpenMixin, logging.FileHandler):
+    """File handler that creates its directory and file on the first record"""
+    
+    def __init__(self, filename):
+        super().__init__(filename, delay=True)
+
+
+class LazyRotatingFileHandler(_LazyOpenMixin, logging.handlers.RotatingFileHandler):
+    """Size-rotated file handler that creates its directory and file on the first record"""
+    
+    def __init__(self, filename, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+
+
+class JsonFormatter(logging.Formatter):
+    """Compact one-line JSON log records"""
+    
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Non-blocking handler that hands records to a background listener
+    
+    The message and traceback text are resolved before queueing, since
+    the arguments may change (or the traceback be freed) by the time the
+    listener runs; layout and all file/console I/O happen on the listener
+    thread. When the queue is full the record is dropped and counted
+    instead of blocking the caller.
+    """
+    
+    def __init__(self, maxsize: int):
+        super().__init__(queue.Queue(maxsize))
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+    
+    _exc_formatter = logging.Formatter()
+    
+    def prepare(self, record):
+        # Unlike QueueHandler.prepare, keep the record unformatted so the
+        # listener's handlers apply their own layout to it
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.enqueued += 1
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
 
 
 class BotLogger:
@@ -12,27 +101,40 @@ class BotLogger:
     
     def __init__(self, name='TradingBot'):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.DEBUG)
+        file_level = logging.getLevelName(Config.LOG_LEVEL.upper())
+        if not isinstance(file_level, int):
+            file_level = logging.DEBUG
+        # Records below both handler levels are skipped before being built
+        self.logger.setLevel(min(file_level, logging.INFO))
+        self.queue_handler = None
+        self.listener = None
         
         # Prevent duplicate handlers
         if self.logger.handlers:
             return
         
-        # Create logs directory if it doesn't exist
+        # Log filename with timestamp (directory and file are created on
+        # the first record, so importing the package does no disk I/O)
         log_dir = Path('logs')
-        log_dir.mkdir(exist_ok=True)
-        
-        # Create log filename with timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         log_file = log_dir / f'trading_bot_{timestamp}.log'
         
-        # File handler - detailed logs
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        file_format = logging.Formatter(
-            '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        if Config.LOG_JSON:
+            log_file = log_file.with_suffix('.jsonl')
+        
+        # File handler - detailed logs (size-rotated if LOG_MAX_BYTES is set)
+        if Config.LOG_MAX_BYTES > 0:
+            file_handler = LazyRotatingFileHandler(log_file, Config.LOG_MAX_BYTES, Config.LOG_BACKUP_COUNT)
+        else:
+            file_handler = LazyFileHandler(log_file)
+        file_handler.setLevel(file_level)
+        if Config.LOG_JSON:
+            file_format = JsonFormatter()
+        else:
+            file_format = logging.Formatter(
+                '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
         file_handler.setFormatter(file_format)
         
         # Console handler - important logs only
@@ -43,12 +145,22 @@ class BotLogger:
         )
         console_handler.setFormatter(console_format)
         
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Add handlers - directly, or behind a queue drained by a
+        # background listener so callers never wait on disk or console I/O
+        if Config.LOG_ASYNC:
+            self.queue_handler = BoundedQueueHandler(Config.LOG_QUEUE_SIZE)
+            self.listener = logging.handlers.QueueListener(
+                self.queue_handler.queue, file_handler, console_handler,
+                respect_handler_level=True
+            )
+            self.listener.start()
+            atexit.register(self.listener.stop)
+            self.logger.addHandler(self.queue_handler)
+        else:
+            self.logger.addHandler(file_handler)
+            self.logger.addHandler(console_handler)
         
         self.log_file_path = str(log_file)
-        self.logger.info(f"Logging initialized. Log file: {log_file}")
     
     def get_logger(self):
         """Get the logger instance"""
@@ -57,6 +169,18 @@ class BotLogger:
     def get_log_file(self):
         """Get the current log file path"""
         return self.log_file_path
+    
+    def get_stats(self):
+        """Get queue counters (all zero when logging synchronously)"""
+        handler = self.queue_handler
+        if handler is None:
+            return {'queued': 0, 'dropped': 0, 'max_depth': 0, 'depth': 0}
+        return {
+            'queued': handler.enqueued,
+            'dropped': handler.dropped,
+            'max_depth': handler.max_depth,
+            'depth': handler.queue.qsize(),
+        }
 
 
 # Singleton logger instance
@@ -67,3 +191,8 @@ logger = _bot_logger.get_logger()
 def get_log_file_path():
     """Get the current log file path"""
     return _bot_logger.get_log_file()
+
+
+def get_log_stats():
+    """Get log queue counters (queued, dropped, max_depth, depth)"""
+    return _bot_logger.get_stats()
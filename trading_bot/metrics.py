@@ -0,0 +1,328 @@
+"""
+Per-request latency histograms and Prometheus metrics
+"""
+import threading
+from array import array
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from . import exceptions
+from .logger import get_log_stats
+
+# Cumulative buckets (seconds) exposed in the Prometheus histogram
+PROMETHEUS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of durations
+
+    Durations are stored in microseconds in buckets with a fixed relative
+    width (under 1% with 7 sub-bucket bits) up to `max_seconds`, so
+    recording is O(1) without allocation and tail percentiles stay
+    accurate however many values are recorded. Larger values are clamped.
+    """
+
+    __slots__ = ('_sub_bits', '_sub_count', '_half', '_max_us', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, max_seconds: float = 60.0, sub_bucket_bits: int = 7):
+        """
+        Initialize the histogram
+
+        Args:
+            max_seconds: Highest trackable duration
+            sub_bucket_bits: Precision; buckets are 1/2**sub_bucket_bits wide
+                relative to their value
+        """
+        self._sub_bits = sub_bucket_bits
+        self._sub_count = 1 << (sub_bucket_bits + 1)
+        self._half = self._sub_count >> 1
+        self._max_us = int(max_seconds * 1e6)
+        self.counts = array('Q', bytes(8 * (self._index(self._max_us) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def _index(self, us: int) -> int:
+        if us < self._sub_count:
+            return us
+        shift = us.bit_length() - self._sub_bits - 1
+        return self._sub_count + (shift - 1) * self._half + ((us >> shift) - self._half)
+
+    def _upper_us(self, index: int) -> int:
+        """Highest value (us) that falls in a bucket"""
+        if index < self._sub_count:
+            return index
+        offset = index - self._sub_count
+        shift = offset // self._half + 1
+        sub = offset % self._half + self._half
+        return ((sub + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        """Record one duration"""
+        us = min(max(int(seconds * 1e6), 0), self._max_us)
+        self.counts[self._index(us)] += 1
+        if not self.count or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Get a percentile in seconds
+
+        Args:
+            q: Percentile (0-100)
+
+        Returns:
+            Upper bound of the bucket holding the percentile (0 if empty)
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, int(-(-q * self.count // 100)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= target:
+                    return min(self._upper_us(index) / 1e6, self.max)
+        return self.max
+
+    def count_at_or_below(self, seconds: float) -> int:
+        """
+        Number of recorded values at or below a bound (bucket precision)
+
+        Only buckets that end at or below the bound are counted, so a bucket
+        straddling it never adds values above the bound.
+        """
+        us = int(seconds * 1e6)
+        if us >= self._max_us:
+            return self.count
+        index = self._index(us)
+        if self._upper_us(index) > us:
+            index -= 1
+        return sum(self.counts[:index + 1])
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+def classify(error: Optional[BaseException]) -> Tuple[str, str]:
+    """
+    Get the (outcome, code) labels for a request result
+
+    Returns:
+        ('success', ''), ('api_error', <Binance error code>),
+        ('timeout', <exception name>) or ('error', <exception name>)
+    """
+    if error is None:
+        return 'success', ''
+    if isinstance(error, exceptions.BinanceAPIException):
+        return 'api_error', str(error.code)
+    name = type(error).__name__
+    # Covers TimeoutError/asyncio.TimeoutError and requests/aiohttp timeouts
+    if isinstance(error, TimeoutError) or 'Timeout' in name:
+        return 'timeout', name
+    return 'error', name
+
+
+def _labels(**labels: str) -> str:
+    return ','.join(f'{k}="{str(v)}"' for k, v in labels.items())
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of request histograms, weight counters and gauges
+
+    Histograms are keyed by (endpoint, outcome, code); weight is counted
+    per endpoint. render_prometheus() produces the text exposition format.
+    """
+
+    def __init__(self, max_seconds: float = 60.0):
+        self.max_seconds = max_seconds
+        self._histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self._weight: Dict[str, int] = defaultdict(int)
+        self._gauges: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, seconds: float, weight: int = 0, error: Optional[BaseException] = None):
+        """
+        Record one exchange request
+
+        Args:
+            endpoint: Client method name or API path
+            seconds: Request duration (excluding rate-limiter waits)
+            weight: Request weight consumed
+            error: Exception raised by the request, if any
+        """
+        key = (endpoint,) + classify(error)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.max_seconds)
+            histogram.record(seconds)
+            self._weight[endpoint] += weight
+
+    def percentile(self, endpoint: str, q: float, min_count: int = 20) -> Optional[float]:
+        """
+        Get a latency percentile (seconds) of an endpoint's successful requests
+
+        Returns:
+            None until at least min_count requests have been recorded
+        """
+        with self._lock:
+            histogram = self._histograms.get((endpoint, 'success', ''))
+            if histogram is None or histogram.count < min_count:
+                return None
+            return histogram.percentile(q)
+
+    def set_gauge(self, name: str, value: float, help_text: str = ''):
+        """Set a gauge exposed as trading_bot_<name>"""
+        with self._lock:
+            self._gauges[name] = (help_text, value)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._weight.clear()
+            self._gauges.clear()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Summarize every (endpoint, outcome, code) series
+
+        Returns:
+            Rows with endpoint, outcome, code, count, mean/p50/p99/p999/max
+            in milliseconds, error_rate (per endpoint) and weight
+        """
+        with self._lock:
+            items = sorted(self._histograms.items())
+            totals = defaultdict(int)
+            errors = defaultdict(int)
+            for (endpoint, outcome, _), histogram in items:
+                totals[endpoint] += histogram.count
+                if outcome != 'success':
+                    errors[endpoint] += histogram.count
+            return [
+                {
+                    'endpoint': endpoint,
+                    'outcome': outcome,
+                    'code': code,
+                    'count': h.count,
+                    'mean_ms': h.mean * 1000,
+                    'p50_ms': h.percentile(50) * 1000,
+                    'p99_ms': h.percentile(99) * 1000,
+                    'p999_ms': h.percentile(99.9) * 1000,
+                    'max_ms': h.max * 1000,
+                    'error_rate': errors[endpoint] / totals[endpoint],
+                    'weight': self._weight[endpoint],
+                }
+                for (endpoint, outcome, code), h in items
+            ]
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            items = sorted(self._histograms.items())
+            weights = sorted(self._weight.items())
+            gauges = sorted(self._gauges.items())
+
+            lines.append('# HELP trading_bot_request_duration_seconds Exchange request latency')
+            lines.append('# TYPE trading_bot_request_duration_seconds histogram')
+            for (endpoint, outcome, code), h in items:
+                labels = _labels(endpoint=endpoint, outcome=outcome, code=code)
+                for bound in PROMETHEUS_BUCKETS:
+                    lines.append(
+                        f'trading_bot_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                        f'{h.count_at_or_below(bound)}'
+                    )
+                lines.append(f'trading_bot_request_duration_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f'trading_bot_request_duration_seconds_sum{{{labels}}} {h.total:.6f}')
+                lines.append(f'trading_bot_request_duration_seconds_count{{{labels}}} {h.count}')
+
+            lines.append('# HELP trading_bot_request_latency_quantile_seconds Exchange request latency '
+                         'percentiles since start (HDR histogram)')
+            lines.append('# TYPE trading_bot_request_latency_quantile_seconds gauge')
+            for (endpoint, outcome, code), h in items:
+                for q in QUANTILES:
+                    labels = _labels(endpoint=endpoint, outcome=outcome, code=code, quantile=q)
+                    lines.append(f'trading_bot_request_latency_quantile_seconds{{{labels}}} '
+                                 f'{h.percentile(q * 100):.6f}')
+
+            lines.append('# HELP trading_bot_request_weight_total Request weight consumed')
+            lines.append('# TYPE trading_bot_request_weight_total counter')
+            for endpoint, weight in weights:
+                lines.append(f'trading_bot_request_weight_total{{{_labels(endpoint=endpoint)}}} {weight}')
+
+        for name, (help_text, value) in gauges:
+            lines.append(f'# HELP trading_bot_{name} {help_text}')
+            lines.append(f'# TYPE trading_bot_{name} gauge')
+            lines.append(f'trading_bot_{name} {value}')
+
+        log_stats = get_log_stats()
+        lines.append('# HELP trading_bot_log_records_dropped_total Log records dropped by a full queue')
+        lines.append('# TYPE trading_bot_log_records_dropped_total counter')
+        lines.append(f"trading_bot_log_records_dropped_total {log_stats['dropped']}")
+        return '\n'.join(lines) + '\n'
+
+
+# Shared registry for all bots in the process
+REGISTRY = MetricsRegistry()
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_http_server(port: int, host: str = '127.0.0.1', registry: MetricsRegistry = REGISTRY):
+    """
+    Serve GET /metrics in the Prometheus text format from a daemon thread
+
+    Calling it again while a server is running returns the existing server.
+
+    Args:
+        port: Port to listen on (0 picks a free port; see server.server_port)
+        host: Interface to listen on
+        registry: Registry to expose
+
+    Returns:
+        The running ThreadingHTTPServer
+    """
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the console
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name='MetricsServer', daemon=True).start()
+        return _server
+
+
+def stop_http_server():
+    """Stop the metrics endpoint if it is running"""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
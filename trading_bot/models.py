@@ -0,0 +1,233 @@
+"""
+Typed response models and the fast JSON decoder
+
+REST responses are nested dicts of strings, and every consumer used to
+float() the same fields again. These NamedTuples keep the fields the bot
+uses with numbers converted once at decode time. Repeated strings
+(symbol, side, status, ...) are interned, so a cached Order takes a
+fraction of the memory of its dict. to_dict() rebuilds the REST shape
+for code that expects raw records; it covers the modelled fields only
+and writes numbers in their shortest form ('50000.10' -> '50000.1'), so
+keep the original dict where the exact REST record matters.
+
+loads() is orjson.loads when orjson is installed, else json.loads; it
+accepts the raw response bytes.
+"""
+import json
+import sys
+from typing import Any, Dict, List, NamedTuple
+from .orders import format_number as _num
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+_intern = sys.intern
+# Builds a NamedTuple without __new__'s argument handling (over half the construction cost)
+_new = tuple.__new__
+
+
+class Order(NamedTuple):
+    """An order (futures_get_open_orders / futures_create_order / ORDER_TRADE_UPDATE)"""
+    order_id: int
+    symbol: str
+    status: str
+    client_order_id: str
+    price: float
+    avg_price: float
+    orig_qty: float
+    executed_qty: float
+    time_in_force: str
+    type: str
+    orig_type: str
+    reduce_only: bool
+    close_position: bool
+    side: str
+    position_side: str
+    stop_price: float
+    working_type: str
+    update_time: int
+
+    @classmethod
+    def from_dict(cls, o: Dict[str, Any]) -> 'Order':
+        """Build from a REST order record"""
+        order_type = _intern(o['type'])
+        return _new(cls, (
+            o['orderId'], _intern(o['symbol']), _intern(o['status']), o.get('clientOrderId', ''),
+            float(o.get('price', 0)), float(o.get('avgPrice', 0)),
+            float(o['origQty']), float(o.get('executedQty', 0)),
+            _intern(o.get('timeInForce', 'GTC')), order_type, _intern(o.get('origType', order_type)),
+            o.get('reduceOnly', False), o.get('closePosition', False),
+            _intern(o['side']), _intern(o.get('positionSide', 'BOTH')), float(o.get('stopPrice', 0)),
+            _intern(o.get('workingType', 'CONTRACT_PRICE')), o.get('updateTime', o.get('time', 0))
+        ))
+
+    @classmethod
+    def from_event(cls, o: Dict[str, Any]) -> 'Order':
+        """Build from the 'o' payload of an ORDER_TRADE_UPDATE event"""
+        order_type = _intern(o['o'])
+        return _new(cls, (
+            o['i'], _intern(o['s']), _intern(o['X']), o['c'],
+            float(o['p']), float(o['ap']), float(o['q']), float(o['z']),
+            _intern(o['f']), order_type, _intern(o.get('ot', order_type)),
+            o.get('R', False), o.get('cp', False),
+            _intern(o['S']), _intern(o.get('ps', 'BOTH')), float(o.get('sp', 0)),
+            _intern(o.get('wt', 'CONTRACT_PRICE')), o['T']
+        ))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rebuild the REST record (numbers as strings)"""
+        return {
+            'orderId': self.order_id,
+            'symbol': self.symbol,
+            'status': self.status,
+            'clientOrderId': self.client_order_id,
+            'price': _num(self.price),
+            'avgPrice': _num(self.avg_price),
+            'origQty': _num(self.orig_qty),
+            'executedQty': _num(self.executed_qty),
+            'timeInForce': self.time_in_force,
+            'type': self.type,
+            'origType': self.orig_type,
+            'reduceOnly': self.reduce_only,
+            'closePosition': self.close_position,
+            'side': self.side,
+            'positionSide': self.position_side,
+            'stopPrice': _num(self.stop_price),
+            'workingType': self.working_type,
+            'updateTime': self.update_time,
+        }
+
+
+class Position(NamedTuple):
+    """A position record (futures_position_information)"""
+    symbol: str
+    position_side: str
+    position_amt: float
+    entry_price: float
+    break_even_price: float
+    mark_price: float
+    unrealized_profit: float
+    liquidation_price: float
+    leverage: int
+    margin_type: str
+    isolated_wallet: float
+    notional: float
+    update_time: int
+
+    @classmethod
+    def from_dict(cls, p: Dict[str, Any]) -> 'Position':
+        """Build from a REST (or mirrored) position record"""
+        return _new(cls, (
+            _intern(p['symbol']), _intern(p.get('positionSide', 'BOTH')),
+            float(p.get('positionAmt', 0)), float(p.get('entryPrice', 0)),
+            float(p.get('breakEvenPrice', 0)), float(p.get('markPrice', 0)),
+            float(p.get('unRealizedProfit', 0)), float(p.get('liquidationPrice', 0)),
+            int(p.get('leverage', 0)), _intern(p.get('marginType', 'cross')),
+            float(p.get('isolatedWallet', 0)), float(p.get('notional', 0)), p.get('updateTime', 0)
+        ))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rebuild the REST record (numbers as strings)"""
+        return {
+            'symbol': self.symbol,
+            'positionSide': self.position_side,
+            'positionAmt': _num(self.position_amt),
+            'entryPrice': _num(self.entry_price),
+            'breakEvenPrice': _num(self.break_even_price),
+            'markPrice': _num(self.mark_price),
+            'unRealizedProfit': _num(self.unrealized_profit),
+            'liquidationPrice': _num(self.liquidation_price),
+            'leverage': str(self.leverage),
+            'marginType': self.margin_type,
+            'isolatedWallet': _num(self.isolated_wallet),
+            'notional': _num(self.notional),
+            'updateTime': self.update_time,
+        }
+
+
+class Balance(NamedTuple):
+    """One asset of the futures account ('assets' entries of futures_account)"""
+    asset: str
+    wallet_balance: float
+    unrealized_profit: float
+    margin_balance: float
+    available_balance: float
+    cross_wallet_balance: float
+    update_time: int
+
+    @classmethod
+    def from_dict(cls, a: Dict[str, Any]) -> 'Balance':
+        """Build from an account asset record"""
+        return _new(cls, (
+            _intern(a['asset']), float(a.get('walletBalance', 0)), float(a.get('unrealizedProfit', 0)),
+            float(a.get('marginBalance', 0)), float(a.get('availableBalance', 0)),
+            float(a.get('crossWalletBalance', 0)), a.get('updateTime', 0)
+        ))
+
+    @classmethod
+    def from_account(cls, account: Dict[str, Any]) -> List['Balance']:
+        """Build one Balance per asset of a futures_account() response"""
+        return [cls.from_dict(a) for a in account.get('assets', [])]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rebuild the REST record (numbers as strings)"""
+        return {
+            'asset': self.asset,
+            'walletBalance': _num(self.wallet_balance),
+            'unrealizedProfit': _num(self.unrealized_profit),
+            'marginBalance': _num(self.margin_balance),
+            'availableBalance': _num(self.available_balance),
+            'crossWalletBalance': _num(self.cross_wallet_balance),
+            'updateTime': self.update_time,
+        }
+
+
+class Fill(NamedTuple):
+    """A trade of ours (futures_account_trades)"""
+    trade_id: int
+    order_id: int
+    symbol: str
+    side: str
+    price: float
+    qty: float
+    quote_qty: float
+    realized_pnl: float
+    commission: float
+    commission_asset: str
+    maker: bool
+    buyer: bool
+    position_side: str
+    time: int
+
+    @classmethod
+    def from_dict(cls, t: Dict[str, Any]) -> 'Fill':
+        """Build from a userTrades record"""
+        return _new(cls, (
+            t['id'], t['orderId'], _intern(t['symbol']), _intern(t.get('side', '')),
+            float(t['price']), float(t['qty']), float(t.get('quoteQty', 0)),
+            float(t.get('realizedPnl', 0)), float(t.get('commission', 0)),
+            _intern(t.get('commissionAsset', '')), bool(t.get('maker')), bool(t.get('buyer')),
+            _intern(t.get('positionSide', 'BOTH')), t['time']
+        ))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rebuild the REST record (numbers as strings)"""
+        return {
+            'id': self.trade_id,
+            'orderId': self.order_id,
+            'symbol': self.symbol,
+            'side': self.side,
+            'price': _num(self.price),
+            'qty': _num(self.qty),
+            'quoteQty': _num(self.quote_qty),
+            'realizedPnl': _num(self.realized_pnl),
+            'commission': _num(self.commission),
+            'commissionAsset': self.commission_asset,
+            'maker': self.maker,
+            'buyer': self.buyer,
+            'positionSide': self.position_side,
+            'time': self.time,
+        }
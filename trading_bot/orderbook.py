@@ -0,0 +1,278 @@
+"""
+Local order book maintained from the futures depth stream
+"""
+import asyncio
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .config import Config
+from .logger import logger
+from .orders import format_decimal, _decimals
+from .streams import StreamThread
+
+
+class BookSide:
+    """
+    One side of the book as parallel sorted arrays keyed by integer ticks
+
+    Ticks are stored so that the best level is always the last element
+    (bids ascending, asks as negated ticks ascending): reading the top of
+    book is O(1), updates near the top touch the end of the arrays, and
+    walking N levels is a reverse scan.
+    """
+
+    __slots__ = ('sign', 'ticks', 'qtys')
+
+    def __init__(self, is_bid: bool):
+        self.sign = 1 if is_bid else -1
+        self.ticks = array('q')
+        self.qtys = array('d')
+
+    def __len__(self) -> int:
+        return len(self.ticks)
+
+    def clear(self):
+        self.ticks = array('q')
+        self.qtys = array('d')
+
+    def update(self, tick: int, qty: float):
+        """Set the quantity at a price level (0 removes the level)"""
+        key = tick * self.sign
+        ticks = self.ticks
+        i = bisect_left(ticks, key)
+        if i < len(ticks) and ticks[i] == key:
+            if qty:
+                self.qtys[i] = qty
+            else:
+                del ticks[i]
+                del self.qtys[i]
+        elif qty:
+            ticks.insert(i, key)
+            self.qtys.insert(i, qty)
+
+    def best(self) -> Optional[Tuple[int, float]]:
+        """Get (tick, qty) of the best level"""
+        if not self.ticks:
+            return None
+        return self.ticks[-1] * self.sign, self.qtys[-1]
+
+    def levels(self, depth: Optional[int] = None) -> Iterator[Tuple[int, float]]:
+        """Iterate (tick, qty) from the best level outwards"""
+        n = len(self.ticks)
+        stop = -1 if depth is None else max(n - depth - 1, -1)
+        for i in range(n - 1, stop, -1):
+            yield self.ticks[i] * self.sign, self.qtys[i]
+
+
+class OrderBook:
+    """Price-level order book for one symbol"""
+
+    def __init__(self, symbol: str, tick_size: float):
+        """
+        Initialize an empty book
+
+        Args:
+            symbol: Trading pair symbol
+            tick_size: Price tick size (prices are stored as integer ticks)
+        """
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self.price_decimals = _decimals(format_decimal(tick_size))
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id = 0
+        self.updated = 0.0
+
+    def to_tick(self, price: str) -> int:
+        return round(float(price) / self.tick_size)
+
+    def to_price(self, tick: float) -> float:
+        return round(tick * self.tick_size, self.price_decimals)
+
+    def load_snapshot(self, snapshot: Dict[str, Any]):
+        """Replace the book with a REST depth snapshot"""
+        self.bids.clear()
+        self.asks.clear()
+        self.apply_levels(snapshot['bids'], snapshot['asks'])
+        self.last_update_id = snapshot['lastUpdateId']
+        self.updated = time.monotonic()
+
+    def apply_levels(self, bids: List[List[str]], asks: List[List[str]]):
+        """Apply [price, qty] level updates"""
+        for price, qty in bids:
+            self.bids.update(self.to_tick(price), float(qty))
+        for price, qty in asks:
+            self.asks.update(self.to_tick(price), float(qty))
+
+    def best_bid(self) -> Optional[float]:
+        best = self.bids.best()
+        return self.to_price(best[0]) if best else None
+
+    def best_ask(self) -> Optional[float]:
+        best = self.asks.best()
+        return self.to_price(best[0]) if best else None
+
+    def mid_price(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def estimate_fill(self, side: str, quantity: float) -> Dict[str, Any]:
+        """
+        Estimate the fill of a market order by walking the book
+
+        Args:
+            side: 'BUY' (walks asks) or 'SELL' (walks bids)
+            quantity: Order quantity
+
+        Returns:
+            Dict with avg_price, worst_price, filled_qty, levels, and
+            slippage_bps measured against the mid price
+        """
+        book_side = self.asks if side == 'BUY' else self.bids
+        remaining = quantity
+        cost = 0.0
+        worst_tick = None
+        levels = 0
+        for tick, qty in book_side.levels():
+            take = qty if qty < remaining else remaining
+            cost += take * tick
+            remaining -= take
+            worst_tick = tick
+            levels += 1
+            if remaining <= 0:
+                break
+
+        filled = quantity - remaining
+        avg_price = cost / filled * self.tick_size if filled else None
+        mid = self.mid_price()
+        slippage_bps = None
+        if avg_price is not None and mid:
+            slippage_bps = (avg_price - mid) / mid * 1e4 * (1 if side == 'BUY' else -1)
+
+        return {
+            'avg_price': avg_price,
+            'worst_price': self.to_price(worst_tick) if worst_tick is not None else None,
+            'filled_qty': filled,
+            'levels': levels,
+            'slippage_bps': slippage_bps,
+            'complete': remaining <= 0,
+        }
+
+
+class DepthStream:
+    """
+    Keep an OrderBook in sync with the `<symbol>@depth@100ms` diff stream
+
+    Follows the Binance futures procedure: buffer the stream, load a REST
+    snapshot, drop events older than the snapshot, then check that every
+    event's `pu` equals the previous event's `u`. Any gap triggers a resync
+    from a fresh snapshot. Snapshots are fetched off the stream loop
+    (retried with backoff if the request fails); events arriving meanwhile
+    wait in the socket buffer.
+    """
+
+    def __init__(self, bot, symbol: str, tick_size: Optional[float] = None, snapshot_limit: int = 1000):
+        """
+        Initialize the stream
+
+        Args:
+            bot: BasicBot used for the REST snapshot
+            symbol: Trading pair symbol
+            tick_size: Price tick size (default: from the bot's symbol filters)
+            snapshot_limit: Depth of the REST snapshot
+        """
+        symbol = symbol.upper()
+        if tick_size is None:
+            filters = bot._filters(symbol)
+            tick_size = filters.tick_size if filters is not None and filters.tick_size else 1e-8
+        self.bot = bot
+        self.book = OrderBook(symbol, tick_size)
+        self.snapshot_limit = snapshot_limit
+        self.synced = False
+        self.resyncs = 0
+        self._first_event = False
+        self._lock = threading.Lock()
+        self._stream = StreamThread(
+            f"{Config.get_ws_url(bot.testnet)}/ws/{symbol.lower()}@depth@100ms",
+            on_message=self._on_message,
+            name=f"DepthStream-{symbol}",
+            on_connect=self._resync
+        )
+
+    def start(self):
+        self._stream.start()
+
+    def stop(self):
+        self._stream.stop()
+        self.synced = False
+
+    def is_fresh(self, max_age: float) -> bool:
+        """Check whether the book is synced and was updated within max_age seconds"""
+        return self.synced and self._stream.connected and time.monotonic() - self.book.updated <= max_age
+
+    async def _resync(self):
+        self.synced = False
+        self._first_event = False
+        delay = 1.0
+        while True:
+            try:
+                snapshot = await self._stream.call_blocking(self._snapshot)
+                break
+            except Exception as e:
+                if self._stream.stopping:
+                    return
+                # Retry rather than wait for a reconnect: until a snapshot
+                # loads every event is dropped and the book stays frozen
+                logger.error("Could not load %s depth snapshot, retrying in %.0fs: %s", self.book.symbol, delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+            if self._stream.stopping:
+                return
+        with self._lock:
+            self.book.load_snapshot(snapshot)
+        self.resyncs += 1
+        self._first_event = True
+        logger.info("Order book %s synced at update %s", self.book.symbol, self.book.last_update_id)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return self.bot._call('futures_order_book', symbol=self.book.symbol, limit=self.snapshot_limit)
+
+    async def _on_message(self, event: Dict[str, Any]):
+        if event.get('e') != 'depthUpdate':
+            return
+        if not self.synced and not self._first_event:
+            return  # No snapshot yet
+
+        book = self.book
+        if event['u'] < book.last_update_id:
+            return  # Older than the snapshot
+
+        if self._first_event:
+            # Continuous with the snapshot if it spans it or starts right after it
+            if event['U'] > book.last_update_id and event.get('pu') != book.last_update_id:
+                logger.warning("Order book %s: snapshot is behind the stream, resyncing", book.symbol)
+                await self._resync()
+                return
+            self._first_event = False
+        elif event['pu'] != book.last_update_id:
+            logger.warning(
+                "Order book %s: sequence gap (pu=%s, expected %s), resyncing",
+                book.symbol, event['pu'], book.last_update_id
+            )
+            await self._resync()
+            return
+
+        with self._lock:
+            book.apply_levels(event['b'], event['a'])
+            book.last_update_id = event['u']
+            book.updated = time.monotonic()
+        self.synced = True
+
+    def estimate_fill(self, side: str, quantity: float) -> Dict[str, Any]:
+        """Thread-safe OrderBook.estimate_fill"""
+        with self._lock:
+            return self.book.estimate_fill(side, quantity)
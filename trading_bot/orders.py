@@ -1,13 +1,27 @@
 """
 Order management and validation utilities
-TODO: Maybe add order history tracking in future version
 """
+import json
+import math
+import os
+import threading
+import time
 from enum import Enum
-from typing import Dict, Any
-from rich.table import Table
-from rich.console import Console
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Optional, Callable, TYPE_CHECKING
+from .config import Config
+from .fixedpoint import DEFAULT_SCALE, Fixed, Grid, parse_units, decimals as _decimals
+from .logger import logger
+from .retry import validate_client_order_id
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.table import Table
+
+# Max orders per futures batchOrders request
+BATCH_ORDER_LIMIT = 5
+
+# Max order ids per batch cancel request
+BATCH_CANCEL_LIMIT = 10
 
 
 class OrderSide(Enum):
@@ -31,6 +45,8 @@ class OrderValidator:
     @staticmethod
     def validate_symbol(symbol: str) -> str:
         """Validate and format symbol"""
+        if not isinstance(symbol, str):
+            raise ValueError("Invalid symbol. Must be a string such as BTCUSDT")
         symbol = symbol.upper().strip()
         if not symbol:
             raise ValueError("Symbol cannot be empty")
@@ -61,18 +77,448 @@ class OrderValidator:
     @staticmethod
     def validate_side(side: str) -> str:
         """Validate order side"""
+        if not isinstance(side, str):
+            raise ValueError("Invalid side. Must be BUY or SELL")
         side = side.upper().strip()
         if side not in [OrderSide.BUY.value, OrderSide.SELL.value]:
             raise ValueError(f"Invalid side. Must be BUY or SELL")
         return side
+    
+    @staticmethod
+    def validate_filters(
+        filters: Optional['SymbolFilters'],
+        quantity: float,
+        price: Optional[float] = None,
+        market: bool = False
+    ) -> Tuple[float, Optional[float]]:
+        """
+        Snap quantity/price to the symbol grid and check exchange filters
+        
+        Args:
+            filters: Symbol filters from SymbolInfoCache (None skips the check)
+            quantity: Validated order quantity
+            price: Validated limit price (None for market orders)
+            market: Use MARKET_LOT_SIZE instead of LOT_SIZE
+            
+        Returns:
+            (quantity, price) rounded to step size and tick size
+        """
+        if filters is None:
+            return quantity, price
+        qty, price = OrderValidator.validate_filters_fixed(filters, quantity, price, market)
+        return float(qty), None if price is None else float(price)
+    
+    @staticmethod
+    def validate_filters_fixed(
+        filters: Optional['SymbolFilters'],
+        quantity: float,
+        price: Optional[float] = None,
+        market: bool = False
+    ) -> Tuple[Fixed, Optional[Fixed]]:
+        """
+        Like validate_filters, but return fixed-point values at the symbol's precision
+        
+        Snapping and the bounds/notional checks are integer operations;
+        str() of the results is the exact exchange encoding. Without
+        filters the values are only rounded to DEFAULT_SCALE decimals.
+        """
+        if filters is None:
+            return (
+                Fixed.from_float(quantity, DEFAULT_SCALE),
+                None if price is None else Fixed.from_float(price, DEFAULT_SCALE)
+            )
+        
+        lot = filters.market_lot_grid if market else filters.lot_grid
+        qty = lot.floor_units(quantity)
+        if qty < lot.min_units:
+            min_qty = filters.quantity_bounds(market)[0]
+            raise ValueError(f"Quantity {quantity} is below minimum {min_qty} for {filters.symbol}")
+        if lot.max_units and qty > lot.max_units:
+            max_qty = filters.quantity_bounds(market)[1]
+            raise ValueError(f"Quantity {quantity} is above maximum {max_qty} for {filters.symbol}")
+        if price is None:
+            return Fixed(qty, lot.scale), None
+        
+        grid = filters.price_grid
+        units = grid.round_units(price)
+        if units < grid.min_units or (grid.max_units and units > grid.max_units):
+            raise ValueError(
+                f"Price {grid.format(units)} is outside [{filters.min_price}, {filters.max_price}] for {filters.symbol}"
+            )
+        # Notional in units of 10**-(lot scale + price scale)
+        if qty * units < filters.min_notional_units:
+            notional = Fixed(qty * units, lot.scale + grid.scale)
+            raise ValueError(
+                f"Order notional {float(notional):.8f} is below minimum {filters.min_notional} for {filters.symbol}"
+            )
+        return Fixed(qty, lot.scale), Fixed(units, grid.scale)
+    
+    @staticmethod
+    def snap_price(filters: Optional['SymbolFilters'], price: float) -> Fixed:
+        """Round a price (e.g. a stop price) to the tick size as a fixed-point value"""
+        if filters is None:
+            return Fixed.from_float(price, DEFAULT_SCALE)
+        return filters.price_grid.round(price)
+    
+    @staticmethod
+    def validate_order_spec(
+        spec: Dict[str, Any],
+        filters: Optional['SymbolFilters'] = None
+    ) -> Dict[str, str]:
+        """
+        Validate an order spec and build exchange order parameters
+        
+        Args:
+            spec: Order spec with 'symbol', 'side', 'type' ('MARKET', 'LIMIT'
+                or 'STOP'), 'quantity' and, depending on type, 'price',
+                'stop_price' and 'time_in_force'; optionally 'client_order_id'
+            filters: Optional symbol filters to snap and check against
+            
+        Returns:
+            Order parameters ready for the exchange (all values as strings)
+        """
+        order_type = str(spec.get('type', OrderType.MARKET.value)).upper().strip()
+        if order_type == 'STOP_LIMIT':
+            order_type = OrderType.STOP.value
+        if order_type not in [OrderType.MARKET.value, OrderType.LIMIT.value, OrderType.STOP.value]:
+            raise ValueError(f"Invalid order type. Must be MARKET, LIMIT or STOP")
+        
+        market = order_type == OrderType.MARKET.value
+        quantity = OrderValidator.validate_quantity(spec.get('quantity'))
+        price = None if market else OrderValidator.validate_price(spec.get('price'))
+        quantity, price = OrderValidator.validate_filters_fixed(filters, quantity, price, market=market)
+        
+        params = {
+            'symbol': OrderValidator.validate_symbol(spec.get('symbol', '')),
+            'side': OrderValidator.validate_side(spec.get('side', '')),
+            'type': order_type,
+            'quantity': str(quantity),
+        }
+        
+        if not market:
+            params['price'] = str(price)
+            params['timeInForce'] = str(spec.get('time_in_force', 'GTC')).upper()
+        if order_type == OrderType.STOP.value:
+            stop_price = OrderValidator.validate_price(spec.get('stop_price'))
+            params['stopPrice'] = str(OrderValidator.snap_price(filters, stop_price))
+        if spec.get('client_order_id'):
+            params['newClientOrderId'] = validate_client_order_id(spec['client_order_id'])
+        
+        return params
+
+
+def format_decimal(value: float, significant: Optional[int] = None) -> str:
+    """Format a number as a plain decimal string (no exponent notation), optionally rounded to significant digits"""
+    if significant is not None:
+        value = float(f"{value:.{significant}g}")
+    text = f"{value:.10f}".rstrip('0').rstrip('.')
+    return text or '0'
+
+
+def format_number(value: float) -> str:
+    """
+    Format a float parsed from an exchange string without the rounding of format_decimal
+
+    The shortest repr round-trips, so this gives back the exchange string
+    minus trailing zeros, and is several times faster than format_decimal.
+    """
+    if value.is_integer():
+        return str(int(value))
+    text = repr(value)
+    return format_decimal(value) if 'e' in text else text
+
+
+def format_percent(value: float) -> str:
+    """Format a ratio as a percentage ('-' for infinite/undefined ratios)"""
+    return f"{value * 100:.2f}%" if math.isfinite(value) else "-"
+
+
+class SymbolFilters:
+    """Trading rules for one symbol, indexed from exchangeInfo"""
+    
+    __slots__ = (
+        'symbol', 'tick_size', 'price_decimals', 'min_price', 'max_price',
+        'step_size', 'quantity_decimals', 'min_qty', 'max_qty',
+        'market_step_size', 'market_quantity_decimals', 'market_min_qty', 'market_max_qty',
+        'min_notional', 'price_grid', 'lot_grid', 'market_lot_grid', 'min_notional_units'
+    )
+    
+    def __init__(self, symbol_info: Dict[str, Any]):
+        """
+        Build filters from one exchangeInfo 'symbols' entry
+        
+        Args:
+            symbol_info: Symbol entry from futures_exchange_info()
+        """
+        filters = {f['filterType']: f for f in symbol_info.get('filters', [])}
+        price_filter = filters.get('PRICE_FILTER', {})
+        lot_size = filters.get('LOT_SIZE', {})
+        market_lot_size = filters.get('MARKET_LOT_SIZE', lot_size)
+        
+        self.symbol = symbol_info['symbol']
+        tick = price_filter.get('tickSize', '0')
+        self.tick_size = float(tick)
+        self.price_decimals = _decimals(tick)
+        self.min_price = float(price_filter.get('minPrice', 0))
+        self.max_price = float(price_filter.get('maxPrice', 0))
+        
+        step = lot_size.get('stepSize', '0')
+        self.step_size = float(step)
+        self.quantity_decimals = _decimals(step)
+        self.min_qty = float(lot_size.get('minQty', 0))
+        self.max_qty = float(lot_size.get('maxQty', 0))
+        
+        market_step = market_lot_size.get('stepSize', step)
+        self.market_step_size = float(market_step)
+        self.market_quantity_decimals = _decimals(market_step)
+        self.market_min_qty = float(market_lot_size.get('minQty', self.min_qty))
+        self.market_max_qty = float(market_lot_size.get('maxQty', self.max_qty))
+        
+        notional = filters.get('MIN_NOTIONAL', {}).get('notional', '0')
+        self.min_notional = float(notional)
+        
+        # Fixed-point grids (scale from the tick/step size) for exact snapping
+        self.price_grid = Grid(tick, price_filter.get('minPrice', '0'), price_filter.get('maxPrice', '0'))
+        self.lot_grid = Grid(step, lot_size.get('minQty', '0'), lot_size.get('maxQty', '0'))
+        self.market_lot_grid = Grid(
+            market_step, market_lot_size.get('minQty', lot_size.get('minQty', '0')),
+            market_lot_size.get('maxQty', lot_size.get('maxQty', '0'))
+        )
+        self.min_notional_units = parse_units(str(notional), self.lot_grid.scale + self.price_grid.scale)
+    
+    def round_price(self, price: float) -> float:
+        """Snap a price to the nearest tick"""
+        if not self.tick_size:
+            return price
+        return float(self.price_grid.round(price))
+    
+    def round_quantity(self, quantity: float, market: bool = False) -> float:
+        """Round a quantity down to the step size"""
+        if not (self.market_step_size if market else self.step_size):
+            return quantity
+        return float(self.quantity_grid(market).floor(quantity))
+    
+    def quantity_grid(self, market: bool = False) -> Grid:
+        """Get the LOT_SIZE (or MARKET_LOT_SIZE) grid"""
+        return self.market_lot_grid if market else self.lot_grid
+    
+    def quantity_bounds(self, market: bool = False) -> Tuple[float, float]:
+        """Get (min_qty, max_qty) for limit or market orders"""
+        if market:
+            return self.market_min_qty, self.market_max_qty
+        return self.min_qty, self.max_qty
+
+
+class SymbolInfoCache:
+    """
+    Cached exchangeInfo with per-symbol filters
+    
+    exchangeInfo is loaded once, persisted to disk and reused until it
+    is older than the TTL, so validation can check tick size, step size
+    and min notional locally instead of waiting for an exchange rejection.
+    """
+    
+    def __init__(
+        self,
+        fetch: Optional[Callable[[], Dict[str, Any]]] = None,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        on_update: Optional[Callable[['SymbolInfoCache'], None]] = None
+    ):
+        """
+        Initialize the cache
+        
+        Args:
+            fetch: Callable returning exchangeInfo (e.g. client.futures_exchange_info)
+            path: Cache file path (default: Config.SYMBOL_CACHE_PATH)
+            ttl: Max age in seconds before refreshing (default: Config.SYMBOL_CACHE_TTL)
+            on_update: Called with the cache after each (re)load
+        """
+        self.fetch = fetch
+        self.on_update = on_update
+        self.path = Path(path or Config.SYMBOL_CACHE_PATH)
+        self.ttl = ttl if ttl is not None else Config.SYMBOL_CACHE_TTL
+        self.fetched_at = 0.0
+        self.rate_limits: List[Dict[str, Any]] = []
+        self._symbols: Dict[str, SymbolFilters] = {}
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._failed_at = 0.0
+    
+    def is_stale(self) -> bool:
+        """Check whether the cached data is older than the TTL"""
+        return time.time() - self.fetched_at > self.ttl
+    
+    def load(self) -> 'SymbolInfoCache':
+        """Load from disk if fresh, otherwise fetch from the exchange"""
+        if not self._symbols:
+            self._load_from_disk()
+        if self.is_stale() and self.fetch is not None:
+            self.refresh()
+        return self
+    
+    def refresh(self):
+        """Fetch exchangeInfo from the exchange and persist it"""
+        with self._lock:
+            logger.info("Refreshing exchange info...")
+            self.update(self.fetch())
+    
+    def update(self, exchange_info: Dict[str, Any], fetched_at: Optional[float] = None, persist: bool = True):
+        """
+        Index an exchangeInfo response
+        
+        Args:
+            exchange_info: Response from futures_exchange_info()
+            fetched_at: Fetch timestamp (default: now)
+            persist: Write the response to the cache file
+        """
+        self._symbols = {
+            info['symbol']: SymbolFilters(info) for info in exchange_info.get('symbols', [])
+        }
+        self.rate_limits = exchange_info.get('rateLimits', [])
+        self.fetched_at = fetched_at or time.time()
+        logger.debug("Indexed filters for %s symbol(s)", len(self._symbols))
+        if self.on_update is not None:
+            self.on_update(self)
+        
+        if persist:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Unique per process: several processes may update the cache at once
+                tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, 'w') as f:
+                    json.dump({'fetchedAt': self.fetched_at, 'exchangeInfo': exchange_info}, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning("Could not write exchange info cache: %s", e)
+    
+    def _load_from_disk(self):
+        """Load the persisted exchangeInfo, if any"""
+        try:
+            with open(self.path) as f:
+                cached = json.load(f)
+            self.update(cached['exchangeInfo'], fetched_at=cached['fetchedAt'], persist=False)
+            logger.debug("Loaded exchange info cache from %s", self.path)
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    def get(self, symbol: str) -> Optional[SymbolFilters]:
+        """
+        Get filters for a symbol, loading the cache on first use
+        
+        Args:
+            symbol: Trading pair symbol (already validated)
+            
+        Returns:
+            SymbolFilters or None if the symbol is unknown or exchangeInfo
+            could not be loaded (validation then falls back to basic checks)
+        """
+        if not self._symbols and time.time() - self._failed_at > 30:
+            try:
+                self.load()
+            except Exception as e:
+                self._failed_at = time.time()
+                logger.warning("Could not load exchange info, skipping filter checks: %s", e)
+        return self._symbols.get(symbol)
+    
+    def start_background_refresh(self, interval: Optional[float] = None):
+        """
+        Refresh exchangeInfo in a daemon thread whenever it goes stale
+        
+        Args:
+            interval: Seconds between staleness checks (default: ttl / 4)
+        """
+        if self._refresh_thread is not None or self.fetch is None:
+            return
+        interval = interval or max(self.ttl / 4, 1.0)
+        
+        def run():
+            while not self._stop.wait(interval):
+                if self.is_stale():
+                    try:
+                        self.refresh()
+                    except Exception as e:
+                        logger.warning("Background exchange info refresh failed: %s", e)
+        
+        self._refresh_thread = threading.Thread(target=run, name='SymbolInfoRefresh', daemon=True)
+        self._refresh_thread.start()
+    
+    def stop_background_refresh(self):
+        """Stop the background refresh thread"""
+        self._stop.set()
+        self._refresh_thread = None
+
+
+class BatchOrders:
+    """Split order specs into batchOrders requests and collect per-order results"""
+    
+    @staticmethod
+    def prepare(
+        orders: List[Dict[str, Any]],
+        symbols: Optional[SymbolInfoCache] = None
+    ) -> Tuple[List[Dict[str, Any]], List[List[Tuple[int, Dict[str, str]]]]]:
+        """
+        Validate order specs and chunk them for the batch endpoint
+        
+        Args:
+            orders: List of order specs (see OrderValidator.validate_order_spec)
+            symbols: Optional symbol cache used to snap and check filters
+            
+        Returns:
+            (results, chunks) - one result slot per input order, with
+            validation failures already filled in, and chunks of at most
+            BATCH_ORDER_LIMIT (index, params) pairs to send
+        """
+        results = []
+        valid = []
+        for index, spec in enumerate(orders):
+            result = {'index': index, 'success': False, 'order': None, 'error': None}
+            try:
+                if not isinstance(spec, dict):
+                    raise ValueError("Invalid order spec. Must be a mapping of order fields")
+                filters = None
+                if symbols is not None:
+                    filters = symbols.get(OrderValidator.validate_symbol(spec.get('symbol', '')))
+                valid.append((index, OrderValidator.validate_order_spec(spec, filters)))
+            except ValueError as e:
+                result['error'] = {'code': None, 'msg': str(e)}
+            results.append(result)
+        
+        chunks = [valid[i:i + BATCH_ORDER_LIMIT] for i in range(0, len(valid), BATCH_ORDER_LIMIT)]
+        return results, chunks
+    
+    @staticmethod
+    def record(results: List[Dict[str, Any]], chunk: List[Tuple[int, Dict[str, str]]], response: Any):
+        """
+        Record a batch response (or the exception it raised) into results
+        
+        Args:
+            results: Result slots from prepare()
+            chunk: The chunk that was sent
+            response: List returned by the exchange, or the raised exception
+        """
+        if isinstance(response, Exception):
+            error = {'code': getattr(response, 'code', None), 'msg': getattr(response, 'message', str(response))}
+            for index, _ in chunk:
+                results[index]['error'] = error
+            return
+        
+        for (index, _), item in zip(chunk, response):
+            if 'orderId' in item:
+                results[index]['success'] = True
+                results[index]['order'] = item
+            else:
+                results[index]['error'] = {'code': item.get('code'), 'msg': item.get('msg')}
 
 
 class OrderFormatter:
     """Format order information for display"""
     
     @staticmethod
-    def format_order_response(order: Dict[str, Any]) -> Table:
+    def format_order_response(order: Dict[str, Any]) -> 'Table':
         """Format order response as a rich table"""
+        from rich.table import Table
         table = Table(title="Order Details", show_header=True, header_style="bold magenta")
         table.add_column("Field", style="cyan", width=20)
         table.add_column("Value", style="green")
@@ -104,50 +550,230 @@ class OrderFormatter:
         return table
     
     @staticmethod
-    def format_balance(balance_info: Dict[str, Any]) -> Table:
-        """Format account balance as a rich table"""
+    def format_orders(orders: list, limit: int = 50) -> 'Table':
+        """Format orders (dicts or Order models) as one rich table with a row per order (first `limit` orders)"""
+        from datetime import datetime
+        from rich.table import Table
+        table = Table(title="Open Orders", show_header=True, header_style="bold magenta")
+        table.add_column("Order ID", style="cyan")
+        table.add_column("Symbol", style="cyan")
+        table.add_column("Side")
+        table.add_column("Type", style="yellow")
+        table.add_column("Price", style="green", justify="right")
+        table.add_column("Filled/Qty", justify="right")
+        table.add_column("Status")
+        table.add_column("Updated", justify="right")
+        
+        for order in orders[:limit]:
+            if isinstance(order, dict):
+                # Exchange strings are shown as they are
+                order_id, symbol, side, order_type, status = (
+                    order['orderId'], order['symbol'], order['side'], order['type'], order['status']
+                )
+                price = order['price'] if float(order.get('price', 0)) else order.get('stopPrice', '0')
+                filled = f"{order['executedQty']}/{order['origQty']}"
+                updated = int(order.get('updateTime', 0))
+            else:
+                order_id, symbol, side, order_type, status = (
+                    order.order_id, order.symbol, order.side, order.type, order.status
+                )
+                price = format_number(order.price or order.stop_price)
+                filled = f"{format_number(order.executed_qty)}/{format_number(order.orig_qty)}"
+                updated = order.update_time
+            side_color = "green" if side == 'BUY' else "red"
+            table.add_row(
+                str(order_id),
+                symbol,
+                f"[{side_color}]{side}[/{side_color}]",
+                order_type,
+                price,
+                filled,
+                status,
+                datetime.fromtimestamp(updated / 1000).strftime('%Y-%m-%d %H:%M:%S')
+            )
+        
+        if len(orders) > limit:
+            table.caption = f"Showing {limit} of {len(orders)} orders (use the dashboard to page through all)"
+        
+        return table
+    
+    @staticmethod
+    def format_balance(balance_info) -> 'Table':
+        """Format account balance (the account record or a list of Balance models) as a rich table"""
+        from rich.table import Table
         table = Table(title="Account Balance", show_header=True, header_style="bold magenta")
         table.add_column("Asset", style="cyan", width=15)
         table.add_column("Available", style="green", justify="right")
         table.add_column("Total", style="yellow", justify="right")
         
-        if 'assets' in balance_info:
-            for asset in balance_info['assets']:
-                if float(asset['walletBalance']) > 0:
-                    table.add_row(
-                        asset['asset'],
-                        f"{float(asset['availableBalance']):.8f}",
-                        f"{float(asset['walletBalance']):.8f}"
-                    )
+        if isinstance(balance_info, list):
+            balances = [(b.asset, b.available_balance, b.wallet_balance) for b in balance_info]
+        else:
+            balances = [
+                (a['asset'], float(a['availableBalance']), float(a['walletBalance']))
+                for a in balance_info.get('assets', [])
+            ]
+        for asset, available, wallet in balances:
+            if wallet > 0:
+                table.add_row(asset, f"{available:.8f}", f"{wallet:.8f}")
         
         return table
     
     @staticmethod
-    def format_positions(positions: list) -> Table:
-        """Format open positions as a rich table"""
+    def format_positions(positions) -> 'Table':
+        """
+        Format open positions as a rich table
+        
+        Accepts dicts, Position models, PositionPnL rows or a PnLEngine;
+        PnL rows add mark price, margin ratio and liquidation columns.
+        """
+        from rich.table import Table
+        if hasattr(positions, 'snapshot'):
+            positions = positions.snapshot()
+        live = any(hasattr(p, 'margin_ratio') for p in positions)
+        
         table = Table(title="Open Positions", show_header=True, header_style="bold magenta")
         table.add_column("Symbol", style="cyan")
         table.add_column("Side", style="yellow")
         table.add_column("Amount", style="green", justify="right")
         table.add_column("Entry Price", style="blue", justify="right")
+        if live:
+            table.add_column("Mark Price", style="blue", justify="right")
         table.add_column("Unrealized PNL", style="magenta", justify="right")
+        if live:
+            table.add_column("Margin Ratio", justify="right")
+            table.add_column("Liq. Price", justify="right")
+            table.add_column("Liq. Distance", justify="right")
         
         has_positions = False
         for pos in positions:
-            if float(pos['positionAmt']) != 0:
-                has_positions = True
+            if isinstance(pos, dict):
+                amount = float(pos['positionAmt'])
+                row = [pos['symbol'], "LONG" if amount > 0 else "SHORT", pos['positionAmt'], pos['entryPrice']]
                 pnl = float(pos['unRealizedProfit'])
-                pnl_color = "green" if pnl >= 0 else "red"
-                
-                table.add_row(
-                    pos['symbol'],
-                    "LONG" if float(pos['positionAmt']) > 0 else "SHORT",
-                    pos['positionAmt'],
-                    pos['entryPrice'],
-                    f"[{pnl_color}]{pnl:.2f}[/{pnl_color}]"
-                )
+            else:
+                amount = pos.position_amt
+                row = [pos.symbol, "LONG" if amount > 0 else "SHORT",
+                       format_number(amount), format_number(pos.entry_price)]
+                pnl = pos.unrealized_profit
+            if not amount:
+                continue
+            has_positions = True
+            pnl_color = "green" if pnl >= 0 else "red"
+            
+            if live:
+                row.append(format_number(pos.mark_price))
+            row.append(f"[{pnl_color}]{pnl:.2f}[/{pnl_color}]")
+            if live:
+                row += [
+                    format_percent(pos.margin_ratio),
+                    format_decimal(pos.liquidation_price, 7) if pos.liquidation_price else "-",
+                    format_percent(pos.liquidation_distance),
+                ]
+            table.add_row(*row)
         
         if not has_positions:
-            table.add_row("No open positions", "", "", "", "")
+            table.add_row("No open positions", *[""] * (len(table.columns) - 1))
+        
+        return table
+    
+    @staticmethod
+    def format_metrics(rows: List[Dict[str, Any]]) -> 'Table':
+        """Format request metrics (MetricsRegistry.snapshot()) as a rich table"""
+        from rich.table import Table
+        table = Table(title="Request Latency", show_header=True, header_style="bold magenta")
+        table.add_column("Endpoint", style="cyan")
+        table.add_column("Outcome", style="yellow")
+        table.add_column("Count", justify="right")
+        table.add_column("p50 ms", style="green", justify="right")
+        table.add_column("p99 ms", style="green", justify="right")
+        table.add_column("p99.9 ms", style="green", justify="right")
+        table.add_column("Max ms", justify="right")
+        table.add_column("Error %", justify="right")
+        table.add_column("Weight", style="blue", justify="right")
+        
+        for row in rows:
+            outcome = row['outcome'] if not row['code'] else f"{row['outcome']} {row['code']}"
+            outcome_color = "green" if row['outcome'] == 'success' else "red"
+            error_pct = row['error_rate'] * 100
+            table.add_row(
+                row['endpoint'],
+                f"[{outcome_color}]{outcome}[/{outcome_color}]",
+                str(row['count']),
+                f"{row['p50_ms']:.1f}",
+                f"{row['p99_ms']:.1f}",
+                f"{row['p999_ms']:.1f}",
+                f"{row['max_ms']:.1f}",
+                f"[{'red' if error_pct >= 5 else 'white'}]{error_pct:.1f}[/]",
+                str(row['weight'])
+            )
+        
+        if not rows:
+            table.add_row("No requests recorded", "", "", "", "", "", "", "", "")
+        
+        return table
+    
+    @staticmethod
+    def format_symbol_reports(reports: Dict[str, Dict[str, Any]], title: str = "Bulk Operation") -> 'Table':
+        """Format per-symbol cancel/flatten reports as a rich table"""
+        from rich.table import Table
+        table = Table(title=title, show_header=True, header_style="bold magenta")
+        table.add_column("Symbol", style="cyan")
+        table.add_column("Status")
+        table.add_column("Cancelled", justify="right")
+        table.add_column("Closed", justify="right")
+        table.add_column("Done ms", style="green", justify="right")
+        table.add_column("Error", style="red")
+        
+        for symbol, report in sorted(reports.items(), key=lambda item: item[1]['elapsed_ms']):
+            table.add_row(
+                symbol,
+                "[green]OK[/green]" if report['success'] else "[red]FAILED[/red]",
+                "all" if report['cancelled'] is None else str(report['cancelled']),
+                str(report['closed']),
+                f"{report['elapsed_ms']:.1f}",
+                "; ".join(e['msg'] for e in report['errors'])
+            )
+        
+        if not reports:
+            table.add_row("Nothing to do", "", "", "", "", "")
+        
+        return table
+    
+    @staticmethod
+    def format_account_results(results: Dict[str, Dict[str, Any]]) -> 'Table':
+        """Format AccountManager results with the per-account latency breakdown as a rich table"""
+        from rich.table import Table
+        table = Table(title="Account Results", show_header=True, header_style="bold magenta")
+        table.add_column("Account", style="cyan")
+        table.add_column("Status")
+        table.add_column("Orders", justify="right")
+        table.add_column("Dispatch ms", justify="right")
+        table.add_column("Exchange ms", style="green", justify="right")
+        table.add_column("Return ms", justify="right")
+        table.add_column("Total ms", style="green", justify="right")
+        table.add_column("Error", style="red")
+        
+        for name, result in results.items():
+            latency = result['latency'] or {}
+            orders = ""
+            errors = []
+            if result['error']:
+                errors.append(result['error']['msg'])
+            if isinstance(result['result'], list):
+                placed = sum(1 for r in result['result'] if r.get('success'))
+                orders = f"{placed}/{len(result['result'])}"
+                errors += [r['error']['msg'] for r in result['result'] if r.get('error')]
+            status = "[green]OK[/green]" if result['success'] and not errors else "[red]FAILED[/red]"
+            table.add_row(
+                name,
+                status,
+                orders,
+                f"{latency['dispatch_ms']:.1f}" if latency else "-",
+                f"{latency['exchange_ms']:.1f}" if latency else "-",
+                f"{latency['return_ms']:.1f}" if latency else "-",
+                f"{latency['total_ms']:.1f}" if latency else "-",
+                "; ".join(dict.fromkeys(errors))
+            )
         
         return table
@@ -0,0 +1,374 @@
+"""
+Streaming mark-price position and PnL engine
+
+Positions are held as parallel NumPy arrays (size, entry price,
+leverage, margin mode, maintenance rate) and every message of the
+all-market `!markPrice@arr` stream updates unrealized PnL, margin ratio
+and liquidation price for all of them in one vectorized pass. Position
+sizes and the wallet balance come from the user-data stream mirror, so
+once running nothing is polled: futures_position_information is only
+read when the mirror resyncs (or once per symbol to learn the leverage
+of a position opened on a symbol the snapshot did not include).
+
+Maintenance margin uses the symbol's leverage bracket (tier picked by
+notional when the position changes; Config.PNL_MAINT_MARGIN_RATE when
+brackets are unavailable). Liquidation prices are estimates: for each
+position, the mark price at which its margin balance (the cross wallet,
+or its isolated wallet) falls to the maintenance margin, other marks
+unchanged.
+
+    bot.start_pnl_stream()
+    for row in bot.get_position_pnl():
+        print(row.symbol, row.unrealized_profit, row.liquidation_distance)
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .config import Config
+from .logger import logger
+from .models import Position
+from .streams import StreamThread
+
+
+class PositionPnL(NamedTuple):
+    """One position valued at the latest mark price"""
+    symbol: str
+    position_side: str
+    position_amt: float
+    entry_price: float
+    mark_price: float
+    unrealized_profit: float
+    notional: float
+    leverage: int
+    margin_type: str
+    initial_margin: float
+    maint_margin: float
+    margin_ratio: float
+    liquidation_price: float
+    liquidation_distance: float
+
+
+def parse_brackets(response: Iterable[Dict[str, Any]]) -> Dict[str, List[Tuple[float, float, float]]]:
+    """
+    Parse a futures_leverage_bracket() response
+
+    Returns:
+        Symbol -> [(notionalCap, maintMarginRatio, cum), ...] in tier order
+    """
+    brackets = {}
+    for entry in response:
+        tiers = sorted(entry.get('brackets', []), key=lambda b: float(b['notionalFloor']))
+        brackets[entry['symbol']] = [
+            (float(b['notionalCap']), float(b['maintMarginRatio']), float(b.get('cum', 0))) for b in tiers
+        ]
+    return brackets
+
+
+class PnLEngine:
+    """
+    Vectorized position valuation
+
+    Not tied to any stream: load() sets positions and the wallet, on_marks()
+    applies mark prices. Both recompute every derived array in one pass
+    under a lock, so snapshot() and totals() always see a consistent state.
+    If on_update is set it is called (outside the lock) after each recompute.
+    """
+
+    def __init__(self, margin_asset: Optional[str] = None, maint_rate: Optional[float] = None):
+        """
+        Initialize an empty engine
+
+        Args:
+            margin_asset: Asset whose cross wallet backs cross positions (default: Config.PNL_MARGIN_ASSET)
+            maint_rate: Maintenance margin rate for symbols without brackets
+                (default: Config.PNL_MAINT_MARGIN_RATE)
+        """
+        self.margin_asset = margin_asset or Config.PNL_MARGIN_ASSET
+        self.maint_rate = Config.PNL_MAINT_MARGIN_RATE if maint_rate is None else maint_rate
+        self.brackets: Dict[str, List[Tuple[float, float, float]]] = {}
+        self.wallet = 0.0
+        self.updates = 0
+        self.updated = 0.0
+        self.on_update: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+
+        # Mark prices of the held symbols, indexed by slot
+        self._slots: Dict[str, int] = {}
+        self._marks = np.empty(0)
+
+        # One row per open position
+        self._keys: List[Tuple[str, str]] = []
+        self._meta: List[Tuple[int, str]] = []  # (leverage, margin type) for snapshots
+        self._load_rows([])
+        self._recompute()
+
+    # Inputs
+
+    def set_brackets(self, brackets: Dict[str, List[Tuple[float, float, float]]]):
+        """Set leverage brackets (see parse_brackets); applied on the next load()"""
+        self.brackets = brackets
+
+    def load(self, positions: Iterable[Any], account: Optional[Dict[str, Any]] = None):
+        """
+        Replace the positions (and optionally the wallet)
+
+        Args:
+            positions: Position records (REST/mirror dicts or Position models);
+                records without a position are skipped
+            account: futures_account()-shaped record for the cross wallet balance
+        """
+        records = [Position.from_dict(p) if isinstance(p, dict) else p for p in positions]
+        records = [p for p in records if p.position_amt]
+        with self._lock:
+            if account is not None:
+                self.wallet = self._cross_wallet(account)
+            self._load_rows(records)
+            self._recompute()
+            self.updated = time.monotonic()
+        self._notify()
+
+    def on_marks(self, events: Any):
+        """
+        Apply a `!markPrice@arr` message (or a single markPriceUpdate event)
+
+        Symbols without a position are ignored; the rest are revalued in one pass.
+        """
+        if isinstance(events, dict):
+            events = [events]
+        with self._lock:
+            slots = self._slots
+            found, prices = [], []
+            for event in events:
+                slot = slots.get(event.get('s'))
+                if slot is not None:
+                    found.append(slot)
+                    prices.append(float(event['p']))
+            # Marks are current even when none of them is for a held symbol
+            self.updated = time.monotonic()
+            if not found:
+                return
+            self._marks[found] = prices
+            self._recompute()
+        self._notify()
+
+    def _cross_wallet(self, account: Dict[str, Any]) -> float:
+        for asset in account.get('assets', []):
+            if asset.get('asset') == self.margin_asset:
+                return float(asset.get('crossWalletBalance', asset.get('walletBalance', 0)))
+        return float(account.get('totalCrossWalletBalance', 0))
+
+    def _load_rows(self, records: List[Position]):
+        """Rebuild the per-position arrays (caller holds the lock)"""
+        n = len(records)
+        self._keys = [(p.symbol, p.position_side) for p in records]
+        self._meta = [(p.leverage, p.margin_type) for p in records]
+
+        # Keep known marks; new symbols start at the record's mark (or entry)
+        old_slots, old_marks = self._slots, self._marks
+        symbols = list(dict.fromkeys(p.symbol for p in records))
+        self._slots = {symbol: i for i, symbol in enumerate(symbols)}
+        self._marks = np.empty(len(symbols))
+        for p in records:
+            slot = self._slots[p.symbol]
+            old = old_slots.get(p.symbol)
+            self._marks[slot] = old_marks[old] if old is not None else (p.mark_price or p.entry_price)
+
+        self._slot = np.fromiter((self._slots[p.symbol] for p in records), dtype=np.intp, count=n)
+        self._amount = np.fromiter((p.position_amt for p in records), dtype=np.float64, count=n)
+        self._entry = np.fromiter((p.entry_price for p in records), dtype=np.float64, count=n)
+        self._leverage = np.fromiter((p.leverage for p in records), dtype=np.float64, count=n)
+        self._isolated = np.fromiter((p.margin_type.lower() == 'isolated' for p in records), dtype=bool, count=n)
+        self._isolated_wallet = np.fromiter((p.isolated_wallet for p in records), dtype=np.float64, count=n)
+        self._rate = np.empty(n)
+        self._cum = np.empty(n)
+        for i, p in enumerate(records):
+            notional = abs(p.position_amt) * self._marks[self._slots[p.symbol]]
+            self._rate[i], self._cum[i] = self._tier(p.symbol, notional)
+
+    def _tier(self, symbol: str, notional: float) -> Tuple[float, float]:
+        """(maintenance rate, maintenance amount) of the bracket covering a notional"""
+        tiers = self.brackets.get(symbol)
+        if not tiers:
+            return self.maint_rate, 0.0
+        for cap, rate, cum in tiers:
+            if notional <= cap:
+                return rate, cum
+        return tiers[-1][1], tiers[-1][2]
+
+    # Valuation
+
+    def _recompute(self):
+        """Revalue every position at the current marks (caller holds the lock)"""
+        amount = self._amount
+        mark = self._marks[self._slot]
+        unrealized = amount * (mark - self._entry)
+        notional = amount * mark
+        maint = np.maximum(np.abs(notional) * self._rate - self._cum, 0.0)
+
+        # Cross positions share the wallet and the account's maintenance margin
+        cross = ~self._isolated
+        cross_balance = self.wallet + unrealized[cross].sum()
+        cross_maint = maint[cross].sum()
+        balance = np.where(self._isolated, self._isolated_wallet + unrealized, cross_balance)
+        required = np.where(self._isolated, maint, cross_maint)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margin_ratio = np.where(balance > 0, required / balance, np.inf)
+            # Solve balance + amount * (p - mark) == required + |amount| * (p - mark) * rate for p
+            liquidation = mark - (balance - required) / (amount - np.abs(amount) * self._rate)
+            initial = np.where(self._leverage > 0, np.abs(notional) / self._leverage, 0.0)
+            # No positive solution: this price alone cannot liquidate the position
+            liquidation = np.where(np.isfinite(liquidation) & (liquidation > 0), liquidation, 0.0)
+            distance = np.where(
+                balance <= required, 0.0,
+                np.where(liquidation > 0, np.abs(mark - liquidation) / mark, np.inf)
+            )
+
+        self._mark = mark
+        self._unrealized = unrealized
+        self._notional = notional
+        self._maint = maint
+        self._initial = initial
+        self._margin_ratio = margin_ratio
+        self._liquidation = liquidation
+        self._distance = distance
+        self._cross_balance = cross_balance
+        self._cross_maint = cross_maint
+        self.updates += 1
+
+    def _notify(self):
+        if self.on_update is None:
+            return
+        try:
+            self.on_update()
+        except Exception:
+            logger.exception("Error in PnL update callback")
+
+    # Outputs
+
+    def snapshot(self, symbol: Optional[str] = None) -> List[PositionPnL]:
+        """
+        Get every position valued at the latest marks, sorted by symbol
+
+        Args:
+            symbol: Only this symbol
+        """
+        with self._lock:
+            columns = zip(
+                self._keys, self._meta, self._amount.tolist(), self._entry.tolist(), self._mark.tolist(),
+                self._unrealized.tolist(), self._notional.tolist(), self._initial.tolist(), self._maint.tolist(),
+                self._margin_ratio.tolist(), self._liquidation.tolist(), self._distance.tolist()
+            )
+            rows = [
+                PositionPnL(key[0], key[1], amount, entry, mark, pnl, notional, meta[0], meta[1],
+                            initial, maint, ratio, liquidation, distance)
+                for key, meta, amount, entry, mark, pnl, notional, initial, maint, ratio, liquidation, distance
+                in columns
+                if symbol is None or key[0] == symbol
+            ]
+        rows.sort(key=lambda r: (r.symbol, r.position_side))
+        return rows
+
+    def totals(self) -> Dict[str, float]:
+        """
+        Account-level figures for cross margin
+
+        Returns:
+            Dict with wallet_balance, unrealized_profit (all positions),
+            margin_balance, maint_margin and margin_ratio (cross positions)
+        """
+        with self._lock:
+            balance = float(self._cross_balance)
+            maint = float(self._cross_maint)
+            return {
+                'wallet_balance': self.wallet,
+                'unrealized_profit': float(self._unrealized.sum()),
+                'margin_balance': balance,
+                'maint_margin': maint,
+                'margin_ratio': maint / balance if balance > 0 else float('inf'),
+                'positions': len(self._keys),
+            }
+
+
+class MarkPriceStream:
+    """
+    Keep a PnLEngine current from the user-data mirror and `!markPrice@arr@1s`
+
+    Positions and the wallet are reloaded from the bot's account mirror on
+    every position/account change (and after each mirror resync); mark
+    prices are applied as they arrive.
+    """
+
+    def __init__(self, bot, engine: Optional[PnLEngine] = None):
+        """
+        Initialize the stream
+
+        Args:
+            bot: BasicBot (its user-data stream is started if needed)
+            engine: Engine to feed (default: a new PnLEngine)
+        """
+        self.bot = bot
+        self.engine = engine or PnLEngine()
+        self._stream = StreamThread(
+            f"{Config.get_ws_url(bot.testnet)}/ws/!markPrice@arr@1s",
+            on_message=self.engine.on_marks,
+            name='MarkPriceStream'
+        )
+        self._fetching = set()  # Symbols whose leverage is being read from REST
+
+    def start(self):
+        self.bot.start_user_stream()
+        self.engine.set_brackets(self.bot.leverage_brackets())
+        mirror = self.bot.user_stream.mirror
+        mirror.add_listener(self._on_change)
+        if mirror.ready:
+            self._reload()
+        self._stream.start()
+
+    def stop(self):
+        if self.bot.user_stream is not None:
+            self.bot.user_stream.mirror.remove_listener(self._on_change)
+        self._stream.stop()
+
+    def is_fresh(self, max_age: float) -> bool:
+        """Check whether positions and marks were both current within max_age seconds"""
+        return (
+            self._stream.connected
+            and self.bot._mirror_fresh()
+            and time.monotonic() - self.engine.updated <= max_age
+        )
+
+    def _on_change(self, kind: str, key: Any):
+        if kind == 'order':
+            return
+        if kind == 'position':
+            self._check_leverage(key[0])
+        self._reload()
+
+    def _check_leverage(self, symbol: str):
+        """Read the leverage of a symbol the mirror has none for (on a worker thread)"""
+        mirror = self.bot.user_stream.mirror
+        if symbol in mirror.leverage or symbol in self._fetching:
+            return
+        self._fetching.add(symbol)
+        threading.Thread(
+            target=self._fetch_leverage, args=(mirror, symbol), name='LeverageFetch', daemon=True
+        ).start()
+
+    def _fetch_leverage(self, mirror, symbol: str):
+        try:
+            for p in self.bot._call('futures_position_information', symbol=symbol):
+                if p.get('symbol') == symbol and 'leverage' in p:
+                    mirror.set_leverage(symbol, p['leverage'])
+                    break
+        except Exception as e:
+            logger.warning("Could not read leverage for %s: %s", symbol, e)
+        finally:
+            self._fetching.discard(symbol)
+
+    def _reload(self):
+        mirror = self.bot.user_stream.mirror
+        self.engine.load(mirror.get_positions(), mirror.get_account())
@@ -0,0 +1,287 @@
+"""
+Weight-aware client-side rate limiting for the futures API
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from .logger import logger
+
+# Request priorities: trading calls (orders, cancels) preempt polling
+PRIORITY_TRADE = 0
+PRIORITY_READ = 1
+
+# Client method -> (request weight, order count, priority)
+ENDPOINT_COSTS = {
+    'futures_create_order': (1, 1, PRIORITY_TRADE),
+    'futures_place_batch_order': (5, 5, PRIORITY_TRADE),
+    'futures_cancel_order': (1, 0, PRIORITY_TRADE),
+    'futures_cancel_orders': (1, 0, PRIORITY_TRADE),
+    'futures_cancel_all_open_orders': (1, 0, PRIORITY_TRADE),
+    'futures_get_order': (1, 0, PRIORITY_TRADE),
+    'futures_get_open_orders': (1, 0, PRIORITY_READ),
+    'futures_position_information': (5, 0, PRIORITY_READ),
+    'futures_account': (5, 0, PRIORITY_READ),
+    'futures_account_balance': (5, 0, PRIORITY_READ),
+    'futures_account_trades': (5, 0, PRIORITY_READ),
+    'futures_leverage_bracket': (1, 0, PRIORITY_READ),
+    'futures_exchange_info': (1, 0, PRIORITY_READ),
+    'futures_order_book': (20, 0, PRIORITY_READ),
+    'futures_klines': (5, 0, PRIORITY_READ),
+    'futures_stream_get_listen_key': (1, 0, PRIORITY_READ),
+    'futures_stream_keepalive': (1, 0, PRIORITY_READ),
+    'futures_stream_close': (1, 0, PRIORITY_READ),
+}
+
+# Binance USD-M futures defaults, used until exchangeInfo is loaded
+DEFAULT_RATE_LIMITS = [
+    {'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 2400},
+    {'rateLimitType': 'ORDERS', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 1200},
+    {'rateLimitType': 'ORDERS', 'interval': 'SECOND', 'intervalNum': 10, 'limit': 300},
+]
+
+_INTERVAL_SECONDS = {'SECOND': 1, 'MINUTE': 60, 'HOUR': 3600, 'DAY': 86400}
+_HEADER_INTERVAL_SECONDS = {'S': 1, 'M': 60, 'H': 3600, 'D': 86400}
+
+
+def endpoint_cost(endpoint: str, params: Optional[Mapping[str, Any]] = None) -> Tuple[int, int, int]:
+    """
+    Get (weight, order count, priority) for a client method call
+
+    Args:
+        endpoint: python-binance client method name (e.g. 'futures_create_order')
+        params: Call parameters (some weights depend on them)
+
+    Returns:
+        (weight, orders, priority)
+    """
+    weight, orders, priority = ENDPOINT_COSTS.get(endpoint, (1, 0, PRIORITY_READ))
+    params = params or {}
+    if endpoint == 'futures_get_open_orders' and not params.get('symbol'):
+        weight = 40
+    elif endpoint == 'futures_place_batch_order':
+        count = len(params.get('batchOrders', [])) or 5
+        orders = count
+    elif endpoint == 'futures_order_book':
+        limit = int(params.get('limit', 500))
+        weight = 2 if limit <= 50 else 5 if limit <= 100 else 10 if limit <= 500 else 20
+    elif endpoint == 'futures_klines':
+        limit = int(params.get('limit', 500))
+        weight = 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+    return weight, orders, priority
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at limit/interval"""
+
+    __slots__ = ('limit_type', 'interval', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, limit_type: str, interval: float, capacity: float):
+        self.limit_type = limit_type
+        self.interval = interval
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.capacity / self.interval)
+            self.updated = now
+
+    def wait_time(self, amount: float, reserve: float) -> float:
+        """Seconds until `amount` tokens are available above `reserve`"""
+        missing = amount + reserve - self.tokens
+        return 0.0 if missing <= 0 else missing * self.interval / self.capacity
+
+
+class RateLimiter:
+    """
+    Client-side limiter for request weight and order count
+
+    Buckets are seeded from exchangeInfo `rateLimits` (scaled by a safety
+    factor) and corrected from the X-MBX-USED-WEIGHT-* / X-MBX-ORDER-COUNT-*
+    response headers, so throughput stays just under the exchange limits.
+
+    Two priority lanes share the buckets: trading calls may use the full
+    budget, while reads must leave `read_reserve` of it free and yield
+    to any waiting trading call, so cancels and orders preempt polling.
+    """
+
+    def __init__(
+        self,
+        rate_limits: Optional[List[Dict[str, Any]]] = None,
+        safety: float = 0.9,
+        read_reserve: float = 0.2
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            rate_limits: exchangeInfo 'rateLimits' (default: Binance futures defaults)
+            safety: Fraction of each exchange limit to use
+            read_reserve: Fraction of each bucket reads may not consume
+        """
+        self.safety = safety
+        self.read_reserve = read_reserve
+        self.buckets: Dict[Tuple[str, float], TokenBucket] = {}
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self._waiting = {PRIORITY_TRADE: 0, PRIORITY_READ: 0}
+        self._lock = threading.Lock()
+        self.configure(rate_limits or DEFAULT_RATE_LIMITS)
+
+    def configure(self, rate_limits: List[Dict[str, Any]]):
+        """
+        Seed buckets from exchangeInfo rate limits
+
+        Args:
+            rate_limits: exchangeInfo 'rateLimits' list (empty keeps the current limits)
+        """
+        if not rate_limits:
+            return
+        buckets = {}
+        for limit in rate_limits:
+            if limit.get('rateLimitType') not in ('REQUEST_WEIGHT', 'ORDERS'):
+                continue
+            interval = _INTERVAL_SECONDS[limit['interval']] * limit.get('intervalNum', 1)
+            key = (limit['rateLimitType'], interval)
+            capacity = limit['limit'] * self.safety
+            bucket = TokenBucket(key[0], interval, capacity)
+            old = self.buckets.get(key)
+            if old is not None:
+                bucket.tokens = min(old.tokens, capacity)
+            buckets[key] = bucket
+
+        with self._lock:
+            self.buckets = buckets
+        logger.debug("Rate limiter configured: %s", [(k, b.capacity) for k, b in buckets.items()])
+
+    def reserve(self, weight: int, orders: int = 0, priority: int = PRIORITY_READ) -> float:
+        """
+        Try to take tokens for one request
+
+        Args:
+            weight: Request weight
+            orders: Number of orders the request creates
+            priority: PRIORITY_TRADE or PRIORITY_READ
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds to wait before retrying
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if priority != PRIORITY_TRADE and self._waiting[PRIORITY_TRADE]:
+                return 0.005
+
+            delay = 0.0
+            for (limit_type, _), bucket in self.buckets.items():
+                amount = weight if limit_type == 'REQUEST_WEIGHT' else orders
+                if not amount:
+                    continue
+                bucket.refill(now)
+                reserve = bucket.capacity * self.read_reserve if priority != PRIORITY_TRADE else 0.0
+                delay = max(delay, bucket.wait_time(amount, reserve))
+            if delay > 0:
+                return delay
+
+            for (limit_type, _), bucket in self.buckets.items():
+                bucket.tokens -= weight if limit_type == 'REQUEST_WEIGHT' else orders
+            return 0.0
+
+    def acquire(self, weight: int, orders: int = 0, priority: int = PRIORITY_READ):
+        """Block until the request may be sent"""
+        delay = self.reserve(weight, orders, priority)
+        if not delay:
+            return
+        self._wait_started(priority, delay)
+        try:
+            while delay:
+                time.sleep(delay)
+                delay = self.reserve(weight, orders, priority)
+        finally:
+            self._wait_finished(priority)
+
+    async def acquire_async(self, weight: int, orders: int = 0, priority: int = PRIORITY_READ):
+        """Wait (without blocking the event loop) until the request may be sent"""
+        delay = self.reserve(weight, orders, priority)
+        if not delay:
+            return
+        self._wait_started(priority, delay)
+        try:
+            while delay:
+                await asyncio.sleep(delay)
+                delay = self.reserve(weight, orders, priority)
+        finally:
+            self._wait_finished(priority)
+
+    def _wait_started(self, priority: int, delay: float):
+        with self._lock:
+            self._waiting[priority] += 1
+            self.throttled += 1
+        logger.debug(
+            "Rate limiter: delaying %s request %.3fs",
+            'trade' if priority == PRIORITY_TRADE else 'read', delay
+        )
+
+    def _wait_finished(self, priority: int):
+        with self._lock:
+            self._waiting[priority] -= 1
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Correct buckets from the exchange's usage headers
+
+        Args:
+            headers: Response headers (X-MBX-USED-WEIGHT-1M, X-MBX-ORDER-COUNT-10S, ...)
+        """
+        if not headers:
+            return
+        with self._lock:
+            now = time.monotonic()
+            for name, value in headers.items():
+                name = name.upper()
+                if name.startswith('X-MBX-USED-WEIGHT-'):
+                    limit_type, suffix = 'REQUEST_WEIGHT', name[len('X-MBX-USED-WEIGHT-'):]
+                elif name.startswith('X-MBX-ORDER-COUNT-'):
+                    limit_type, suffix = 'ORDERS', name[len('X-MBX-ORDER-COUNT-'):]
+                else:
+                    continue
+                try:
+                    interval = int(suffix[:-1]) * _HEADER_INTERVAL_SECONDS[suffix[-1]]
+                    used = float(value)
+                except (KeyError, ValueError):
+                    continue
+                bucket = self.buckets.get((limit_type, interval))
+                if bucket is None:
+                    continue
+                # The exchange's count is authoritative; only ever tighten
+                bucket.refill(now)
+                bucket.tokens = min(bucket.tokens, bucket.capacity - used)
+
+    def penalize(self, retry_after: Optional[float], status_code: int):
+        """
+        Stop all requests after a 429 (rate limited) or 418 (IP banned)
+
+        Args:
+            retry_after: Retry-After header value in seconds, if present
+            status_code: HTTP status code
+        """
+        wait = retry_after if retry_after else (60.0 if status_code == 418 else 5.0)
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + wait)
+        logger.warning("Rate limit hit (HTTP %s), pausing requests for %.0fs", status_code, wait)
+
+    def handle_error(self, error: Exception):
+        """Apply a penalty if an API error is a 429/418 response"""
+        status_code = getattr(error, 'status_code', None)
+        if status_code not in (418, 429):
+            return
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            retry_after = float(headers.get('Retry-After', 0))
+        except (TypeError, ValueError):
+            retry_after = 0.0
+        self.penalize(retry_after, status_code)
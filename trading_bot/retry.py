@@ -0,0 +1,177 @@
+"""
+Retry policy, deterministic client order IDs and hedged reads
+
+Orders are only safe to retry if a resubmission cannot fill twice. Every
+order therefore carries a newClientOrderId fixed before the first
+attempt; after a failure whose outcome is unknown (timeout, dropped
+connection, 5xx) the order is looked up by that ID and only resubmitted
+if the exchange never saw it. Idempotent reads are retried directly and
+can be hedged: if the first request has not answered within the
+endpoint's usual latency, a duplicate is sent and the first response wins.
+"""
+import hashlib
+import json
+import random
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Awaitable, Callable, Dict, Optional
+from .config import Config
+from . import exceptions
+from .logger import logger
+
+# Binance: newClientOrderId must match ^[\.A-Z\:/a-z0-9_-]{1,36}$
+CLIENT_ORDER_ID_PATTERN = re.compile(r'^[.A-Z:/a-z0-9_-]{1,36}$')
+
+# Error codes meaning "the request may or may not have been executed"
+UNKNOWN_STATUS_CODES = {-1000, -1001, -1006, -1007}
+# Error codes worth retrying although the request was not executed
+RETRYABLE_CODES = {-1003, -1008}
+# The order does not exist / the clientOrderId is already in use
+ORDER_NOT_FOUND_CODE = -2013
+DUPLICATE_CLIENT_ORDER_ID_CODE = -4116
+
+
+def client_order_id(params: Dict[str, Any], nonce: str, prefix: Optional[str] = None) -> str:
+    """
+    Build a deterministic newClientOrderId
+
+    The same order parameters and nonce always give the same ID. The bots
+    use a nonce of random session prefix plus sequence number, so an ID is
+    fixed once per order (every retry reuses it) but cannot be recomputed
+    later from the intent alone: reconcile with the clientOrderId stored
+    in the order response or the local history.
+
+    Args:
+        params: Order parameters (newClientOrderId itself is ignored)
+        nonce: Distinguishes otherwise identical orders (e.g. session:sequence)
+        prefix: ID prefix (default: Config.CLIENT_ORDER_ID_PREFIX)
+
+    Returns:
+        '<prefix>-<hash>', at most 36 characters
+    """
+    prefix = Config.CLIENT_ORDER_ID_PREFIX if prefix is None else prefix
+    payload = json.dumps(
+        {k: str(v) for k, v in params.items() if k != 'newClientOrderId'}, sort_keys=True
+    ) + nonce
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    return f"{prefix}-{digest}"[:36] if prefix else digest[:32]
+
+
+def validate_client_order_id(value: str) -> str:
+    """Check a caller-supplied client order ID against the exchange format"""
+    value = str(value).strip()
+    if not CLIENT_ORDER_ID_PATTERN.match(value):
+        raise ValueError("Invalid client order ID. Use 1-36 characters from A-Z a-z 0-9 . : / _ -")
+    return value
+
+
+def _status(error: BaseException) -> int:
+    return getattr(error, 'status_code', 0) or 0
+
+
+def is_unknown_status(error: BaseException) -> bool:
+    """Whether a failed request might still have been executed by the exchange"""
+    if isinstance(error, exceptions.BinanceAPIException):
+        return _status(error) >= 500 or error.code in UNKNOWN_STATUS_CODES
+    # Network errors: the request may have been sent before the failure
+    name = type(error).__name__
+    return isinstance(error, (OSError, TimeoutError)) or 'Timeout' in name or 'Connection' in name
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed request is worth retrying (transient, not a rejection)"""
+    if is_unknown_status(error):
+        return True
+    if isinstance(error, exceptions.BinanceAPIException):
+        return _status(error) == 429 or error.code in RETRYABLE_CODES
+    return False
+
+
+class RetryPolicy:
+    """Bounded attempts with full-jitter exponential backoff"""
+
+    def __init__(self, attempts: Optional[int] = None, backoff: Optional[float] = None,
+                 max_backoff: Optional[float] = None):
+        """
+        Initialize the policy
+
+        Args:
+            attempts: Total attempts per call (default: Config.RETRY_ATTEMPTS)
+            backoff: Base delay in seconds (default: Config.RETRY_BACKOFF)
+            max_backoff: Delay cap in seconds (default: Config.RETRY_MAX_BACKOFF)
+        """
+        self.attempts = max(1, attempts if attempts is not None else Config.RETRY_ATTEMPTS)
+        self.backoff = Config.RETRY_BACKOFF if backoff is None else backoff
+        self.max_backoff = Config.RETRY_MAX_BACKOFF if max_backoff is None else max_backoff
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number `attempt` (1-based)"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** (attempt - 1))))
+
+    def call(self, fn: Callable[[], Any], description: str = 'request', retryable=is_retryable) -> Any:
+        """
+        Call fn, retrying transient failures
+
+        Args:
+            fn: Callable to run
+            description: Used in log messages
+            retryable: Predicate deciding whether an exception is retried
+        """
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.attempts or not retryable(e):
+                    raise
+                delay = self.delay(attempt)
+                logger.warning("%s failed (%s), retry %s/%s in %.2fs",
+                               description, e, attempt, self.attempts - 1, delay)
+                time.sleep(delay)
+
+    async def call_async(self, fn: Callable[[], Awaitable], description: str = 'request',
+                         retryable=is_retryable) -> Any:
+        """Coroutine version of call(): fn returns an awaitable and the backoff sleeps without blocking"""
+        import asyncio
+
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return await fn()
+            except Exception as e:
+                if attempt == self.attempts or not retryable(e):
+                    raise
+                delay = self.delay(attempt)
+                logger.warning("%s failed (%s), retry %s/%s in %.2fs",
+                               description, e, attempt, self.attempts - 1, delay)
+                await asyncio.sleep(delay)
+
+
+def hedged(pool, fn: Callable[[], Any], delay: Optional[float]) -> Any:
+    """
+    Run fn, and a duplicate of it if the first has not finished within delay
+
+    Args:
+        pool: Executor to run the requests on
+        fn: Idempotent callable
+        delay: Seconds before hedging (None: no hedge)
+
+    Returns:
+        The first successful result (the slower request is left to finish
+        in the background and its result discarded)
+    """
+    if delay is None:
+        return fn()
+    first = pool.submit(fn)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+
+    pending = {first, pool.submit(fn)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = error or future.exception()
+    raise error
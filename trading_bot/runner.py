@@ -0,0 +1,525 @@
+"""
+Asyncio multi-symbol strategy runner
+
+StrategyRunner subscribes to market streams for many symbols on one
+event loop and feeds the events to strategy callbacks:
+
+    on_tick(bot, symbol, tick)   every stream event (Tick)
+    on_bar(bot, symbol, bar)     every closed bar built from aggTrades
+                                 (backtest.Bar, so backtest strategies
+                                 can be reused)
+
+Each symbol has its own worker, so a slow strategy on one symbol never
+delays another, and events for one symbol are always handled in order.
+Ticks are coalesced: a tick that arrives while an older tick of the same
+stream is still waiting replaces it, so the backlog per symbol is at
+most one tick per stream and a slow strategy sees the newest price
+instead of falling further behind. Closed bars are never dropped.
+
+Callbacks may be plain functions or coroutines. Coroutine callbacks are
+awaited by the symbol's worker. Plain callbacks get a view of the bot
+whose coroutine methods are submitted in the background as they are
+called (like StrategyRunner.submit()) and return the task, so a
+backtest strategy calling `bot.place_market_order(...)` places the
+order without blocking anything; it just cannot read the result.
+
+Usage:
+    async with AsyncBasicBot(api_key, api_secret) as bot:
+        runner = StrategyRunner(bot, [MyStrategy()], ['BTCUSDT', 'ETHUSDT'], bar_interval='1m')
+        await runner.run()
+"""
+import asyncio
+import inspect
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional
+
+import aiohttp
+from .backtest import Bar
+from .config import Config
+from .klines import INTERVAL_MS
+from .logger import logger
+from .metrics import REGISTRY, LatencyHistogram
+from .models import loads
+
+# Binance allows up to 200 streams per connection
+MAX_STREAMS_PER_CONNECTION = 200
+
+# A bar is closed by the first trade after it, or by the clock once its
+# end is this far in the past (trades can arrive slightly late)
+BAR_CLOSE_GRACE_MS = 1000
+
+
+class Tick(NamedTuple):
+    """One market stream event as passed to on_tick"""
+    symbol: str
+    stream: str
+    price: float
+    quantity: float
+    time: int
+    received: float
+
+
+def _parse_agg_trade(data: Dict[str, Any]):
+    return float(data['p']), float(data['q']), data['T']
+
+
+def _parse_mark_price(data: Dict[str, Any]):
+    return float(data['p']), 0.0, data['E']
+
+
+def _parse_book_ticker(data: Dict[str, Any]):
+    return (float(data['b']) + float(data['a'])) / 2, 0.0, data.get('T') or data.get('E', 0)
+
+
+# Supported streams: name -> parser returning (price, quantity, time)
+STREAM_PARSERS: Dict[str, Callable[[Dict[str, Any]], tuple]] = {
+    'aggTrade': _parse_agg_trade,
+    'markPrice': _parse_mark_price,
+    'bookTicker': _parse_book_ticker,
+}
+
+
+class _BarBuilder:
+    """Aggregate trades of one symbol into fixed-interval bars"""
+
+    __slots__ = ('interval_ms', 'index', 'open_time', 'closed_time', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, interval_ms: int):
+        self.interval_ms = interval_ms
+        self.index = 0
+        self.open_time: Optional[int] = None
+        # Open time of the last closed bar; later trades for it are dropped
+        self.closed_time: Optional[int] = None
+
+    def add(self, price: float, quantity: float, time_ms: int) -> Optional[Bar]:
+        """Add a trade; returns the previous bar if this trade closed it"""
+        open_time = time_ms - time_ms % self.interval_ms
+        if self.closed_time is not None and open_time <= self.closed_time:
+            return None
+        closed = None
+        if self.open_time is not None and open_time > self.open_time:
+            closed = self.close_bar()
+        if self.open_time is None:
+            self.open_time = open_time
+            self.open = self.high = self.low = self.close = price
+            self.volume = quantity
+        elif open_time == self.open_time:
+            if price > self.high:
+                self.high = price
+            elif price < self.low:
+                self.low = price
+            self.close = price
+            self.volume += quantity
+        return closed
+
+    def expire(self, now_ms: int) -> Optional[Bar]:
+        """Close the current bar if its interval ended before now_ms"""
+        if self.open_time is not None and now_ms >= self.open_time + self.interval_ms + BAR_CLOSE_GRACE_MS:
+            return self.close_bar()
+        return None
+
+    def close_bar(self) -> Bar:
+        bar = Bar(self.index, self.open_time, self.open, self.high, self.low, self.close, self.volume)
+        self.index += 1
+        self.closed_time = self.open_time
+        self.open_time = None
+        return bar
+
+
+class _SubmittingBot:
+    """The bot as seen by plain callbacks: coroutine methods run in the background"""
+
+    def __init__(self, bot, submit: Callable[[Awaitable], asyncio.Future]):
+        self._bot = bot
+        self._submit = submit
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._bot, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        def submit(*args, **kwargs):
+            return self._submit(attr(*args, **kwargs))
+        return submit
+
+
+class _Mailbox:
+    """Pending events of one symbol: the latest tick per stream and all closed bars"""
+
+    __slots__ = ('ticks', 'bars', 'ready')
+
+    def __init__(self):
+        self.ticks: Dict[str, Tick] = {}
+        self.bars: Deque[tuple] = deque()
+        self.ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self.ticks) + len(self.bars)
+
+
+class StrategyRunner:
+    """
+    Run strategies against live market streams for many symbols
+
+    Events are read from combined-stream WebSockets (reconnecting with
+    backoff), parsed into Ticks and posted to per-symbol mailboxes that
+    coalesce stale ticks. One worker task per symbol hands them to the
+    strategies. Handling latency, queue wait, queue depth and coalesced
+    ticks are tracked and published as gauges on the metrics registry.
+    """
+
+    def __init__(
+        self,
+        bot,
+        strategies: Iterable[Any],
+        symbols: Iterable[str],
+        streams: Iterable[str] = ('aggTrade',),
+        bar_interval: Optional[str] = None,
+        report_interval: float = 60.0
+    ):
+        """
+        Initialize the runner
+
+        Args:
+            bot: Connected AsyncBasicBot, passed to every callback
+            strategies: Objects with on_tick and/or on_bar (and optionally
+                on_start(bot) / on_finish(bot))
+            symbols: Symbols to subscribe to
+            streams: Streams per symbol (keys of STREAM_PARSERS)
+            bar_interval: Build bars of this interval (e.g. '1m') from
+                aggTrades and call on_bar; aggTrade is subscribed if needed
+            report_interval: Seconds between stats log lines (0 disables)
+        """
+        self.bot = bot
+        self.strategies = list(strategies)
+        self.symbols = [s.upper() for s in symbols]
+        self.streams = list(dict.fromkeys(streams))
+        self._tick_streams = set(self.streams)
+        unknown = [s for s in self.streams if s not in STREAM_PARSERS]
+        if unknown:
+            raise ValueError(f"Unsupported stream(s): {', '.join(unknown)}")
+        self.bar_interval = bar_interval
+        self.report_interval = report_interval
+        self._interval_ms = None
+        if bar_interval:
+            if bar_interval not in INTERVAL_MS:
+                raise ValueError(f"Unsupported bar interval: {bar_interval}")
+            self._interval_ms = INTERVAL_MS[bar_interval]
+            if 'aggTrade' not in self.streams:
+                self.streams.append('aggTrade')
+
+        self._mailboxes = {symbol: _Mailbox() for symbol in self.symbols}
+        self._builders = {symbol: _BarBuilder(self._interval_ms) for symbol in self.symbols} if self._interval_ms else {}
+        self._tick_handlers = self._handlers('on_tick')
+        self._bar_handlers = self._handlers('on_bar')
+        self._tasks: set = set()
+        self._sync_bot = _SubmittingBot(bot, self.submit)
+        self._stop_event: Optional[asyncio.Event] = None
+
+        self.handle_latency = LatencyHistogram()
+        self.wait_latency = LatencyHistogram()
+        self.events = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.orders_submitted = 0
+        self.order_errors = 0
+        self.max_queue_depth = 0
+        self.connected = 0
+
+    def _handlers(self, name: str) -> List[tuple]:
+        handlers = []
+        for strategy in self.strategies:
+            handler = getattr(strategy, name, None)
+            if handler is not None:
+                handlers.append((handler, inspect.iscoroutinefunction(handler)))
+        return handlers
+
+    @property
+    def queue_depth(self) -> int:
+        """Events waiting across all symbols"""
+        return sum(len(mailbox) for mailbox in self._mailboxes.values())
+
+    def submit(self, aw: Awaitable) -> asyncio.Future:
+        """
+        Run an order (or any awaitable) in the background
+
+        The task is tracked so run() waits for it before returning and a
+        failure is logged instead of being lost.
+
+        Args:
+            aw: Coroutine, e.g. bot.place_market_order(...)
+
+        Returns:
+            The scheduled task
+        """
+        task = asyncio.ensure_future(aw)
+        self._tasks.add(task)
+        self.orders_submitted += 1
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Future):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.order_errors += 1
+            logger.error("Submitted order failed: %s", task.exception())
+
+    def stop(self):
+        """Ask run() to return"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def run(self, duration: Optional[float] = None):
+        """
+        Stream and dispatch events until stop() is called
+
+        Args:
+            duration: Stop after this many seconds (default: run until stopped)
+        """
+        self._stop_event = asyncio.Event()
+        for strategy in self.strategies:
+            on_start = getattr(strategy, 'on_start', None)
+            if on_start is not None:
+                await self._call(on_start, inspect.iscoroutinefunction(on_start))
+
+        names = [f"{symbol.lower()}@{stream}" for symbol in self.symbols for stream in self.streams]
+        tasks = [
+            asyncio.create_task(self._read(names[i:i + MAX_STREAMS_PER_CONNECTION]))
+            for i in range(0, len(names), MAX_STREAMS_PER_CONNECTION)
+        ]
+        tasks += [asyncio.create_task(self._work(symbol)) for symbol in self.symbols]
+        if self._interval_ms:
+            tasks.append(asyncio.create_task(self._expire_bars()))
+        if self.report_interval:
+            tasks.append(asyncio.create_task(self._report()))
+        logger.info(
+            "Strategy runner started: %s strategy(ies), %s symbol(s), %s stream(s)",
+            len(self.strategies), len(self.symbols), len(names)
+        )
+
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._drain()
+            for strategy in self.strategies:
+                on_finish = getattr(strategy, 'on_finish', None)
+                if on_finish is not None:
+                    await self._call(on_finish, inspect.iscoroutinefunction(on_finish))
+            await self._drain()
+            self._publish()
+            logger.info("Strategy runner stopped: %s", self._summary())
+
+    async def _drain(self):
+        if self._tasks:
+            logger.info("Waiting for %s submitted order(s)...", len(self._tasks))
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def _call(self, handler: Callable, is_async: bool, *args):
+        """
+        Call a strategy callback with the bot and args
+
+        Plain callbacks get the submitting view of the bot; awaitables they
+        return that are not already submitted are submitted too.
+        """
+        try:
+            if is_async:
+                await handler(self.bot, *args)
+                return
+            result = handler(self._sync_bot, *args)
+            if result is None:
+                return
+            for aw in result if isinstance(result, (list, tuple)) else (result,):
+                if inspect.isawaitable(aw) and aw not in self._tasks:
+                    self.submit(aw)
+        except Exception:
+            self.errors += 1
+            logger.exception("Error in strategy callback %s", getattr(handler, '__qualname__', handler))
+
+    async def _read(self, names: List[str]):
+        """Read one combined-stream connection, reconnecting with backoff"""
+        url = f"{Config.get_ws_url(self.bot.testnet)}/stream?streams={'/'.join(names)}"
+        delay = 1.0
+        while True:
+            try:
+                async with self.bot.session.ws_connect(url, heartbeat=30, max_msg_size=0) as ws:
+                    self.connected += 1
+                    delay = 1.0
+                    logger.info("✓ Market stream connected (%s streams)", len(names))
+                    try:
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                self._on_message(msg.data)
+                            elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                                break
+                    finally:
+                        self.connected -= 1
+                logger.warning("Market stream closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Market stream disconnected: %s", e)
+            logger.info("Reconnecting market stream in %.0fs...", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    def _on_message(self, raw: str):
+        try:
+            message = loads(raw)
+            name = message['stream']
+            symbol, _, stream = name.partition('@')
+            symbol = symbol.upper()
+            mailbox = self._mailboxes.get(symbol)
+            parser = STREAM_PARSERS.get(stream)
+            if mailbox is None or parser is None:
+                return
+            price, quantity, event_time = parser(message['data'])
+        except Exception as e:
+            logger.warning("Could not parse stream message: %s", e)
+            return
+
+        received = time.perf_counter()
+        builder = self._builders.get(symbol)
+        if builder is not None and stream == 'aggTrade':
+            bar = builder.add(price, quantity, event_time)
+            if bar is not None:
+                mailbox.bars.append((bar, received))
+        if stream in self._tick_streams and self._tick_handlers:
+            if stream in mailbox.ticks:
+                self.coalesced += 1
+            mailbox.ticks[stream] = Tick(symbol, stream, price, quantity, event_time, received)
+        depth = len(mailbox)
+        if depth:
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+            mailbox.ready.set()
+
+    async def _expire_bars(self):
+        """Close bars of symbols that have gone quiet"""
+        while True:
+            await asyncio.sleep(1.0)
+            now_ms = int(time.time() * 1000)
+            received = time.perf_counter()
+            for symbol, builder in self._builders.items():
+                bar = builder.expire(now_ms)
+                if bar is not None:
+                    mailbox = self._mailboxes[symbol]
+                    mailbox.bars.append((bar, received))
+                    mailbox.ready.set()
+
+    async def _work(self, symbol: str):
+        """Hand one symbol's events to the strategies, bars first"""
+        mailbox = self._mailboxes[symbol]
+        while True:
+            await mailbox.ready.wait()
+            mailbox.ready.clear()
+            while mailbox.bars:
+                bar, received = mailbox.bars.popleft()
+                await self._dispatch(self._bar_handlers, symbol, bar, received)
+            if mailbox.ticks:
+                ticks, mailbox.ticks = mailbox.ticks, {}
+                for tick in ticks.values():
+                    await self._dispatch(self._tick_handlers, symbol, tick, tick.received)
+
+    async def _dispatch(self, handlers: List[tuple], symbol: str, event, received: float):
+        start = time.perf_counter()
+        self.wait_latency.record(start - received)
+        for handler, is_async in handlers:
+            await self._call(handler, is_async, symbol, event)
+        self.handle_latency.record(time.perf_counter() - start)
+        self.events += 1
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self._publish()
+            logger.info("Strategy runner: %s", self._summary())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get runner statistics
+
+        Returns:
+            Event and error counts, coalesced ticks, current and max queue
+            depth, in-flight orders, and handling / queue-wait latency
+            percentiles in milliseconds
+        """
+        return {
+            'events': self.events,
+            'coalesced': self.coalesced,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'errors': self.errors,
+            'orders_submitted': self.orders_submitted,
+            'orders_in_flight': len(self._tasks),
+            'order_errors': self.order_errors,
+            'connections': self.connected,
+            'handle_p50_ms': self.handle_latency.percentile(50) * 1000,
+            'handle_p99_ms': self.handle_latency.percentile(99) * 1000,
+            'handle_max_ms': self.handle_latency.max * 1000,
+            'wait_p50_ms': self.wait_latency.percentile(50) * 1000,
+            'wait_p99_ms': self.wait_latency.percentile(99) * 1000,
+            'wait_max_ms': self.wait_latency.max * 1000,
+        }
+
+    def _summary(self) -> str:
+        s = self.stats()
+        return (
+            f"{s['events']} events, {s['coalesced']} coalesced, queue {s['queue_depth']} "
+            f"(max {s['max_queue_depth']}), handle p50/p99 {s['handle_p50_ms']:.2f}/"
+            f"{s['handle_p99_ms']:.2f}ms, wait p50/p99 {s['wait_p50_ms']:.2f}/{s['wait_p99_ms']:.2f}ms, "
+            f"{s['errors']} callback error(s), {s['orders_submitted']} order(s) submitted"
+        )
+
+    def _publish(self):
+        """Expose the stats as gauges on the metrics registry"""
+        s = self.stats()
+        REGISTRY.set_gauge('runner_events_total', s['events'], 'Events handled by the strategy runner')
+        REGISTRY.set_gauge('runner_ticks_coalesced_total', s['coalesced'], 'Stale ticks replaced by newer ones')
+        REGISTRY.set_gauge('runner_queue_depth', s['queue_depth'], 'Events waiting for a strategy')
+        REGISTRY.set_gauge('runner_handle_p99_seconds', s['handle_p99_ms'] / 1000, 'p99 event handling time')
+        REGISTRY.set_gauge('runner_wait_p99_seconds', s['wait_p99_ms'] / 1000, 'p99 time events waited')
+
+
+def main():
+    """Run a strategy on live streams: python -m trading_bot.runner"""
+    import argparse
+    from .async_bot import AsyncBasicBot
+    from .backtest import load_strategy
+
+    parser = argparse.ArgumentParser(description="Run strategies on live market streams")
+    parser.add_argument('strategy', help="Strategy class as module:ClassName")
+    parser.add_argument('params', nargs='*', help="Strategy arguments as key=value")
+    parser.add_argument('--symbols', nargs='+', required=True, help="Symbols, e.g. BTCUSDT ETHUSDT")
+    parser.add_argument('--streams', nargs='+', default=['aggTrade'], choices=sorted(STREAM_PARSERS))
+    parser.add_argument('--bar-interval', default=None, help="Build bars of this interval and call on_bar")
+    parser.add_argument('--duration', type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument('--report-interval', type=float, default=60.0, help="Seconds between stats lines")
+    args = parser.parse_args()
+
+    Config.validate()
+    strategy = load_strategy(args.strategy, args.params)
+
+    async def run():
+        async with AsyncBasicBot(Config.API_KEY, Config.API_SECRET, Config.TESTNET) as bot:
+            runner = StrategyRunner(
+                bot, [strategy], args.symbols, streams=args.streams,
+                bar_interval=args.bar_interval, report_interval=args.report_interval
+            )
+            await runner.run(args.duration)
+            for key, value in runner.stats().items():
+                print(f"{key:>18}: {value:.3f}" if isinstance(value, float) else f"{key:>18}: {value}")
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Background WebSocket stream runner
+"""
+import asyncio
+import inspect
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from .logger import logger
+from .models import loads
+
+
+class StreamThread:
+    """
+    Run a Binance WebSocket stream on a background asyncio loop
+
+    Messages are decoded and passed to on_message on the stream thread.
+    The connection is re-established with exponential backoff if it
+    drops, and on_connect is called after every (re)connect so the owner
+    can resync state that may have been missed while disconnected.
+
+    Either callback may be a coroutine function; it is awaited before the
+    next message is read. Blocking work such as a REST snapshot belongs
+    in call_blocking(), which keeps the loop free (heartbeats, stop) while
+    newer messages wait in the socket buffer, so none are lost or reordered.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        on_message: Callable[[Dict[str, Any]], None],
+        name: str = 'Stream',
+        on_connect: Optional[Callable[[], None]] = None,
+        heartbeat: float = 30.0
+    ):
+        """
+        Initialize the stream
+
+        Args:
+            url: Full WebSocket URL (e.g., 'wss://fstream.binance.com/ws/btcusdt@depth')
+            on_message: Called (or awaited) with each decoded message
+            name: Thread name, used in log messages
+            on_connect: Called (or awaited) after each successful (re)connect
+            heartbeat: Seconds without messages before pinging the server
+        """
+        self.url = url
+        self.on_message = on_message
+        self.on_connect = on_connect
+        self.name = name
+        self.heartbeat = heartbeat
+        self.connected = False
+        self.last_alive = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._ws = None
+
+    def start(self):
+        """Start the stream thread"""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run_loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the stream and wait for the thread to exit"""
+        self._stopping = True
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def stopping(self) -> bool:
+        """Whether stop() was called"""
+        return self._stopping
+
+    def reconnect(self, url: Optional[str] = None):
+        """Drop the current connection and reconnect (optionally to a new URL)"""
+        if url:
+            self.url = url
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+
+    async def call_blocking(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a blocking call (e.g. a REST request) on the loop's default executor"""
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _run(self):
+        import websockets
+
+        delay = 1.0
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.url, ping_interval=None, max_size=None) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    self.last_alive = time.monotonic()
+                    delay = 1.0
+                    logger.info("✓ %s connected", self.name)
+                    if self.on_connect is not None:
+                        result = self.on_connect()
+                        if inspect.isawaitable(result):
+                            await result
+                    await self._receive(ws)
+            except Exception as e:
+                if not self._stopping:
+                    logger.warning("%s disconnected: %s", self.name, e)
+            finally:
+                self._ws = None
+                self.connected = False
+
+            if not self._stopping:
+                logger.info("Reconnecting %s in %.0fs...", self.name, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    async def _receive(self, ws):
+        while not self._stopping:
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=self.heartbeat)
+            except asyncio.TimeoutError:
+                # Quiet stream: confirm the connection is still alive
+                pong = await ws.ping()
+                await asyncio.wait_for(pong, timeout=10)
+                self.last_alive = time.monotonic()
+                continue
+
+            self.last_alive = time.monotonic()
+            try:
+                result = self.on_message(loads(raw))
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Error handling %s message", self.name)
@@ -0,0 +1,340 @@
+"""
+User-data stream with an in-memory account mirror
+"""
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from .config import Config
+from .logger import logger
+from .models import Order
+from .streams import StreamThread
+
+# Order statuses that remove an order from the open-order mirror
+CLOSED_ORDER_STATUSES = {'FILLED', 'CANCELED', 'EXPIRED', 'REJECTED', 'EXPIRED_IN_MATCH'}
+
+
+class AccountMirror:
+    """
+    In-memory copy of open orders, positions and balances
+
+    Bootstrapped from REST snapshots and kept current by applying
+    ORDER_TRADE_UPDATE, ACCOUNT_UPDATE and ACCOUNT_CONFIG_UPDATE events.
+    Everything is kept in the REST shape (stream updates are merged into
+    the snapshot records, so REST-only fields survive), and
+    get_open_orders/get_positions/get_account return copies of those
+    records, so mirror reads are drop-in replacements for BasicBot's REST
+    reads. get_orders returns Order models, decoded on first read after
+    each change and cached.
+
+    If on_change is set it is called (on the stream thread, after the
+    update) with ('order', orderId), ('position', (symbol, positionSide)),
+    ('account', None) or ('snapshot', None) after a bootstrap. Callbacks
+    registered with add_listener receive the same notifications.
+    """
+
+    def __init__(self):
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self._models: Dict[int, Order] = {}  # Decoded lazily by get_orders
+        self.positions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.leverage: Dict[str, str] = {}  # Per symbol, for positions opened after a bootstrap
+        self.account: Dict[str, Any] = {}
+        self.ready = False
+        self.last_update = 0.0
+        self.on_change: Optional[Callable[[str, Any], None]] = None
+        self._listeners: List[Callable[[str, Any], None]] = []
+        self._lock = threading.Lock()
+
+    def bootstrap(self, account: Dict[str, Any], positions: list, open_orders: list):
+        """
+        Replace the mirror contents with REST snapshots
+
+        Args:
+            account: futures_account() response
+            positions: futures_position_information() response
+            open_orders: futures_get_open_orders() response
+        """
+        with self._lock:
+            self.account = account
+            self.positions = {
+                (p['symbol'], p.get('positionSide', 'BOTH')): p for p in positions
+            }
+            self.leverage.update({p['symbol']: p['leverage'] for p in positions if 'leverage' in p})
+            self.orders = {o['orderId']: o for o in open_orders}
+            self._models = {}
+            self.ready = True
+            self.last_update = time.monotonic()
+        self._notify([('snapshot', None)])
+        logger.info(
+            f"Account mirror synced: {len(self.orders)} open order(s), "
+            f"{len(self.positions)} position record(s)"
+        )
+
+    def is_fresh(self, max_age: float) -> bool:
+        """Check whether the mirror was confirmed current within max_age seconds"""
+        return self.ready and time.monotonic() - self.last_update <= max_age
+
+    def apply(self, event: Dict[str, Any]):
+        """
+        Apply one user-data stream event
+
+        Args:
+            event: Decoded stream message
+        """
+        event_type = event.get('e')
+        changes = []
+        with self._lock:
+            if event_type == 'ORDER_TRADE_UPDATE':
+                self._apply_order(event['o'])
+                changes.append(('order', event['o']['i']))
+            elif event_type == 'ACCOUNT_UPDATE':
+                self._apply_account(event['a'], event.get('T', 0))
+                changes.append(('account', None))
+                changes += [('position', (p['s'], p.get('ps', 'BOTH'))) for p in event['a'].get('P', [])]
+            elif event_type == 'ACCOUNT_CONFIG_UPDATE' and 'ac' in event:
+                self._apply_leverage(event['ac'])
+                changes += [('position', key) for key in self.positions if key[0] == event['ac'].get('s')]
+            self.last_update = time.monotonic()
+        self._notify(changes)
+
+    def set_leverage(self, symbol: str, leverage: Any):
+        """Set a symbol's leverage (e.g. read from REST for a position the snapshot did not have)"""
+        with self._lock:
+            self._apply_leverage({'s': symbol, 'l': leverage})
+            changes = [('position', key) for key in self.positions if key[0] == symbol]
+        self._notify(changes)
+
+    def add_listener(self, callback: Callable[[str, Any], None]):
+        """Register an extra change callback (same arguments as on_change)"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, Any], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, changes: List[Tuple[str, Any]]):
+        callbacks = [self.on_change] if self.on_change is not None else []
+        callbacks += self._listeners
+        for callback in callbacks:
+            for kind, key in changes:
+                try:
+                    callback(kind, key)
+                except Exception:
+                    logger.exception("Error in account mirror change callback")
+
+    def _apply_order(self, o: Dict[str, Any]):
+        order_id = o['i']
+        current = self.orders.get(order_id)
+        if current is not None and current.get('updateTime', 0) > o['T']:
+            return  # Older than what we already have (e.g. from a snapshot)
+
+        self._models.pop(order_id, None)
+        if o['X'] in CLOSED_ORDER_STATUSES:
+            self.orders.pop(order_id, None)
+            return
+
+        order = {
+            'orderId': order_id,
+            'symbol': o['s'],
+            'status': o['X'],
+            'clientOrderId': o['c'],
+            'price': o['p'],
+            'avgPrice': o['ap'],
+            'origQty': o['q'],
+            'executedQty': o['z'],
+            'timeInForce': o['f'],
+            'type': o['o'],
+            'origType': o.get('ot', o['o']),
+            'reduceOnly': o.get('R', False),
+            'closePosition': o.get('cp', False),
+            'side': o['S'],
+            'positionSide': o.get('ps', 'BOTH'),
+            'stopPrice': o.get('sp', '0'),
+            'workingType': o.get('wt', 'CONTRACT_PRICE'),
+            'updateTime': o['T'],
+        }
+        self.orders[order_id] = {**current, **order} if current is not None else order
+
+    def _apply_account(self, a: Dict[str, Any], event_time: int):
+        assets = {asset['asset']: asset for asset in self.account.get('assets', [])}
+        for b in a.get('B', []):
+            asset = assets.get(b['a'])
+            if asset is None:
+                asset = {'asset': b['a'], 'walletBalance': '0', 'availableBalance': '0'}
+                self.account.setdefault('assets', []).append(asset)
+            # The stream has no available balance; move it by the wallet change
+            delta = float(b['wb']) - float(asset.get('walletBalance', 0))
+            asset['availableBalance'] = str(float(asset.get('availableBalance', 0)) + delta)
+            asset['walletBalance'] = b['wb']
+            asset['crossWalletBalance'] = b['cw']
+
+        for p in a.get('P', []):
+            key = (p['s'], p.get('ps', 'BOTH'))
+            position = self.positions.get(key)
+            if position is None:
+                position = self.positions[key] = {'symbol': p['s'], 'positionSide': key[1]}
+                if p['s'] in self.leverage:
+                    position['leverage'] = self.leverage[p['s']]
+            if position.get('updateTime', 0) > event_time:
+                continue
+            position.update({
+                'positionAmt': p['pa'],
+                'entryPrice': p['ep'],
+                'breakEvenPrice': p.get('bep', position.get('breakEvenPrice', '0')),
+                'unRealizedProfit': p['up'],
+                'marginType': p.get('mt', position.get('marginType', 'cross')),
+                'isolatedWallet': p.get('iw', '0'),
+                'updateTime': event_time,
+            })
+
+    def _apply_leverage(self, ac: Dict[str, Any]):
+        self.leverage[ac['s']] = str(ac['l'])
+        for key, position in self.positions.items():
+            if key[0] == ac.get('s'):
+                position['leverage'] = str(ac['l'])
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get open orders as REST records (optionally for one symbol)"""
+        with self._lock:
+            return [dict(o) for o in self.orders.values() if symbol is None or o['symbol'] == symbol]
+
+    def get_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        """Get open orders as Order models (optionally for one symbol)"""
+        with self._lock:
+            return [
+                self._model(order_id, o) for order_id, o in self.orders.items()
+                if symbol is None or o['symbol'] == symbol
+            ]
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        """Get one open order as an Order model (None if it is not open)"""
+        with self._lock:
+            order = self.orders.get(order_id)
+            return None if order is None else self._model(order_id, order)
+
+    def _model(self, order_id: int, order: Dict[str, Any]) -> Order:
+        model = self._models.get(order_id)
+        if model is None:
+            model = self._models[order_id] = Order.from_dict(order)
+        return model
+
+    def get_positions(self) -> List[Dict[str, Any]]:
+        """Get position records"""
+        with self._lock:
+            return [dict(p) for p in self.positions.values()]
+
+    def get_account(self) -> Dict[str, Any]:
+        """Get the account record (assets with balances)"""
+        with self._lock:
+            account = dict(self.account)
+            account['assets'] = [dict(a) for a in self.account.get('assets', [])]
+            return account
+
+
+class UserDataStream:
+    """
+    Futures user-data stream feeding an AccountMirror
+
+    Manages the listenKey (create, keepalive, renew on expiry), runs the
+    WebSocket on a background thread and resyncs the mirror from REST
+    after every (re)connect so no events are lost across disconnects.
+    """
+
+    def __init__(self, bot, mirror: Optional[AccountMirror] = None):
+        """
+        Initialize the stream
+
+        Args:
+            bot: Connected BasicBot (its client is used for REST calls)
+            mirror: Mirror to keep updated (default: a new AccountMirror)
+        """
+        self.bot = bot
+        self.mirror = mirror or AccountMirror()
+        self.listen_key: Optional[str] = None
+        self._stream: Optional[StreamThread] = None
+        self._keepalive_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Create a listenKey and start streaming"""
+        logger.info("Starting user-data stream...")
+        self.listen_key = self.bot._call('futures_stream_get_listen_key')
+        self._stream = StreamThread(
+            self._stream_url(),
+            on_message=self._on_message,
+            name='UserDataStream',
+            on_connect=self._resync
+        )
+        self._stream.start()
+
+        self._stop.clear()
+        self._keepalive_thread = threading.Thread(
+            target=self._keepalive, name='ListenKeyKeepalive', daemon=True
+        )
+        self._keepalive_thread.start()
+
+    def stop(self):
+        """Stop streaming and close the listenKey"""
+        self._stop.set()
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+        if self.listen_key:
+            try:
+                self.bot._call('futures_stream_close', listenKey=self.listen_key)
+            except Exception as e:
+                logger.warning("Could not close listenKey: %s", e)
+            self.listen_key = None
+        self.mirror.ready = False
+
+    def is_fresh(self, max_age: float) -> bool:
+        """
+        Check whether mirror reads can be served
+
+        The mirror is current while the stream is connected and has been
+        heard from (event or heartbeat pong) within max_age seconds.
+        """
+        if self._stream is None or not self._stream.connected or not self.mirror.ready:
+            return False
+        last_seen = max(self.mirror.last_update, self._stream.last_alive)
+        return time.monotonic() - last_seen <= max_age
+
+    def _stream_url(self) -> str:
+        return f"{Config.get_ws_url(self.bot.testnet)}/ws/{self.listen_key}"
+
+    async def _resync(self):
+        """Bootstrap the mirror from REST snapshots (fetched off the stream loop)"""
+        try:
+            self.mirror.bootstrap(*await self._stream.call_blocking(self._snapshots))
+        except Exception as e:
+            self.mirror.ready = False
+            logger.error("Could not sync account mirror: %s", e)
+
+    def _snapshots(self) -> tuple:
+        return (
+            self.bot._call('futures_account'),
+            self.bot._call('futures_position_information'),
+            self.bot._call('futures_get_open_orders')
+        )
+
+    async def _on_message(self, event: Dict[str, Any]):
+        if event.get('e') == 'listenKeyExpired':
+            logger.warning("listenKey expired, renewing...")
+            self.mirror.ready = False
+            self.listen_key = await self._stream.call_blocking(self.bot._call, 'futures_stream_get_listen_key')
+            self._stream.reconnect(self._stream_url())
+            return
+        self.mirror.apply(event)
+        if event.get('e') == 'ORDER_TRADE_UPDATE' and self.bot.history is not None:
+            try:
+                self.bot.history.record_order_update(event['o'])
+            except Exception as e:
+                logger.warning("Could not record order update: %s", e)
+
+    def _keepalive(self):
+        while not self._stop.wait(Config.LISTEN_KEY_KEEPALIVE):
+            try:
+                self.bot._call('futures_stream_keepalive', listenKey=self.listen_key)
+                logger.debug("listenKey keepalive sent")
+            except Exception as e:
+                logger.warning("listenKey keepalive failed: %s", e)